@@ -0,0 +1,189 @@
+from concurrent import futures
+import collections
+import contextlib
+import threading
+import time
+
+import grpc
+
+IDLE_TIMEOUT = 30.0  # seconds an idle worker above min_workers lingers before exiting
+DELAY_SMOOTHING = 0.1  # weight of the newest sample in the queue delay average
+
+class AdaptiveExecutor(futures.Executor):
+    """Thread pool that sizes itself from the queueing delay its work items see.
+
+    It starts with min_workers threads. While the oldest queued item has waited longer
+    than target_queue_delay and no worker is idle, a sizer thread adds one worker per
+    target_queue_delay, up to max_workers. Workers above min_workers exit after
+    IDLE_TIMEOUT without work. Items that hold their thread for as long as a connection
+    lasts run detached(), outside that count.
+    """
+
+    def __init__(self, min_workers, max_workers, target_queue_delay):
+        self.max_workers = max(1, max_workers)
+        self.min_workers = max(1, min(min_workers, self.max_workers))
+        self.target_queue_delay = target_queue_delay
+        self.queue = collections.deque()  # (enqueued_at, future, fn, args, kwargs)
+        self.cond = threading.Condition()
+        self.workers = 0
+        self.idle = 0
+        self.running = 0
+        self.detached_workers = 0
+        self.local = threading.local()
+        self.shutting_down = False
+
+        self.submitted = 0
+        self.completed = 0
+        self.rejected = 0
+        self.queue_delay = 0.0  # moving average, seconds
+        self.max_queue_delay = 0.0
+
+        with self.cond:
+            for _ in range(self.min_workers):
+                self._spawn_worker()
+        threading.Thread(target=self._run_sizer, daemon=True).start()
+
+    @classmethod
+    def from_config(cls, config):
+        return cls(config.min_workers, config.max_workers, config.target_queue_delay)
+
+    def submit(self, fn, *args, **kwargs):
+        future = futures.Future()
+        with self.cond:
+            if self.shutting_down:
+                raise RuntimeError("cannot schedule new futures after shutdown")
+            self.queue.append((time.monotonic(), future, fn, args, kwargs))
+            self.submitted += 1
+            self.cond.notify_all()
+        return future
+
+    def shutdown(self, wait=True, *, cancel_futures=False):
+        with self.cond:
+            self.shutting_down = True
+            if cancel_futures:
+                while self.queue:
+                    self.queue.popleft()[1].cancel()
+            self.cond.notify_all()
+            while wait and self.workers:
+                self.cond.wait()
+
+    @contextlib.contextmanager
+    def detached(self):
+        """Takes the calling worker out of the pool for the rest of its current item.
+
+        The pool can then grow a replacement, so long-lived items such as replication
+        streams never starve other RPCs. The thread exits once the item is done.
+        """
+        with self.cond:
+            self.workers -= 1
+            self.detached_workers += 1
+            if self.workers < self.min_workers and not self.shutting_down:
+                self._spawn_worker()
+            self.cond.notify_all()
+        self.local.detached = True
+        try:
+            yield
+        finally:
+            with self.cond:
+                self.detached_workers -= 1
+
+    def pending(self):
+        """Work items queued or running."""
+        with self.cond:
+            return len(self.queue) + self.running
+
+    def record_rejection(self):
+        with self.cond:
+            self.rejected += 1
+
+    def stats(self):
+        with self.cond:
+            return {
+                "executor.workers": self.workers,
+                "executor.idle_workers": self.idle,
+                "executor.min_workers": self.min_workers,
+                "executor.max_workers": self.max_workers,
+                "executor.queue_depth": len(self.queue),
+                "executor.running": self.running,
+                "executor.detached_workers": self.detached_workers,
+                "executor.submitted": self.submitted,
+                "executor.completed": self.completed,
+                "executor.rejected": self.rejected,
+                "executor.queue_delay_ms": self.queue_delay * 1000,
+                "executor.max_queue_delay_ms": self.max_queue_delay * 1000,
+            }
+
+    def _spawn_worker(self):
+        self.workers += 1
+        threading.Thread(target=self._run_worker, daemon=True).start()
+
+    def _run_worker(self):
+        while True:
+            with self.cond:
+                self.idle += 1
+                idle_since = time.monotonic()
+                while not self.queue and not self.shutting_down:
+                    remaining = idle_since + IDLE_TIMEOUT - time.monotonic()
+                    if remaining <= 0 and self.workers > self.min_workers:
+                        break
+                    self.cond.wait(max(remaining, 0) or IDLE_TIMEOUT)
+                self.idle -= 1
+                if not self.queue:
+                    self.workers -= 1
+                    self.cond.notify_all()
+                    return
+                enqueued_at, future, fn, args, kwargs = self.queue.popleft()
+                delay = time.monotonic() - enqueued_at
+                self.queue_delay += (delay - self.queue_delay) * DELAY_SMOOTHING
+                self.max_queue_delay = max(self.max_queue_delay, delay)
+                self.running += 1
+
+            if future.set_running_or_notify_cancel():
+                try:
+                    result = fn(*args, **kwargs)
+                except BaseException as e:
+                    future.set_exception(e)
+                else:
+                    future.set_result(result)
+            with self.cond:
+                self.running -= 1
+                self.completed += 1
+            if getattr(self.local, "detached", False):
+                return
+
+    def _run_sizer(self):
+        while True:
+            with self.cond:
+                while not self.queue and not self.shutting_down:
+                    self.cond.wait()
+                if self.shutting_down:
+                    return
+            time.sleep(self.target_queue_delay)
+            with self.cond:
+                if (self.queue and not self.idle and self.workers < self.max_workers
+                        and time.monotonic() - self.queue[0][0] >= self.target_queue_delay):
+                    self._spawn_worker()
+
+class RejectionCounter(grpc.ServerInterceptor):
+    """Counts the RPCs that grpc.server turns away for exceeding maximum_concurrent_rpcs.
+
+    gRPC admits an RPC while fewer than limit are in flight, which is exactly the number
+    of items the executor has queued or running.
+    """
+
+    def __init__(self, executor, limit):
+        self.executor = executor
+        self.limit = limit
+
+    def intercept_service(self, continuation, handler_call_details):
+        if self.executor.pending() >= self.limit:
+            self.executor.record_rejection()
+        return continuation(handler_call_details)
+
+def thread_pool_server(config, options, compression=None):
+    """grpc.server on an AdaptiveExecutor that admits max_workers + max_queued_rpcs RPCs at once."""
+    executor = AdaptiveExecutor.from_config(config)
+    limit = config.max_workers + config.max_queued_rpcs
+    server = grpc.server(executor, options=options, interceptors=[RejectionCounter(executor, limit)],
+                         maximum_concurrent_rpcs=limit, compression=compression)
+    return server, executor
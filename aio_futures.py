@@ -0,0 +1,9 @@
+import asyncio
+
+def shielded(future):
+    """Awaitable for a concurrent.futures.Future that another thread resolves.
+
+    Cancelling the waiter, on a timeout or the client's deadline, leaves the Future itself
+    alone: its owner (a RaftNode or a Batcher) still has to resolve it.
+    """
+    return asyncio.shield(asyncio.wrap_future(future))
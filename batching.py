@@ -0,0 +1,51 @@
+from concurrent import futures
+import collections
+import threading
+import time
+
+class Batcher:
+    """Coalesces concurrently submitted items into batches handed to flush(items).
+
+    A batch is flushed once it holds max_batch_size items or max_linger seconds after its
+    first item arrived, whichever comes first. Only one flush runs at a time, so items that
+    arrive while a flush is in flight are grouped into the next one (group commit).
+    flush must return one result per item, in order.
+    """
+
+    def __init__(self, flush, max_batch_size, max_linger):
+        self.flush = flush
+        self.max_batch_size = max(1, max_batch_size)
+        self.max_linger = max_linger
+        self.queue = collections.deque()
+        self.cond = threading.Condition()
+        threading.Thread(target=self._run, daemon=True).start()
+
+    def submit(self, item):
+        future = futures.Future()
+        with self.cond:
+            self.queue.append((item, future))
+            self.cond.notify()
+        return future
+
+    def _run(self):
+        while True:
+            with self.cond:
+                while not self.queue:
+                    self.cond.wait()
+                deadline = time.monotonic() + self.max_linger
+                while len(self.queue) < self.max_batch_size:
+                    remaining = deadline - time.monotonic()
+                    if remaining <= 0:
+                        break
+                    self.cond.wait(remaining)
+                size = min(len(self.queue), self.max_batch_size)
+                batch = [self.queue.popleft() for _ in range(size)]
+
+            try:
+                results = self.flush([item for item, _ in batch])
+            except Exception as e:
+                for _, future in batch:
+                    future.set_exception(e)
+                continue
+            for (_, future), result in zip(batch, results):
+                future.set_result(result)
@@ -0,0 +1,156 @@
+import os
+import re
+import shutil
+import tempfile
+import time
+import uuid
+
+import raft_pb2 as pb
+from storage import state_dir
+
+BLOB_ID = re.compile(r"[0-9a-f]{32}")
+# Blobs no entry refers to are deleted by sweep() once this old, which leaves time for the
+# PUT_BLOB entry of a blob that was just stored to commit.
+ORPHAN_GRACE = 600.0
+
+def open_blob_store(config, server_id, group_id=0):
+    if config.persistent_state_path == "memory":
+        # Nothing else survives a restart either, so start from an empty scratch directory.
+        directory = os.path.join(tempfile.gettempdir(), "raft-blobs", f"server{server_id}", f"group{group_id}")
+        shutil.rmtree(directory, ignore_errors=True)
+        return BlobStore(directory, durable=False)
+    directory = state_dir(config, server_id)
+    if group_id:
+        directory = os.path.join(directory, f"group{group_id}")
+    return BlobStore(os.path.join(directory, "blobs"), durable=True)
+
+def new_blob_id():
+    return uuid.uuid4().hex
+
+class BlobStore:
+    """Values too large for the Raft log, kept as one immutable file per blob.
+
+    The leader names each blob when it receives the value; PUT_BLOB entries carry only the
+    name. A blob is deleted when the state machine stops referring to it, and readers
+    that opened it before keep their handle.
+    """
+
+    def __init__(self, directory, durable=True):
+        self.directory = directory
+        self.durable = durable
+        os.makedirs(directory, exist_ok=True)
+
+    def path(self, blob_id):
+        if not BLOB_ID.fullmatch(blob_id):
+            raise ValueError(f"Invalid blob id {blob_id!r}")
+        return os.path.join(self.directory, blob_id)
+
+    def writer(self, blob_id):
+        return BlobWriter(self, blob_id)
+
+    def open(self, blob_id):
+        """The blob's file opened for reading, or None if this server does not hold it."""
+        try:
+            return open(self.path(blob_id), "rb")
+        except FileNotFoundError:
+            return None
+
+    def has(self, blob_id):
+        return os.path.exists(self.path(blob_id))
+
+    def delete(self, blob_id):
+        try:
+            os.remove(self.path(blob_id))
+        except FileNotFoundError:
+            pass
+
+    def sweep(self, referenced):
+        """Deletes blobs outside referenced that are older than ORPHAN_GRACE."""
+        cutoff = time.time() - ORPHAN_GRACE
+        for name in os.listdir(self.directory):
+            blob_id = name.split(".", 1)[0]
+            if blob_id not in referenced and os.path.getmtime(os.path.join(self.directory, name)) < cutoff:
+                try:
+                    os.remove(os.path.join(self.directory, name))
+                except FileNotFoundError:
+                    pass
+
+class BlobWriter:
+    """Receives a blob's bytes into a temporary file; it only appears in the store on commit()."""
+
+    def __init__(self, store, blob_id):
+        self.store = store
+        self.blob_id = blob_id
+        self.path = store.path(blob_id)
+        fd, self.temp_path = tempfile.mkstemp(prefix=blob_id + ".", suffix=".tmp", dir=store.directory)
+        self.file = os.fdopen(fd, "wb")
+        self.size = 0
+
+    def write(self, data):
+        self.file.write(data)
+        self.size += len(data)
+
+    def commit(self):
+        self.file.flush()
+        if self.store.durable:
+            os.fsync(self.file.fileno())
+        self.file.close()
+        os.replace(self.temp_path, self.path)
+
+    def abort(self):
+        self.file.close()
+        try:
+            os.remove(self.temp_path)
+        except FileNotFoundError:
+            pass
+
+class ValueSpool:
+    """Collects a streamed value: in memory up to inline_bytes, beyond that in a new blob."""
+
+    def __init__(self, store, inline_bytes):
+        self.store = store
+        self.inline_bytes = inline_bytes
+        self.value = bytearray()
+        self.writer = None
+
+    def add(self, data):
+        if self.writer is not None:
+            self.writer.write(data)
+            return
+        self.value += data
+        if len(self.value) > self.inline_bytes:
+            self.writer = self.store.writer(new_blob_id())
+            self.writer.write(self.value)
+            self.value = None
+
+    def abort(self):
+        if self.writer is not None:
+            self.writer.abort()
+
+    def entry(self, first):
+        """Completes the value; returns the LogEntry setting first.key to it."""
+        if self.writer is None:
+            return pb.LogEntry(key=first.key, value=bytes(self.value),
+                               clientId=first.clientId, requestId=first.requestId)
+        self.writer.commit()
+        return pb.LogEntry(type=pb.PUT_BLOB, key=first.key, blobId=self.writer.blob_id, blobSize=self.writer.size,
+                           clientId=first.clientId, requestId=first.requestId)
+
+def read_chunks(blob_file, chunk_bytes):
+    """Yields blob_file's contents chunk_bytes at a time, closing it at the end."""
+    with blob_file:
+        while True:
+            data = blob_file.read(chunk_bytes)
+            if not data:
+                return
+            yield data
+
+def blob_chunks(blob_file, blob_id, group_id, chunk_bytes):
+    """A blob as the BlobChunk stream of StoreBlob and FetchBlob."""
+    first = True
+    for data in read_chunks(blob_file, chunk_bytes):
+        if first:
+            yield pb.BlobChunk(blobId=blob_id, data=data, groupId=group_id)
+            first = False
+        else:
+            yield pb.BlobChunk(data=data)
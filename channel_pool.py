@@ -0,0 +1,100 @@
+import asyncio
+import threading
+import grpc
+
+import raft_pb2_grpc as pb_grpc
+
+# Long-lived client channels: keepalive pings hold idle HTTP/2 connections open, and a
+# short reconnect backoff lets a restarted server be reached again within ~1s.
+CHANNEL_OPTIONS = [
+    ("grpc.keepalive_time_ms", 10000),
+    ("grpc.keepalive_timeout_ms", 5000),
+    ("grpc.keepalive_permit_without_calls", 1),
+    ("grpc.http2.max_pings_without_data", 0),
+    ("grpc.initial_reconnect_backoff_ms", 100),
+    ("grpc.min_reconnect_backoff_ms", 100),
+    ("grpc.max_reconnect_backoff_ms", 1000),
+]
+
+# Servers must accept the client keepalive pings above instead of answering GOAWAY.
+SERVER_OPTIONS = [
+    ("grpc.keepalive_permit_without_calls", 1),
+    ("grpc.http2.min_ping_interval_without_data_ms", 5000),
+    ("grpc.http2.max_pings_without_data", 0),
+]
+
+# config.ini compression names.
+GRPC_COMPRESSION = {
+    "none": grpc.Compression.NoCompression,
+    "gzip": grpc.Compression.Gzip,
+    "deflate": grpc.Compression.Deflate,
+}
+
+class ChannelPool:
+    """One shared channel per address, created on first use and kept for the process lifetime.
+
+    An aio pool hands out grpc.aio channels; it must only be used from the event loop
+    that serves the process.
+    """
+
+    def __init__(self, base_address="127.0.0.1", base_port=9001, options=CHANNEL_OPTIONS, aio=False,
+                 compression="none"):
+        self.base_address = base_address
+        self.base_port = base_port
+        self.options = options
+        self.aio = aio
+        self.compression = GRPC_COMPRESSION[compression]
+        self.lock = threading.Lock()
+        self.channels = {}
+        self.stubs = {}
+
+    @classmethod
+    def from_config(cls, config, compression="none", aio=False):
+        """A pool for config's servers whose requests use compression, a config.ini compression name."""
+        return cls(config.base_address, config.base_port, aio=aio, compression=compression)
+
+    def server_address(self, server_id):
+        return f"{self.base_address}:{self.base_port + server_id}"
+
+    def channel(self, address):
+        with self.lock:
+            if address not in self.channels:
+                insecure_channel = grpc.aio.insecure_channel if self.aio else grpc.insecure_channel
+                self.channels[address] = insecure_channel(address, options=self.options,
+                                                          compression=self.compression)
+            return self.channels[address]
+
+    def stub(self, address, stub_class):
+        key = (address, stub_class)
+        with self.lock:
+            stub = self.stubs.get(key)
+        if stub is None:
+            stub = stub_class(self.channel(address))
+            with self.lock:
+                stub = self.stubs.setdefault(key, stub)
+        return stub
+
+    def server_stub(self, server_id):
+        return self.stub(self.server_address(server_id), pb_grpc.KeyValueStoreStub)
+
+    def frontend_stub(self, address):
+        return self.stub(address, pb_grpc.FrontEndStub)
+
+    def discard(self, address):
+        """Drops the channel to address so the next call opens a fresh connection."""
+        with self.lock:
+            channel = self.channels.pop(address, None)
+            self.stubs = {key: stub for key, stub in self.stubs.items() if key[0] != address}
+        if channel is not None and not self.aio:
+            channel.close()
+
+    def close(self):
+        """Closes every channel. For an aio pool the result must be awaited."""
+        with self.lock:
+            channels = list(self.channels.values())
+            self.channels = {}
+            self.stubs = {}
+        if self.aio:
+            return asyncio.gather(*(channel.close() for channel in channels))
+        for channel in channels:
+            channel.close()
@@ -0,0 +1,81 @@
+import configparser
+import os
+
+DEFAULT_CONFIG_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "config.ini")
+SERVING_MODES = ("thread", "aio")
+SERVER_LAUNCHERS = ("exec", "zygote")
+COMPRESSIONS = ("none", "gzip", "deflate")
+ENTRY_COMPRESSIONS = ("none", "zlib")
+
+class Config:
+    def __init__(self, path=DEFAULT_CONFIG_PATH):
+        parser = configparser.ConfigParser()
+        if not parser.read(path):
+            raise FileNotFoundError(f"Config file not found: {path}")
+
+        self.base_address = parser.get("Global", "base_address", fallback="127.0.0.1")
+
+        self.base_port = parser.getint("Servers", "base_port", fallback=9001)
+        self.base_source_port = parser.getint("Servers", "base_source_port", fallback=7001)
+        cpus = os.cpu_count() or 1
+        self.max_workers = parse_worker_count(parser.get("Servers", "max_workers", fallback="auto"), 16 * cpus)
+        self.min_workers = parse_worker_count(parser.get("Servers", "min_workers", fallback="auto"), cpus)
+        self.target_queue_delay = parser.getfloat("Servers", "target_queue_delay_ms", fallback=5) / 1000
+        self.max_queued_rpcs = parser.getint("Servers", "max_queued_rpcs", fallback=1000)
+        self.server_launcher = parser.get("Servers", "server_launcher", fallback="exec")
+        if self.server_launcher not in SERVER_LAUNCHERS:
+            raise ValueError(f"server_launcher must be one of {', '.join(SERVER_LAUNCHERS)}")
+        self.startup_timeout = parser.getint("Servers", "startup_timeout_ms", fallback=10000) / 1000
+        self.restart_crashed = parser.getboolean("Servers", "restart_crashed", fallback=True)
+        self.restart_backoff_min = parser.getint("Servers", "restart_backoff_min_ms", fallback=500) / 1000
+        self.restart_backoff_max = parser.getint("Servers", "restart_backoff_max_ms", fallback=30000) / 1000
+        self.serving_mode = parser.get("Servers", "serving_mode", fallback="thread")
+        if self.serving_mode not in SERVING_MODES:
+            raise ValueError(f"serving_mode must be one of {', '.join(SERVING_MODES)}")
+        self.persistent_state_path = parser.get("Servers", "persistent_state_path", fallback="memory")
+        self.wal_segment_bytes = parser.getint("Servers", "wal_segment_mb", fallback=64) * 1024 * 1024
+        self.active = parse_id_list(parser.get("Servers", "active", fallback="0,1,2,3,4"))
+        self.learners = [i for i in parse_id_list(parser.get("Servers", "learners", fallback=""))
+                         if i not in self.active]
+        self.max_batch_size = parser.getint("Servers", "max_batch_size", fallback=64)
+        self.max_linger = parser.getfloat("Servers", "max_linger_ms", fallback=2) / 1000
+        self.peer_compression = parser.get("Servers", "peer_compression", fallback="none")
+        self.client_compression = parser.get("Servers", "client_compression", fallback="none")
+        for compression in (self.peer_compression, self.client_compression):
+            if compression not in COMPRESSIONS:
+                raise ValueError(f"peer_compression and client_compression must be one of {', '.join(COMPRESSIONS)}")
+
+        self.groups = max(1, parser.getint("Raft", "groups", fallback=1))
+        self.election_timeout_min = parser.getint("Raft", "election_timeout_min_ms", fallback=300) / 1000
+        self.election_timeout_max = parser.getint("Raft", "election_timeout_max_ms", fallback=600) / 1000
+        self.pre_vote = parser.getboolean("Raft", "pre_vote", fallback=True)
+        self.check_quorum = parser.getboolean("Raft", "check_quorum", fallback=True)
+        self.transfer_timeout = parser.getint("Raft", "transfer_timeout_ms", fallback=2000) / 1000
+        self.heartbeat_interval = parser.getint("Raft", "heartbeat_interval_ms", fallback=50) / 1000
+        self.rpc_timeout = parser.getint("Raft", "rpc_timeout_ms", fallback=1000) / 1000
+        self.max_inflight_appends = parser.getint("Raft", "max_inflight_appends", fallback=8)
+        self.max_entries_per_append = parser.getint("Raft", "max_entries_per_append", fallback=256)
+        self.replication_stream = parser.getboolean("Raft", "replication_stream", fallback=True)
+        self.read_mode = parser.get("Raft", "read_mode", fallback="read_index")
+        self.snapshot_threshold = parser.getint("Raft", "snapshot_threshold", fallback=10000)
+        self.snapshot_chunk_bytes = parser.getint("Raft", "snapshot_chunk_kb", fallback=512) * 1024
+        self.install_snapshot_timeout = parser.getint("Raft", "install_snapshot_timeout_ms", fallback=60000) / 1000
+        self.catch_up_timeout = parser.getint("Raft", "catch_up_timeout_ms", fallback=30000) / 1000
+        self.blob_inline_bytes = parser.getint("Raft", "blob_inline_kb", fallback=64) * 1024
+        self.blob_chunk_bytes = parser.getint("Raft", "blob_chunk_kb", fallback=256) * 1024
+        self.entry_compression = parser.get("Raft", "entry_compression", fallback="none")
+        if self.entry_compression not in ENTRY_COMPRESSIONS:
+            raise ValueError(f"entry_compression must be one of {', '.join(ENTRY_COMPRESSIONS)}")
+        self.entry_compression_level = parser.getint("Raft", "entry_compression_level", fallback=1)
+        self.entry_compression_dictionary = parser.get("Raft", "entry_compression_dictionary", fallback="")
+        self.max_sessions = parser.getint("Raft", "max_sessions", fallback=10000)
+        self.session_ttl = parser.getint("Raft", "session_ttl_s", fallback=3600)
+
+    def server_address(self, server_id):
+        return f"{self.base_address}:{self.base_port + server_id}"
+
+def parse_worker_count(value, auto):
+    return auto if value.strip() == "auto" else int(value)
+
+def parse_id_list(value):
+    return [int(part) for part in value.split(",") if part.strip()]
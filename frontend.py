@@ -1,44 +1,654 @@
 from concurrent import futures
-import subprocess
+import argparse
+import asyncio
+import functools
+import itertools
+import time
+import zlib
 import grpc
 
 import raft_pb2 as pb
 import raft_pb2_grpc as pb_grpc
+from aio_futures import shielded
+from batching import Batcher
+from adaptive_executor import thread_pool_server
+from channel_pool import ChannelPool, GRPC_COMPRESSION, SERVER_OPTIONS
+from config import Config, SERVING_MODES
+from storage import wipe_state
+from supervisor import Supervisor, wait_until_ready
+from wire import as_binary, text_reply
+
+class ClusterClient:
+    """Forwards client operations from the frontend to the Raft servers."""
+
+    def __init__(self, config):
+        self.config = config
+        # Membership of the most recent StartRaft, reused when a single server is restarted.
+        self.members = None
+        self.learners = None
+        self.pool = ChannelPool.from_config(config, config.client_compression)
+        # Used by the *_async methods; its channels are created lazily inside the event loop.
+        self.aio_pool = ChannelPool.from_config(config, config.client_compression, aio=True)
+        # Raft group -> server believed to lead it; only replaced on wrongLeader or an RPC failure.
+        self.leaders = {}
+        # Fans requests out to the groups they involve, each RPC worker to every group at once.
+        self.group_executor = futures.ThreadPoolExecutor(config.max_workers * config.groups,
+                                                         thread_name_prefix="group-call")
+
+    def servers(self):
+        return self.members if self.members is not None else self.config.active
+
+    def non_voters(self):
+        return self.learners if self.learners is not None else self.config.learners
+
+    def groups(self):
+        return range(self.config.groups)
+
+    def group_for(self, key):
+        return group_for_key(key, self.config.groups)
+
+    def group_prefix(self, group):
+        """Labels a per-group message; empty when there is only one group."""
+        return "" if self.config.groups == 1 else f"group {group}: "
+
+    def call_leader(self, invoke, attempt_timeout=None, group=0):
+        """Returns invoke(stub, timeout) as answered by group's leader, or None if none answered."""
+        search = LeaderSearch(self, group, attempt_timeout)
+        while not search.finished:
+            try:
+                reply = invoke(self.pool.server_stub(search.target), search.timeout())
+            except grpc.RpcError:
+                reply = None
+            time.sleep(search.record(reply))
+        return search.result
+
+    async def call_leader_async(self, invoke, group=0):
+        """call_leader for grpc.aio: invoke(stub, timeout) returns an awaitable."""
+        search = LeaderSearch(self, group)
+        while not search.finished:
+            try:
+                reply = await invoke(self.aio_pool.server_stub(search.target), search.timeout())
+            except grpc.RpcError:
+                reply = None
+            await asyncio.sleep(search.record(reply))
+        return search.result
+
+    def call_groups(self, call, groups=None):
+        """Runs call(group) for every group (default: all) in parallel; returns the results in order."""
+        groups = list(self.groups()) if groups is None else groups
+        if len(groups) <= 1:
+            return [call(group) for group in groups]
+        return list(self.group_executor.map(call, groups))
+
+    def call_leaders(self, method, requests):
+        """Sends each request to the leader of its groupId with stub.<method>, in parallel.
+
+        Returns the replies in order, None where no leader answered.
+        """
+        def call(request):
+            return self.call_leader(lambda stub, timeout: getattr(stub, method)(request, timeout=timeout),
+                                    group=request.groupId)
+        if len(requests) <= 1:
+            return [call(request) for request in requests]
+        return list(self.group_executor.map(call, requests))
+
+    async def call_leaders_async(self, method, requests):
+        def invoke(request):
+            return lambda stub, timeout: getattr(stub, method)(request, timeout=timeout)
+        return await asyncio.gather(*(self.call_leader_async(invoke(request), request.groupId)
+                                      for request in requests))
+
+    def get(self, request):
+        """Reads over the binary path; a GetKey is answered with a Reply, a BinaryGetKey with a BinaryReply."""
+        binary = as_binary(request)
+        binary.groupId = self.group_for(binary.key)
+        reply = self.call_leader(lambda stub, timeout: stub.GetBytes(binary, timeout=timeout),
+                                 group=binary.groupId)
+        return get_reply(request, reply)
+
+    async def get_async(self, request):
+        binary = as_binary(request)
+        binary.groupId = self.group_for(binary.key)
+        reply = await self.call_leader_async(lambda stub, timeout: stub.GetBytes(binary, timeout=timeout),
+                                             binary.groupId)
+        return get_reply(request, reply)
+
+    def put_batch(self, items, group=0):
+        """Writes BinaryKeyValue items through the leader of group; returns one Reply per item."""
+        batch = pb.BinaryKeyValueBatch(items=items, groupId=group)
+        reply = self.call_leader(lambda stub, timeout: stub.PutBytesBatch(batch, timeout=timeout), group=group)
+        if reply is None:
+            return [no_leader() for _ in items]
+        if reply.error:
+            return [pb.Reply(error=reply.error) for _ in items]
+        return list(reply.replies)
+
+    def put_stream(self, first, chunks):
+        """Streams a value, first chunk then chunks, to the leader of the key's group.
+
+        The chunks can only be read once, so a failed attempt is not retried here; the
+        client sees the error (or wrongLeader) and streams the value again.
+        """
+        first.groupId = self.group_for(first.key)
+        leader = self.stream_leader(first.groupId)
+        if leader is None:
+            return no_leader(pb.BinaryReply)
+        try:
+            reply = self.pool.server_stub(leader).PutStream(itertools.chain([first], chunks),
+                                                            timeout=self.config.install_snapshot_timeout)
+        except grpc.RpcError as e:
+            reply = pb.BinaryReply(error=f"Put stream to server {leader} failed: {e.code().name}")
+        return self.stream_reply(first.groupId, reply)
+
+    async def put_stream_async(self, first, chunks):
+        first.groupId = self.group_for(first.key)
+        leader = await asyncio.to_thread(self.stream_leader, first.groupId)
+        if leader is None:
+            return no_leader(pb.BinaryReply)
+
+        async def forward():
+            yield first
+            async for chunk in chunks:
+                yield chunk
+        try:
+            reply = await self.aio_pool.server_stub(leader).PutStream(
+                forward(), timeout=self.config.install_snapshot_timeout)
+        except grpc.RpcError as e:
+            reply = pb.BinaryReply(error=f"Put stream to server {leader} failed: {e.code().name}")
+        return self.stream_reply(first.groupId, reply)
+
+    def stream_leader(self, group):
+        leader = self.leaders.get(group)
+        if leader is None:
+            found = self.wait_for_leader(time.monotonic() + self.config.rpc_timeout * 5, [group])
+            leader = found[group] if found else None
+        return leader
+
+    def stream_reply(self, group, reply):
+        if reply.wrongLeader or reply.error:
+            self.leaders.pop(group, None)
+        if reply.HasField("leaderHint"):
+            self.leaders[group] = reply.leaderHint
+        return reply
+
+    def get_stream(self, request):
+        """Yields the ValueChunks of request.key's value, read from the leader of its group."""
+        request.groupId = self.group_for(request.key)
+        calls = []
+
+        def open_stream(stub, timeout):
+            call = stub.GetStream(request, timeout=self.config.install_snapshot_timeout)
+            calls.append(call)
+            return next(call, None) or pb.ValueChunk(error="Empty value stream")
+        first = self.call_leader(open_stream, group=request.groupId)
+        if first is None:
+            yield no_leader(pb.ValueChunk)
+            return
+        yield first
+        try:
+            yield from calls[-1]
+        except grpc.RpcError as e:
+            yield pb.ValueChunk(error=f"Value stream broke off: {e.code().name}")
+
+    async def get_stream_async(self, request):
+        request.groupId = self.group_for(request.key)
+        calls = []
+
+        async def open_stream(stub, timeout):
+            call = stub.GetStream(request, timeout=self.config.install_snapshot_timeout)
+            calls.append(call)
+            chunk = await call.read()
+            return chunk if chunk is not grpc.aio.EOF else pb.ValueChunk(error="Empty value stream")
+        first = await self.call_leader_async(open_stream, request.groupId)
+        if first is None:
+            yield no_leader(pb.ValueChunk)
+            return
+        yield first
+        try:
+            while (chunk := await calls[-1].read()) is not grpc.aio.EOF:
+                yield chunk
+        except grpc.RpcError as e:
+            yield pb.ValueChunk(error=f"Value stream broke off: {e.code().name}")
+
+    def split_by_group(self, keys):
+        """Maps each group owning some of keys to the positions of its keys."""
+        positions = {}
+        for position, key in enumerate(keys):
+            positions.setdefault(self.group_for(key), []).append(position)
+        return positions
+
+    def multi_get(self, keys):
+        """Reads keys with one MultiGet per group involved; values come back in key order."""
+        requests = self.multi_get_requests(keys)
+        return self.multi_get_reply(keys, requests, self.call_leaders("MultiGet", requests))
+
+    async def multi_get_async(self, keys):
+        requests = self.multi_get_requests(keys)
+        return self.multi_get_reply(keys, requests, await self.call_leaders_async("MultiGet", requests))
+
+    def multi_get_requests(self, keys):
+        positions = self.split_by_group(keys)
+        return [pb.MultiGetArgs(keys=[keys[p] for p in positions[group]], groupId=group)
+                for group in sorted(positions)]
+
+    def multi_get_reply(self, keys, requests, replies):
+        reply = self.combine_replies(replies, [request.groupId for request in requests], pb.MultiReply)
+        if reply.error:
+            return reply
+        values = {}
+        for request, group_reply in zip(requests, replies):
+            values.update(zip(request.keys, group_reply.values))
+        return pb.MultiReply(values=[values[key] for key in keys])
+
+    def multi_put(self, items, client_id=0, request_id=0):
+        """Writes items as one log entry per group involved; each group's share is atomic."""
+        requests = self.multi_put_requests(items, client_id, request_id)
+        return self.multi_put_reply(requests, self.call_leaders("MultiPut", requests))
+
+    async def multi_put_async(self, items, client_id=0, request_id=0):
+        requests = self.multi_put_requests(items, client_id, request_id)
+        return self.multi_put_reply(requests, await self.call_leaders_async("MultiPut", requests))
+
+    def multi_put_requests(self, items, client_id, request_id):
+        positions = self.split_by_group([item.key for item in items])
+        return [pb.MultiPutArgs(items=[items[p] for p in positions[group]], groupId=group,
+                                clientId=client_id, requestId=request_id)
+                for group in sorted(positions)]
+
+    def multi_put_reply(self, requests, replies):
+        reply = self.combine_replies(replies, [request.groupId for request in requests], pb.MultiReply)
+        return reply if reply.error else pb.MultiReply(swapped=True)
+
+    def compare_and_set(self, request):
+        error = self.route_compare_and_set(request)
+        if error is not None:
+            return error
+        return compare_and_set_reply(self.call_leaders("CompareAndSet", [request])[0])
+
+    async def compare_and_set_async(self, request):
+        error = self.route_compare_and_set(request)
+        if error is not None:
+            return error
+        return compare_and_set_reply((await self.call_leaders_async("CompareAndSet", [request]))[0])
+
+    def route_compare_and_set(self, request):
+        """Sets request.groupId; returns an error MultiReply if its keys span several groups."""
+        keys = [item.key for item in request.items] + [condition.key for condition in request.expected]
+        groups = set(self.split_by_group(keys))
+        if len(groups) > 1:
+            # One log entry, and so atomicity, is only available within a group.
+            return pb.MultiReply(error="CompareAndSet keys must all belong to one Raft group")
+        request.groupId = groups.pop() if groups else 0
+        return None
+
+    def wait_for_leader(self, deadline, groups=None):
+        """Polls the members until every group (default: all) has a leader.
+
+        Returns {group: leader id}, or None if some group has none by deadline.
+        """
+        groups = list(self.groups()) if groups is None else groups
+        while time.monotonic() < deadline:
+            leaders = {}
+            for server_id in self.servers():
+                try:
+                    state = self.pool.server_stub(server_id).GetState(
+                        pb.Empty(), timeout=self.config.rpc_timeout, wait_for_ready=True)
+                except grpc.RpcError:
+                    continue
+                for group in state.ledGroups:
+                    leaders[group] = server_id
+            if all(group in leaders for group in groups):
+                self.leaders.update(leaders)
+                return {group: leaders[group] for group in groups}
+            time.sleep(self.config.heartbeat_interval / 5)
+        return None
+
+    def server_restarted(self, server_id):
+        # The old channel may sit in reconnect backoff; a fresh one connects straight away.
+        self.pool.discard(self.pool.server_address(server_id))
+
+    def add_server(self, server_id):
+        """Asks every group's leader to add server_id, which must already be running, as a voter."""
+        # Covers the learner's catch-up plus committing two membership changes.
+        attempt_timeout = self.config.catch_up_timeout + self.config.rpc_timeout * 10
+
+        def add(group):
+            request = pb.IntegerArg(arg=server_id, groupId=group)
+            return self.call_leader(lambda stub, timeout: stub.AddServer(request, timeout=timeout),
+                                    attempt_timeout, group)
+        reply = self.combine_replies(self.call_groups(add))
+        if not reply.error:
+            self.members = sorted(set(self.servers()) | {server_id})
+            self.learners = [i for i in self.non_voters() if i != server_id]
+        return reply
+
+    def remove_server(self, server_id):
+        def remove(group):
+            request = pb.IntegerArg(arg=server_id, groupId=group)
+            return self.call_leader(lambda stub, timeout: stub.RemoveServer(request, timeout=timeout),
+                                    group=group)
+        reply = self.combine_replies(self.call_groups(remove))
+        if not reply.error:
+            self.members = [i for i in self.servers() if i != server_id]
+            self.learners = [i for i in self.non_voters() if i != server_id]
+        return reply
+
+    def transfer_leadership(self, server_id, groups=None):
+        """Asks the leaders of groups (default: all) to hand over to server_id (-1: any voter)."""
+        attempt_timeout = self.config.transfer_timeout + self.config.rpc_timeout
+        old_leaders = {}
+
+        def transfer(group):
+            request = pb.IntegerArg(arg=server_id, groupId=group)
+            reply = self.call_leader(lambda stub, timeout: stub.TransferLeadership(request, timeout=timeout),
+                                     attempt_timeout, group)
+            old_leaders[group] = self.leaders.get(group)
+            return reply
+        groups = list(self.groups()) if groups is None else groups
+        reply = self.combine_replies(self.call_groups(transfer, groups), groups)
+        if reply.error:
+            return reply
+        new_leaders = self.wait_for_leader(time.monotonic() + self.config.election_timeout_max * 2, groups)
+        if new_leaders is None:
+            return pb.Reply(error="A leader stepped down but no new leader was elected")
+        return pb.Reply(value="; ".join(
+            f"{self.group_prefix(g)}Leadership transferred from server {old_leaders[g]} to server {new_leaders[g]}"
+            for g in groups))
+
+    def combine_replies(self, replies, groups=None, reply_type=pb.Reply):
+        """Folds per-group replies (None: no leader answered) into the first failure, else the first reply."""
+        groups = list(self.groups()) if groups is None else groups
+        for group, reply in zip(groups, replies):
+            if reply is None:
+                reply = no_leader(reply_type)
+            if reply.error:
+                return reply_type(wrongLeader=reply.wrongLeader, error=self.group_prefix(group) + reply.error)
+        return replies[0] if replies else reply_type()
+
+class LeaderSearch:
+    """State of one call_leader attempt: which server to ask next and when to give up.
+
+    Requests go straight to the cached leader. On wrongLeader the server's leaderHint is
+    followed; without one (or after an RPC failure) the next server is tried, one at a
+    time, pausing briefly after each full pass while an election settles. A pass in which
+    no server answered at all gives up at once: there is no cluster to wait for.
+    """
+
+    def __init__(self, client, group=0, attempt_timeout=None):
+        self.client = client
+        self.group = group
+        self.servers = client.servers()
+        self.attempt_timeout = attempt_timeout or client.config.rpc_timeout * 2
+        self.deadline = time.monotonic() + self.attempt_timeout + client.config.rpc_timeout * 3
+        leader = client.leaders.get(group)
+        self.target = leader if leader in self.servers else self.servers[0]
+        self.misses = 0
+        self.unreachable = 0
+        self.finished = False
+        self.result = None
+
+    def timeout(self):
+        remaining = self.deadline - time.monotonic()
+        return max(min(remaining, self.attempt_timeout), 0.001)
+
+    def record(self, reply):
+        """Takes the target's reply (None if the RPC failed); returns the pause before the next try."""
+        if reply is not None and not reply.wrongLeader:
+            self.client.leaders[self.group] = self.target
+            self.result = reply
+            self.finished = True
+            return 0
+
+        self.client.leaders.pop(self.group, None)
+        self.unreachable = self.unreachable + 1 if reply is None else 0
+        if self.unreachable >= len(self.servers) or time.monotonic() >= self.deadline:
+            self.finished = True
+            return 0
+        if (reply is not None and reply.HasField("leaderHint")
+                and reply.leaderHint in self.servers and reply.leaderHint != self.target):
+            self.target = reply.leaderHint
+            return 0
+        self.target = self.servers[(self.servers.index(self.target) + 1) % len(self.servers)]
+        self.misses += 1
+        return self.client.config.heartbeat_interval if self.misses % len(self.servers) == 0 else 0
+
+def group_for_key(key, groups):
+    """Raft group owning key (str or bytes); crc32, unlike hash(), is the same in every process."""
+    return zlib.crc32(key.encode() if isinstance(key, str) else key) % groups
+
+def get_reply(request, reply):
+    """The reply to a GetKey or BinaryGetKey request, given the server's BinaryReply or None."""
+    if reply is None:
+        reply = no_leader(pb.BinaryReply)
+    return reply if isinstance(request, pb.BinaryGetKey) else text_reply(reply)
+
+def compare_and_set_reply(reply):
+    return reply if reply is not None else no_leader(pb.MultiReply)
+
+def no_leader(reply_type=pb.Reply):
+    return reply_type(wrongLeader=True, error="No leader available")
 
 class FrontEndService(pb_grpc.FrontEndServicer):
+    def __init__(self, config, executor=None):
+        self.config = config
+        self.executor = executor
+        self.cluster = ClusterClient(config)
+        self.supervisor = Supervisor(config, self.cluster)
+        # Concurrent Puts to a group share one PutBatch RPC, i.e. one log append and one
+        # replication round; each group's batches go to its own leader.
+        self.put_batchers = [Batcher(functools.partial(self.cluster.put_batch, group=group),
+                                     config.max_batch_size, config.max_linger)
+                             for group in self.cluster.groups()]
+
+    def put_batcher(self, request):
+        return self.put_batchers[self.cluster.group_for(request.key)]
+
     def Get(self, request, context):
-        return pb.Reply(error="Not implemented", wrongLeader=True)
-    
+        # Reads bypass the log: the leader serves them after a ReadIndex or lease check.
+        return self.cluster.get(request)
+
     def Put(self, request, context):
-        return pb.Reply(error="Not implemented", wrongLeader=True)
-    
+        return self.put_batcher(request).submit(as_binary(request)).result()
+
+    def GetBytes(self, request, context):
+        return self.cluster.get(request)
+
+    def PutBytes(self, request, context):
+        return as_binary(self.put_batcher(request).submit(request).result())
+
+    def GetStream(self, request, context):
+        return self.cluster.get_stream(request)
+
+    def PutStream(self, request_iterator, context):
+        first = next(request_iterator, None)
+        if first is None:
+            return pb.BinaryReply(error="Empty value stream")
+        return self.cluster.put_stream(first, request_iterator)
+
+    def MultiGet(self, request, context):
+        return self.cluster.multi_get(list(request.keys))
+
+    def MultiPut(self, request, context):
+        return self.cluster.multi_put(list(request.items), request.clientId, request.requestId)
+
+    def CompareAndSet(self, request, context):
+        return self.cluster.compare_and_set(request)
+
+    def GetMetrics(self, request, context):
+        values = {"batcher.queue_depth": sum(len(batcher.queue) for batcher in self.put_batchers),
+                  "process.cpu_ms": time.process_time() * 1000}
+        if self.executor is not None:
+            values.update(self.executor.stats())
+        values.update(self.supervisor.stats())
+        return pb.Metrics(values=values)
+
+    def GetServerStatus(self, request, context):
+        return pb.ServerStatusList(servers=self.supervisor.status())
+
     def StartRaft(self, request, context):
-        start_raft(request.arg)
-        return pb.Reply(value="Started Raft cluster of size {request.arg}")
-    
+        """Starts every server at once and returns when all serve and every group has a leader."""
+        cluster = self.cluster
+        # StartRaft(n) makes ids 0..n-1 the voters; configured learners beyond them join too.
+        cluster.members = list(range(request.arg))
+        cluster.learners = [i for i in self.config.learners if i >= request.arg]
+        servers = cluster.members + cluster.learners
+        started_at = time.monotonic()
+        deadline = started_at + self.config.startup_timeout
+        latencies = start_raft(self.supervisor, cluster.members, cluster.learners, self.config, deadline)
+        for server_id in servers:
+            cluster.server_restarted(server_id)
+        missing = [i for i in servers if i not in latencies]
+        if missing:
+            return pb.Reply(error=f"Servers {missing} did not start within {self.config.startup_timeout:g}s")
+        leaders = cluster.wait_for_leader(deadline)
+        if leaders is None:
+            return pb.Reply(error=f"No leader elected within {self.config.startup_timeout:g}s")
+        details = ", ".join(f"server {i} {latencies[i] * 1000:.0f} ms" for i in servers)
+        if self.config.groups == 1:
+            details += f"; leader {leaders[0]}"
+        else:
+            details += "; leaders " + ", ".join(f"group {g}: {leaders[g]}" for g in sorted(leaders))
+        return pb.Reply(value=f"Started Raft cluster of size {request.arg} in "
+                              f"{(time.monotonic() - started_at) * 1000:.0f} ms ({details})")
+
     def StartServer(self, request, context):
-        start_server(request.arg)
-        return pb.Reply(value=f"Server {request.arg} started")
+        cluster = self.cluster
+        server_id = request.arg
+        is_member = server_id in cluster.servers() or server_id in cluster.non_voters()
+        learners = cluster.non_voters()
+        if not is_member:
+            # A new server starts out as a learner, so it cannot disrupt the cluster, and is
+            # promoted by the leader once it has caught up.
+            wipe_state(self.config, server_id)
+            learners = learners + [server_id]
+        led_groups = [group for group, leader in cluster.leaders.items() if leader == server_id]
+        if self.supervisor.is_running(server_id) and led_groups:
+            # Drain the leader first, so restarting it costs a quick handover rather than a
+            # full election timeout.
+            cluster.transfer_leadership(-1, led_groups)
+        started_at = time.monotonic()
+        ready = self.supervisor.start(server_id, cluster.servers(), learners)
+        latencies = wait_until_ready({server_id: ready}, started_at, started_at + self.config.startup_timeout)
+        cluster.server_restarted(server_id)
+        if server_id not in latencies:
+            return pb.Reply(error=f"Server {server_id} did not start within {self.config.startup_timeout:g}s")
+        started = f"Server {server_id} started in {latencies[server_id] * 1000:.0f} ms"
+        if is_member:
+            # A restart: the server rejoins with its persisted state (or is caught up by the leader).
+            return pb.Reply(value=started)
 
-def start_server(server_id):
-    cmd = ["python", "server.py", str(server_id)]
-    process = subprocess.Popen(
-        ["bash", "-c", f"exec -a raftserver{server_id+1} python server.py {server_id}"]
-    )
+        reply = cluster.add_server(server_id)
+        if reply.error:
+            return reply
+        return pb.Reply(value=f"{started} and joined the cluster")
 
-def start_raft(num_servers):
-    for i in range(num_servers):
-        process = subprocess.Popen(
-            ["bash", "-c", f"exec -a raftserver{i+1} python server.py {i}"]
-        )
+    def RemoveServer(self, request, context):
+        reply = self.cluster.remove_server(request.arg)
+        if not reply.error:
+            # The leader stops replicating to the server once its removal is appended, so it
+            # never learns of it and would otherwise keep campaigning.
+            self.supervisor.stop(request.arg)
+        return reply
+
+    def TransferLeadership(self, request, context):
+        return self.cluster.transfer_leadership(request.arg)
+
+class AsyncFrontEndService(pb_grpc.FrontEndServicer):
+    """FrontEndService for grpc.aio: Gets and Puts wait on the event loop, not on a thread."""
+
+    def __init__(self, config):
+        self.sync_service = FrontEndService(config)
+        self.cluster = self.sync_service.cluster
+
+    async def Get(self, request, context):
+        return await self.cluster.get_async(request)
+
+    async def Put(self, request, context):
+        return await shielded(self.sync_service.put_batcher(request).submit(as_binary(request)))
+
+    async def GetBytes(self, request, context):
+        return await self.cluster.get_async(request)
+
+    async def PutBytes(self, request, context):
+        return as_binary(await shielded(self.sync_service.put_batcher(request).submit(request)))
+
+    async def GetStream(self, request, context):
+        async for chunk in self.cluster.get_stream_async(request):
+            yield chunk
+
+    async def PutStream(self, request_iterator, context):
+        chunks = aiter(request_iterator)
+        first = await anext(chunks, None)
+        if first is None:
+            return pb.BinaryReply(error="Empty value stream")
+        return await self.cluster.put_stream_async(first, chunks)
+
+    async def MultiGet(self, request, context):
+        return await self.cluster.multi_get_async(list(request.keys))
+
+    async def MultiPut(self, request, context):
+        return await self.cluster.multi_put_async(list(request.items), request.clientId, request.requestId)
+
+    async def CompareAndSet(self, request, context):
+        return await self.cluster.compare_and_set_async(request)
+
+    async def GetMetrics(self, request, context):
+        return self.sync_service.GetMetrics(request, context)
+
+    async def StartRaft(self, request, context):
+        return await asyncio.to_thread(self.sync_service.StartRaft, request, context)
+
+    async def StartServer(self, request, context):
+        return await asyncio.to_thread(self.sync_service.StartServer, request, context)
+
+    async def RemoveServer(self, request, context):
+        return await asyncio.to_thread(self.sync_service.RemoveServer, request, context)
+
+    async def TransferLeadership(self, request, context):
+        return await asyncio.to_thread(self.sync_service.TransferLeadership, request, context)
+
+    async def GetServerStatus(self, request, context):
+        return self.sync_service.GetServerStatus(request, context)
+
+def start_raft(supervisor, members, learners, config, deadline):
+    """Launches every server at once; returns {server id: startup seconds} for those ready by deadline."""
+    # StartRaft always begins from a clean slate; StartServer keeps persisted state.
+    supervisor.stop_all()
+    started_at = time.monotonic()
+    ready = {}
+    for i in members + learners:
+        wipe_state(config, i)
+        ready[i] = supervisor.start(i, members, learners)
+    return wait_until_ready(ready, started_at, deadline)
 
 def serve():
-    server = grpc.server(futures.ThreadPoolExecutor(max_workers=10))
-    pb_grpc.add_FrontEndServicer_to_server(FrontEndService(), server)
+    args = parse_args()
+    config = Config()
+    if (args.serving_mode or config.serving_mode) == "aio":
+        asyncio.run(serve_aio(config))
+        return
+
+    server, executor = thread_pool_server(config, SERVER_OPTIONS, GRPC_COMPRESSION[config.client_compression])
+    pb_grpc.add_FrontEndServicer_to_server(FrontEndService(config, executor), server)
     server.add_insecure_port("127.0.0.1:8001")
     server.start()
     print("[frontend] listening on 127.0.0.1:8001", flush=True)
     server.wait_for_termination()
 
+async def serve_aio(config):
+    server = grpc.aio.server(options=SERVER_OPTIONS, compression=GRPC_COMPRESSION[config.client_compression],
+                             maximum_concurrent_rpcs=config.max_workers + config.max_queued_rpcs)
+    pb_grpc.add_FrontEndServicer_to_server(AsyncFrontEndService(config), server)
+    server.add_insecure_port("127.0.0.1:8001")
+    await server.start()
+    print("[frontend] listening on 127.0.0.1:8001 (aio)", flush=True)
+    await server.wait_for_termination()
+
+def parse_args():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--serving-mode', choices=SERVING_MODES, default=None,
+                        help='Serve RPCs from a thread pool or a grpc.aio event loop (defaults to config.ini)')
+    return parser.parse_args()
+
 if __name__ == "__main__":
-    serve()
\ No newline at end of file
+    serve()
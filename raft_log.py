@@ -0,0 +1,165 @@
+from array import array
+import bisect
+
+import raft_pb2 as pb
+from storage import MemoryStorage
+
+# Entries are stored framed as the `entries` field of AppendEntriesArgs, so any run of
+# the arena is a valid serialized AppendEntriesArgs holding just those entries.
+ENTRY_TAG = bytes([pb.AppendEntriesArgs.ENTRIES_FIELD_NUMBER << 3 | 2])
+
+class RaftLog:
+    """The Raft log, held in memory and mirrored to a storage backend.
+
+    Entries up to snapshot_index have been compacted into a snapshot. Position 0 is a
+    sentinel standing for snapshot_index and carrying its term, so a fresh log starts
+    with a sentinel at index 0 and term 0.
+
+    Entries are kept compactly rather than as LogEntry objects: terms and types in arrays,
+    and the serialized entries back to back in one bytearray arena, the entry at position
+    p spanning offsets[p]:offsets[p + 1]. entry_at() parses a single entry on demand and
+    add_entries_to() hands a whole run of the arena to the protobuf parser in one call.
+    """
+
+    def __init__(self, storage=None, entries=(), snapshot_index=0, snapshot_term=0):
+        self.storage = storage if storage is not None else MemoryStorage()
+        self._reset(snapshot_index, snapshot_term)
+        self._extend(entries)
+
+    def _reset(self, snapshot_index, snapshot_term):
+        self.snapshot_index = snapshot_index
+        self.terms = array("q", [snapshot_term])
+        self.types = array("b", [pb.NOOP])
+        self.offsets = array("Q", [0, 0])  # the sentinel has no bytes in the arena
+        self.arena = bytearray()
+
+    def _extend(self, entries):
+        for entry in entries:
+            data = entry.SerializeToString()
+            self.arena += ENTRY_TAG
+            self.arena += encode_varint(len(data))
+            self.arena += data
+            self.offsets.append(len(self.arena))
+            self.terms.append(entry.term)
+            self.types.append(entry.type)
+
+    def last_index(self):
+        return self.snapshot_index + len(self.terms) - 1
+
+    def last_term(self):
+        return self.terms[-1]
+
+    def snapshot_term(self):
+        return self.terms[0]
+
+    def size_bytes(self):
+        return len(self.arena)
+
+    def term_at(self, index):
+        """Term of the entry at index, or -1 if it is compacted away or beyond the log."""
+        if index < self.snapshot_index or index > self.last_index():
+            return -1
+        return self.terms[index - self.snapshot_index]
+
+    def first_index_of_term(self, term, index):
+        """First index holding term in the run of term entries ending at index, past the snapshot."""
+        # Terms never decrease along the log, so the run can be found by bisection.
+        position = bisect.bisect_left(self.terms, term, 1, index - self.snapshot_index + 1)
+        return self.snapshot_index + position
+
+    def last_index_of_term(self, term, index):
+        """Last index at or before index holding term, or None if no entry there has it."""
+        last = min(index, self.last_index()) - self.snapshot_index
+        if last < 0:
+            return None
+        position = bisect.bisect_right(self.terms, term, 0, last + 1) - 1
+        if position < 0 or self.terms[position] != term:
+            return None
+        return self.snapshot_index + position
+
+    def type_at(self, index):
+        return self.types[index - self.snapshot_index]
+
+    def entry_at(self, index):
+        if index == self.snapshot_index:
+            return pb.LogEntry(term=self.terms[0], type=pb.NOOP)
+        return self.slice(index, index + 1)[0]
+
+    def slice(self, start, end):
+        """Entries in [start, end), clamped to the end of the log. start must be past the snapshot."""
+        request = pb.AppendEntriesArgs()
+        self.add_entries_to(request, start, end)
+        return request.entries
+
+    def add_entries_to(self, request, start, end):
+        """Appends entries [start, end), clamped to the end of the log, to request.entries.
+
+        start must be past the snapshot. Returns the number of entries added.
+        """
+        first, last = self._positions(start, end)
+        if first >= last:
+            return 0
+        # Views must be released before the arena can be resized again.
+        with memoryview(self.arena) as arena, arena[self.offsets[first]:self.offsets[last]] as run:
+            request.MergeFromString(run)
+        return last - first
+
+    def run_bytes(self, start, end):
+        """(serialized `entries` fields of entries [start, end), their number), clamped like add_entries_to."""
+        first, last = self._positions(start, end)
+        if first >= last:
+            return b"", 0
+        return bytes(self.arena[self.offsets[first]:self.offsets[last]]), last - first
+
+    def _positions(self, start, end):
+        return start - self.snapshot_index, min(end, self.last_index() + 1) - self.snapshot_index
+
+    def append(self, entries):
+        self.storage.append(self.last_index() + 1, entries)
+        self._extend(entries)
+
+    def truncate_from(self, index):
+        """Drop every entry at or after index."""
+        self.storage.truncate_from(index)
+        position = index - self.snapshot_index
+        del self.arena[self.offsets[position]:]
+        del self.offsets[position + 1:]
+        del self.terms[position:]
+        del self.types[position:]
+
+    def compact(self, index, snapshot):
+        """Persist snapshot as covering everything up to index and drop those entries."""
+        self.compact_prepared(index, self.storage.prepare_snapshot(index, self.term_at(index), snapshot))
+
+    def compact_prepared(self, index, prepared):
+        """compact() with a snapshot already written by storage.prepare_snapshot()."""
+        term = self.term_at(index)
+        self.storage.commit_snapshot(prepared, self.slice(index + 1, self.last_index() + 1))
+        position = index - self.snapshot_index
+        base = self.offsets[position + 1]
+        del self.arena[:base]
+        self.offsets = array("Q", [0]) + array("Q", (offset - base for offset in self.offsets[position + 1:]))
+        self.terms = array("q", [term]) + self.terms[position + 1:]
+        self.types = array("b", [pb.NOOP]) + self.types[position + 1:]
+        self.snapshot_index = index
+
+    def install_snapshot(self, index, term, prepared):
+        """Adopt a snapshot from the leader, written by storage.prepare_snapshot(), keeping any
+        suffix that follows it unchanged."""
+        if self.term_at(index) == term:
+            self.compact_prepared(index, prepared)
+            return
+        self.storage.commit_snapshot(prepared, [])
+        self._reset(index, term)
+
+    def sync(self):
+        """Future resolved once everything appended so far is durable."""
+        return self.storage.sync()
+
+def encode_varint(value):
+    data = bytearray()
+    while value > 0x7f:
+        data.append(value & 0x7f | 0x80)
+        value >>= 7
+    data.append(value)
+    return data
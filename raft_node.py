@@ -0,0 +1,1150 @@
+from concurrent import futures
+import collections
+import functools
+import queue
+import random
+import threading
+import time
+import grpc
+
+import raft_pb2 as pb
+from blobs import blob_chunks, open_blob_store
+from channel_pool import ChannelPool
+from compression import EntryCodec, open_entry_codec
+from raft_log import RaftLog
+from state_machine import KVStateMachine
+from storage import completed_future, open_storage
+
+FOLLOWER = "follower"
+CANDIDATE = "candidate"
+LEADER = "leader"
+
+# Roles a server can be given by change_membership.
+VOTER = "voter"
+LEARNER = "learner"
+
+# Fraction of the minimum election timeout a leader lease lasts.
+LEASE_DRIFT_FACTOR = 0.9
+
+class NotLeaderError(Exception):
+    def __init__(self, leader_id=-1):
+        super().__init__("Not leader")
+        self.leader_id = leader_id
+
+class MembershipChangeError(Exception):
+    pass
+
+class LeadershipTransferError(Exception):
+    pass
+
+class BlobTransferError(Exception):
+    pass
+
+class RaftNode:
+    """A single Raft participant: elections, log replication and applying committed entries.
+
+    All mutable state is guarded by self.lock. Outgoing RPCs are issued as gRPC futures so
+    no lock is ever held across a network call.
+    """
+
+    def __init__(self, server_id, voters, config, learners=(), group_id=0, pool=None):
+        self.id = server_id
+        # Raft group this node belongs to; a server process runs one node per group.
+        self.group_id = group_id
+        self.name = f"server {server_id}" if config.groups == 1 else f"server {server_id} group {group_id}"
+        self.config = config
+        # Membership to use until the log or a snapshot says otherwise.
+        learners = sorted(set(learners) - set(voters))
+        if server_id not in learners:
+            voters = sorted(set(voters) | {server_id})
+        self.initial_membership = pb.Membership(voters=voters, learners=learners)
+
+        self.lock = threading.RLock()
+        self.apply_cond = threading.Condition(self.lock)
+        self.running = False
+
+        self.storage = open_storage(config, server_id, group_id)
+        self.current_term, self.voted_for, snapshot, entries = self.storage.load()
+        self.blobs = open_blob_store(config, server_id, group_id)
+        self.state_machine = KVStateMachine(config.max_sessions, config.session_ttl, self.blobs)
+        if snapshot is None:
+            self.log = RaftLog(self.storage, entries)
+        else:
+            snapshot_index, snapshot_term, data = snapshot
+            self.log = RaftLog(self.storage, entries, snapshot_index, snapshot_term)
+            self.state_machine.restore(data)
+        # Highest index known to be on local disk; the leader counts itself only up to here.
+        self.durable_index = self.log.last_index()
+        self.log_generation = 0
+
+        self.role = FOLLOWER
+        self.leader_id = -1
+        self.commit_index = self.log.snapshot_index
+        self.last_applied = self.log.snapshot_index
+        self.votes = set()
+        self.pre_votes = set()
+        self.pre_vote_started = 0.0
+        self.leader_since = 0.0
+        self.elections = 0
+        self.pre_votes_started = 0
+        self.quorum_step_downs = 0
+
+        self.next_index = {}
+        self.match_index = {}
+        self.replicators = {}
+        self.pending = {}  # log index -> (term, Future) for proposals awaiting apply
+
+        # Leader read state: followers acknowledge numbered heartbeat rounds, and each
+        # acknowledgement also extends the leader lease from the time its request was sent.
+        self.term_start_index = 0
+        self.read_round = 0
+        self.ack_round = {}
+        self.ack_time = {}
+        self.lease_expiry = 0.0
+        self.pending_reads = []  # (read_index, round, Future)
+        self.last_leader_contact = 0.0
+
+        # Leadership transfer in progress: proposals are refused until the target takes over.
+        self.transfer_target = None
+        self.transfer_deadline = 0.0
+        self.transfer_future = None
+        self.timeout_now_sent = False
+
+        self.pool = pool if pool is not None else ChannelPool.from_config(config, config.peer_compression)
+        # Compresses the entries this node sends as leader; None sends them as they are.
+        self.entry_codec = open_entry_codec(config)
+        self._reload_membership()
+        self._reset_election_deadline()
+
+    def start(self):
+        self.running = True
+        threading.Thread(target=self._run_ticker, daemon=True).start()
+        threading.Thread(target=self._run_applier, daemon=True).start()
+
+    def stop(self):
+        with self.lock:
+            self.running = False
+            self.apply_cond.notify_all()
+            self._wake_replicators()
+
+    def quorum(self):
+        return len(self.voters) // 2 + 1
+
+    def is_leader(self):
+        with self.lock:
+            return self.role == LEADER
+
+    def metrics(self):
+        with self.lock:
+            values = {
+                "raft.term": self.current_term,
+                "raft.is_leader": int(self.role == LEADER),
+                "raft.voters": len(self.voters),
+                "raft.learners": len(self.learners),
+                "raft.commit_index": self.commit_index,
+                "raft.last_applied": self.last_applied,
+                "raft.snapshot_index": self.log.snapshot_index,
+                "raft.log_entries": self.log.last_index() - self.log.snapshot_index,
+                "raft.log_bytes": self.log.size_bytes(),
+                "raft.pending_proposals": len(self.pending),
+                "raft.pending_reads": len(self.pending_reads),
+                "raft.pre_votes": self.pre_votes_started,
+                "raft.elections": self.elections,
+                "raft.check_quorum_step_downs": self.quorum_step_downs,
+                "state_machine.sessions": len(self.state_machine.sessions),
+                "state_machine.duplicates": self.state_machine.duplicates,
+            }
+        if self.entry_codec is not None:
+            values.update(self.entry_codec.metrics())
+        return values
+
+    # ---- client-facing -------------------------------------------------------------------
+
+    def propose(self, entries):
+        """Append entries to the leader's log; returns one Future per entry, resolved on apply."""
+        with self.lock:
+            if self.role != LEADER:
+                raise NotLeaderError(self.leader_id)
+            if self.transfer_target is not None:
+                raise NotLeaderError(self.transfer_target)
+            first = self.log.last_index() + 1
+            timestamp = int(time.time() * 1000)
+            for entry in entries:
+                entry.term = self.current_term
+                entry.timestampMs = timestamp
+            self.log.append(entries)
+            self._note_membership(first, entries)
+            proposals = []
+            for offset in range(len(entries)):
+                future = futures.Future()
+                self.pending[first + offset] = (self.current_term, future)
+                proposals.append(future)
+            self._sync_log()
+            self._wake_replicators()
+            self._advance_commit_index()
+            return proposals
+
+    def read_barrier(self):
+        """Returns a Future resolved once the state machine can serve a linearizable read.
+
+        ReadIndex: remember the commit index, confirm leadership with one heartbeat round to
+        a quorum, then wait until that index has been applied. In lease mode a leader whose
+        lease is still valid skips the heartbeat round entirely.
+        """
+        with self.lock:
+            if self.role != LEADER:
+                raise NotLeaderError(self.leader_id)
+            # Until the no-op from this term commits, commit_index may lag what earlier
+            # leaders committed, so the read index is at least the start of this term.
+            read_index = max(self.commit_index, self.term_start_index)
+            if self.config.read_mode == "lease" and time.monotonic() < self.lease_expiry:
+                read_round = 0
+            else:
+                self.read_round += 1
+                read_round = self.read_round
+                self._wake_replicators()
+            future = futures.Future()
+            self.pending_reads.append((read_index, read_round, future))
+            self._check_pending_reads()
+            return future
+
+    # ---- blobs ---------------------------------------------------------------------------
+
+    def replicate_blob(self, blob_id):
+        """Copies blob_id from this server's store to the other voters.
+
+        Returns once a quorum, this server included, holds it, so that whichever server
+        leads next can fetch it; raises BlobTransferError if too many copies failed.
+        """
+        with self.lock:
+            peers = [peer for peer in self.voters if peer != self.id]
+            needed = self.quorum() - 1
+        if needed <= 0:
+            return
+        stored = queue.SimpleQueue()
+        for peer in peers:
+            chunks = blob_chunks(self.blobs.open(blob_id), blob_id, self.group_id, self.config.blob_chunk_bytes)
+            call = self.pool.server_stub(peer).StoreBlob.future(chunks, timeout=self.config.install_snapshot_timeout)
+            call.add_done_callback(lambda call: stored.put(call.exception() is None and call.result().success))
+        copies = 0
+        for _ in peers:
+            if stored.get():
+                copies += 1
+                if copies >= needed:
+                    return
+        raise BlobTransferError(f"Blob stored on {copies + 1} servers; a quorum needs {needed + 1}")
+
+    def fetch_blob(self, blob_id):
+        """Copies blob_id into this server's store from any member holding it."""
+        with self.lock:
+            peers = [peer for peer in self.voters + self.learners if peer != self.id]
+        for peer in peers:
+            writer = self.blobs.writer(blob_id)
+            try:
+                for chunk in self.pool.server_stub(peer).FetchBlob(
+                        pb.BlobId(blobId=blob_id, groupId=self.group_id), timeout=self.config.install_snapshot_timeout):
+                    writer.write(chunk.data)
+            except grpc.RpcError:
+                writer.abort()
+                continue
+            writer.commit()
+            return
+        raise BlobTransferError(f"No server holds blob {blob_id}")
+
+    # ---- leadership transfer -------------------------------------------------------------
+
+    def transfer_leadership(self, target):
+        """Hands leadership to voter target (-1: the one with the most of the log).
+
+        Proposals are refused while the target catches up; once its log matches, it is sent
+        TimeoutNow and campaigns at once. Returns a Future resolved with target when this
+        server steps down, or failed with LeadershipTransferError after transfer_timeout.
+        """
+        with self.lock:
+            if self.role != LEADER:
+                raise NotLeaderError(self.leader_id)
+            if target == -1:
+                if not self.voting_peers:
+                    raise LeadershipTransferError("There is no other voter to transfer leadership to")
+                target = max(self.voting_peers, key=lambda peer: self.match_index[peer])
+            if target == self.id:
+                return completed_future(target)
+            if target not in self.voting_peers:
+                raise LeadershipTransferError(f"Server {target} is not a voter")
+            if self.transfer_target is not None:
+                raise LeadershipTransferError("Another leadership transfer is in progress")
+            self.transfer_target = target
+            self.transfer_deadline = time.monotonic() + self.config.transfer_timeout
+            self.transfer_future = futures.Future()
+            self.timeout_now_sent = False
+            # The target is elected without waiting for the followers' leader contact to
+            # age out, so the lease must not be relied on any more.
+            self.lease_expiry = 0.0
+            future = self.transfer_future
+            self._wake_replicators()
+            self._maybe_send_timeout_now()
+            return future
+
+    def _maybe_send_timeout_now(self):
+        target = self.transfer_target
+        if target is None or self.timeout_now_sent or self.match_index[target] < self.log.last_index():
+            return
+        self.timeout_now_sent = True
+        request = pb.TimeoutNowArgs(term=self.current_term, leaderId=self.id, groupId=self.group_id)
+        call = self.pool.server_stub(target).TimeoutNow.future(request, timeout=self.config.rpc_timeout)
+        call.add_done_callback(functools.partial(self._on_timeout_now_reply, target))
+
+    def _on_timeout_now_reply(self, target, call):
+        try:
+            reply = call.result()
+        except grpc.RpcError:
+            with self.lock:
+                if self.transfer_target == target:
+                    self.timeout_now_sent = False  # retried after the next acknowledgement
+            return
+        with self.lock:
+            if reply.term > self.current_term:
+                self._become_follower(reply.term)
+
+    def _end_transfer(self, error=None):
+        if self.transfer_target is None:
+            return
+        if error is None:
+            self.transfer_future.set_result(self.transfer_target)
+        else:
+            self.transfer_future.set_exception(error)
+        self.transfer_target = None
+        self.transfer_future = None
+
+    def handle_timeout_now(self, request):
+        with self.lock:
+            if request.term < self.current_term:
+                return pb.TimeoutNowReply(term=self.current_term)
+            if request.term > self.current_term:
+                self._become_follower(request.term)
+            # The leader has stopped taking writes and our log matches it: campaign right
+            # away, without a pre-vote the followers would refuse.
+            if self.role != LEADER and self.id in self.voters:
+                print(f"[{self.name}] leader {request.leaderId} is handing over leadership", flush=True)
+                self._start_election(leader_transfer=True)
+            return pb.TimeoutNowReply(term=self.current_term)
+
+    # ---- membership ----------------------------------------------------------------------
+
+    def add_server(self, server_id):
+        """Adds server_id as a learner, waits for it to catch up, then promotes it to voter.
+
+        Returns a Future resolved once the promotion is applied, or failed with
+        NotLeaderError or MembershipChangeError.
+        """
+        with self.lock:
+            if self.role != LEADER:
+                raise NotLeaderError(self.leader_id)
+            if server_id in self.voters:
+                return completed_future()
+        future = futures.Future()
+        threading.Thread(target=self._run_add_server, args=(server_id, future), daemon=True).start()
+        return future
+
+    def remove_server(self, server_id):
+        """Removes server_id from the cluster; returns a Future resolved once that is applied."""
+        with self.lock:
+            if server_id not in self.voters and server_id not in self.learners:
+                return completed_future()
+            return self.change_membership(server_id, None)
+
+    def change_membership(self, server_id, role):
+        """Proposes a CONFIG entry making server_id a VOTER, a LEARNER or (None) not a member.
+
+        Changes go one server at a time, so any two consecutive memberships share a majority.
+        The next may only start once the previous one and an entry of this term have
+        committed. Returns a Future resolved once the entry is applied.
+        """
+        with self.lock:
+            if self.role != LEADER:
+                raise NotLeaderError(self.leader_id)
+            if self.membership_index > self.commit_index or self.term_start_index > self.commit_index:
+                raise MembershipChangeError("Another membership change is in progress")
+            voters = [v for v in self.voters if v != server_id]
+            learners = [l for l in self.learners if l != server_id]
+            if role == VOTER:
+                voters.append(server_id)
+            elif role == LEARNER:
+                learners.append(server_id)
+            if not voters:
+                raise MembershipChangeError("Cannot remove the last voter")
+            membership = pb.Membership(voters=sorted(voters), learners=sorted(learners))
+            return self.propose([pb.LogEntry(type=pb.CONFIG, membership=membership)])[0]
+
+    def _run_add_server(self, server_id, future):
+        commit_timeout = self.config.rpc_timeout * 5
+        try:
+            with self.lock:
+                is_learner = server_id in self.learners
+            if not is_learner:
+                self.change_membership(server_id, LEARNER).result(timeout=commit_timeout)
+            self._wait_caught_up(server_id)
+            self.change_membership(server_id, VOTER).result(timeout=commit_timeout)
+        except futures.TimeoutError:
+            future.set_exception(MembershipChangeError("Timed out committing membership change"))
+        except Exception as e:
+            future.set_exception(e)
+        else:
+            future.set_result(None)
+
+    def _wait_caught_up(self, server_id):
+        """Blocks until a replication round to server_id finishes within an election timeout.
+
+        Each round waits for the learner to reach the leader's last index as of the round's
+        start; a round that quick means promoting it will not stall commits for long.
+        """
+        deadline = time.monotonic() + self.config.catch_up_timeout
+        while True:
+            round_start = time.monotonic()
+            with self.lock:
+                target = self.log.last_index()
+            while True:
+                with self.lock:
+                    if self.role != LEADER:
+                        raise NotLeaderError(self.leader_id)
+                    if self.match_index.get(server_id, 0) >= target:
+                        break
+                if time.monotonic() >= deadline:
+                    raise MembershipChangeError(f"Server {server_id} did not catch up in time")
+                time.sleep(self.config.heartbeat_interval)
+            if time.monotonic() - round_start < self.config.election_timeout_min:
+                return
+
+    def _note_membership(self, first_index, entries):
+        """Adopts the last CONFIG entry among entries just appended at first_index."""
+        for offset in range(len(entries) - 1, -1, -1):
+            if entries[offset].type == pb.CONFIG:
+                self._set_membership(entries[offset].membership, first_index + offset)
+                return
+
+    def _reload_membership(self):
+        """Adopts the newest membership in the log, else the snapshot's, else the initial one."""
+        for index in range(self.log.last_index(), self.log.snapshot_index, -1):
+            if self.log.type_at(index) == pb.CONFIG:
+                self._set_membership(self.log.entry_at(index).membership, index)
+                return
+        if self.state_machine.membership is not None:
+            self._set_membership(self.state_machine.membership, self.log.snapshot_index)
+        else:
+            self._set_membership(self.initial_membership, 0)
+
+    def _set_membership(self, membership, index):
+        # A membership takes effect as soon as its entry is in the log, committed or not.
+        self.membership_index = index
+        self.voters = sorted(membership.voters)
+        # Learners receive the log like any follower but never vote, stand for election or
+        # count towards a quorum.
+        self.learners = sorted(set(membership.learners) - set(self.voters))
+        self.peers = [p for p in self.voters + self.learners if p != self.id]
+        self.voting_peers = [p for p in self.voters if p != self.id]
+        if self.role != LEADER:
+            return
+        for peer in self.peers:
+            if peer not in self.replicators:
+                # A new member may have nothing yet: start from the beginning (or the snapshot).
+                self.next_index[peer] = 1
+                self.match_index[peer] = 0
+                self.ack_round[peer] = 0
+                self.ack_time[peer] = 0.0
+                self.replicators[peer] = Replicator(self, peer, self.current_term)
+                self.replicators[peer].start()
+        for peer in [p for p in self.replicators if p not in self.peers]:
+            self.replicators.pop(peer).cond.notify()
+        self._advance_commit_index()
+
+    # ---- Raft RPC handlers ---------------------------------------------------------------
+
+    def handle_append_entries(self, request):
+        reply, durable = self.begin_append_entries(request)
+        if durable is not None:
+            durable.result()
+        return reply
+
+    def begin_append_entries(self, request):
+        """Applies request to the log without blocking; returns (reply, durable).
+
+        The leader may only count this follower once the entries are on disk, so reply must
+        not be sent before durable (a Future, or None on rejection) has resolved.
+        """
+        if request.compressedEntries:
+            # Expanded outside the lock, into request.entries as if they had come uncompressed.
+            codec = self.entry_codec or EntryCodec()
+            request.MergeFromString(codec.decompress(request.compressedEntries))
+        with self.lock:
+            reply = self._append_entries(request)
+            return reply, self._sync_log() if reply.success else None
+
+    def _append_entries(self, request):
+        if request.term < self.current_term:
+            return pb.AppendEntriesReply(term=self.current_term, success=False)
+        if request.term > self.current_term or self.role != FOLLOWER:
+            self._become_follower(request.term)
+        self.leader_id = request.leaderId
+        self.last_leader_contact = time.monotonic()
+        self._reset_election_deadline()
+
+        prev_index = request.prevLogIndex
+        prev_term = request.prevLogTerm
+        entries = request.entries
+        last_new_index = prev_index + len(entries)
+        if prev_index < self.log.snapshot_index:
+            # Everything up to the snapshot is committed and therefore matches the leader.
+            entries = entries[self.log.snapshot_index - prev_index:]
+            prev_index = self.log.snapshot_index
+            prev_term = self.log.snapshot_term()
+        if self.log.term_at(prev_index) != prev_term:
+            if prev_index > self.log.last_index():
+                conflict_index, conflict_term = self.log.last_index() + 1, 0
+            else:
+                conflict_term = self.log.term_at(prev_index)
+                conflict_index = self.log.first_index_of_term(conflict_term, prev_index)
+            return pb.AppendEntriesReply(term=self.current_term, success=False,
+                                         conflictIndex=conflict_index, conflictTerm=conflict_term)
+
+        # Only truncate on a real conflict: a delayed or duplicated request must never
+        # remove entries that a later request already appended.
+        for offset, entry in enumerate(entries):
+            index = prev_index + 1 + offset
+            if index <= self.log.last_index():
+                if self.log.term_at(index) == entry.term:
+                    continue
+                self._truncate_from(index)
+            self.log.append(entries[offset:])
+            self._note_membership(index, entries[offset:])
+            break
+
+        commit = min(request.leaderCommit, last_new_index)
+        if commit > self.commit_index:
+            self.commit_index = commit
+            self.apply_cond.notify_all()
+        return pb.AppendEntriesReply(term=self.current_term, success=True)
+
+    def handle_install_snapshot(self, chunks):
+        data = bytearray()
+        for chunk in chunks:
+            if not self.receive_snapshot_chunk(chunk, data):
+                break
+        return self.install_snapshot_reply()
+
+    def receive_snapshot_chunk(self, chunk, data):
+        """Adds chunk to the snapshot being assembled in data, installing it on the last chunk.
+
+        Returns False once the rest of the stream should be ignored.
+        """
+        with self.lock:
+            if chunk.term < self.current_term:
+                return False
+            if chunk.term > self.current_term or self.role != FOLLOWER:
+                self._become_follower(chunk.term)
+            self.leader_id = chunk.leaderId
+            self.last_leader_contact = time.monotonic()
+            self._reset_election_deadline()
+        if chunk.offset != len(data):
+            return False  # out of sequence; the leader retries from scratch
+        data += chunk.data
+        if chunk.done:
+            # Parsed and written before taking the lock, which is then held only to swap it in.
+            index, term, snapshot = chunk.lastIncludedIndex, chunk.lastIncludedTerm, bytes(data)
+            restored = KVStateMachine(self.config.max_sessions, self.config.session_ttl)
+            restored.restore(snapshot)
+            prepared = self.storage.prepare_snapshot(index, term, snapshot)
+            with self.lock:
+                self._install_snapshot(index, term, prepared, restored)
+            return False
+        return True
+
+    def install_snapshot_reply(self):
+        with self.lock:
+            return pb.InstallSnapshotReply(term=self.current_term)
+
+    def _install_snapshot(self, index, term, prepared, restored):
+        if index <= self.last_applied:
+            self.storage.discard_snapshot(prepared)
+            return
+        keeps_suffix = self.log.term_at(index) == term
+        for pending_index in list(self.pending):
+            if pending_index <= index or not keeps_suffix:
+                _, future = self.pending.pop(pending_index)
+                future.set_exception(NotLeaderError(self.leader_id))
+        if not keeps_suffix:
+            self.log_generation += 1
+        self.log.install_snapshot(index, term, prepared)
+        self.durable_index = max(min(self.durable_index, self.log.last_index()), index)
+        self.state_machine.adopt(restored)
+        self.last_applied = index
+        self.commit_index = max(self.commit_index, index)
+        self._reload_membership()
+        self.apply_cond.notify_all()
+
+    def handle_request_vote(self, request):
+        with self.lock:
+            # A follower that heard from a leader within the minimum election timeout ignores
+            # candidates entirely; leader leases depend on this. A leader refuses pre-votes
+            # for the same reason. Neither applies to an election the leader asked for.
+            if not request.leaderTransfer and (
+                    (self.role == FOLLOWER and self.leader_id != -1
+                     and time.monotonic() - self.last_leader_contact < self.config.election_timeout_min)
+                    or (request.preVote and self.role == LEADER)):
+                return pb.RequestVoteReply(term=self.current_term, voteGranted=False)
+            if request.preVote:
+                # Says whether a real vote would be granted, without changing any state.
+                granted = (request.term > self.current_term
+                           and self._log_up_to_date(request.lastLogTerm, request.lastLogIndex))
+                return pb.RequestVoteReply(term=self.current_term, voteGranted=granted)
+            if request.term > self.current_term:
+                self._become_follower(request.term)
+            granted = (
+                request.term == self.current_term
+                and self.voted_for in (-1, request.candidateId)
+                and self._log_up_to_date(request.lastLogTerm, request.lastLogIndex)
+            )
+            if granted:
+                self.voted_for = request.candidateId
+                self._persist_hard_state()
+                self._reset_election_deadline()
+            return pb.RequestVoteReply(term=self.current_term, voteGranted=granted)
+
+    def _log_up_to_date(self, last_term, last_index):
+        my_term = self.log.last_term()
+        if last_term != my_term:
+            return last_term > my_term
+        return last_index >= self.log.last_index()
+
+    # ---- elections -----------------------------------------------------------------------
+
+    def _reset_election_deadline(self):
+        timeout = random.uniform(self.config.election_timeout_min, self.config.election_timeout_max)
+        self.election_deadline = time.monotonic() + timeout
+
+    def _run_ticker(self):
+        while self.running:
+            time.sleep(0.01)
+            with self.lock:
+                now = time.monotonic()
+                if self.role == LEADER:
+                    if self.transfer_target is not None and now >= self.transfer_deadline:
+                        self._end_transfer(LeadershipTransferError(
+                            f"Server {self.transfer_target} did not take over within "
+                            f"{self.config.transfer_timeout:g}s"))
+                    if self.config.check_quorum:
+                        self._check_quorum(now)
+                elif self.id in self.voters and now >= self.election_deadline:
+                    if self.config.pre_vote:
+                        self._start_pre_vote(now)
+                    else:
+                        self._start_election()
+
+    def _check_quorum(self, now):
+        """Steps down if a quorum of voters has not acknowledged this leader for an election timeout.
+
+        A leader cut off from the majority would otherwise keep accepting requests it can
+        never commit while the majority elects a new leader.
+        """
+        last_contact = max(self._quorum_value(now, self.ack_time), self.leader_since)
+        if now - last_contact > self.config.election_timeout_max:
+            print(f"[{self.name}] lost contact with a quorum; stepping down in term "
+                  f"{self.current_term}", flush=True)
+            self.quorum_step_downs += 1
+            self._become_follower(self.current_term)
+            self._reset_election_deadline()
+
+    def _start_pre_vote(self, now):
+        """Asks the voters whether they would elect this server, before it bumps its term.
+
+        A server that cannot win, e.g. one that was partitioned away or has just restarted,
+        then leaves the term alone instead of forcing a healthy leader to step down.
+        """
+        self.pre_votes = {self.id}
+        self.pre_vote_started = now
+        self.pre_votes_started += 1
+        self._reset_election_deadline()
+        if len(self.pre_votes) >= self.quorum():
+            self._start_election()
+            return
+
+        request = pb.RequestVoteArgs(
+            term=self.current_term + 1,
+            candidateId=self.id,
+            lastLogIndex=self.log.last_index(),
+            lastLogTerm=self.log.last_term(),
+            preVote=True,
+            groupId=self.group_id,
+        )
+        for peer in self.voting_peers:
+            call = self.pool.server_stub(peer).RequestVote.future(request, timeout=self.config.rpc_timeout)
+            call.add_done_callback(functools.partial(self._on_pre_vote_reply, peer, self.current_term, now))
+
+    def _on_pre_vote_reply(self, peer, term, started_at, call):
+        try:
+            reply = call.result()
+        except grpc.RpcError:
+            return
+        with self.lock:
+            if reply.term > self.current_term:
+                self._become_follower(reply.term)
+                return
+            # Only count grants for the latest pre-vote, and only while no leader has appeared.
+            if (not reply.voteGranted or self.role == LEADER or self.current_term != term
+                    or self.pre_vote_started != started_at or self.last_leader_contact >= started_at):
+                return
+            self.pre_votes.add(peer)
+            if len(self.pre_votes) >= self.quorum():
+                self._start_election()
+
+    def _start_election(self, leader_transfer=False):
+        self.elections += 1
+        self.current_term += 1
+        self.role = CANDIDATE
+        self.voted_for = self.id
+        self._persist_hard_state()
+        self.leader_id = -1
+        self.votes = {self.id}
+        self._reset_election_deadline()
+
+        if len(self.votes) >= self.quorum():
+            self._become_leader()
+            return
+
+        request = pb.RequestVoteArgs(
+            term=self.current_term,
+            candidateId=self.id,
+            lastLogIndex=self.log.last_index(),
+            lastLogTerm=self.log.last_term(),
+            leaderTransfer=leader_transfer,
+            groupId=self.group_id,
+        )
+        for peer in self.voting_peers:
+            call = self.pool.server_stub(peer).RequestVote.future(request, timeout=self.config.rpc_timeout)
+            call.add_done_callback(functools.partial(self._on_vote_reply, peer, request.term))
+
+    def _on_vote_reply(self, peer, term, call):
+        try:
+            reply = call.result()
+        except grpc.RpcError:
+            return
+        with self.lock:
+            if reply.term > self.current_term:
+                self._become_follower(reply.term)
+                return
+            if self.role != CANDIDATE or self.current_term != term or not reply.voteGranted:
+                return
+            self.votes.add(peer)
+            if len(self.votes) >= self.quorum():
+                self._become_leader()
+
+    def _become_follower(self, term):
+        if term > self.current_term:
+            self.current_term = term
+            self.voted_for = -1
+            self._persist_hard_state()
+        if self.role == LEADER:
+            self.leader_id = -1
+            self.lease_expiry = 0.0
+            self._end_transfer()
+            for _, _, future in self.pending_reads:
+                future.set_exception(NotLeaderError())
+            self.pending_reads = []
+        self.role = FOLLOWER
+        self._wake_replicators()
+        self.replicators = {}
+
+    def _become_leader(self):
+        self.role = LEADER
+        self.leader_id = self.id
+        self.leader_since = time.monotonic()
+        last_index = self.log.last_index()
+        for peer in self.peers:
+            self.next_index[peer] = last_index + 1
+            self.match_index[peer] = 0
+            self.ack_round[peer] = 0
+            self.ack_time[peer] = 0.0
+        # A no-op from the new term lets the leader commit entries left over from earlier terms.
+        self.log.append([pb.LogEntry(term=self.current_term, type=pb.NOOP)])
+        self.term_start_index = self.log.last_index()
+        self._sync_log()
+        self.replicators = {peer: Replicator(self, peer, self.current_term) for peer in self.peers}
+        for replicator in self.replicators.values():
+            replicator.start()
+        self._advance_commit_index()
+        print(f"[{self.name}] became leader for term {self.current_term}", flush=True)
+
+    # ---- replication ---------------------------------------------------------------------
+
+    def _wake_replicators(self):
+        for replicator in self.replicators.values():
+            replicator.cond.notify()
+
+    def _advance_commit_index(self):
+        candidate = self._quorum_value(self.durable_index, self.match_index)
+        # Only entries from the current term are committed by counting replicas (Raft §5.4.2).
+        if candidate > self.commit_index and self.log.term_at(candidate) == self.current_term:
+            self.commit_index = candidate
+            self.apply_cond.notify_all()
+
+    def _quorum_value(self, own, peer_values):
+        """Highest value reached by a quorum of voters; own counts only while this server votes."""
+        values = [peer_values[p] for p in self.voting_peers]
+        if self.id in self.voters:
+            values.append(own)
+        values.sort(reverse=True)
+        return values[self.quorum() - 1]
+
+    def _record_ack(self, peer, read_round, sent_at):
+        self.ack_round[peer] = max(self.ack_round[peer], read_round)
+        self.ack_time[peer] = max(self.ack_time[peer], sent_at)
+        # The lease runs from the send time of the quorum-th most recent acknowledgement,
+        # shortened to absorb clock drift between the leader and its followers.
+        if self.transfer_target is None:
+            lease_start = self._quorum_value(time.monotonic(), self.ack_time)
+            self.lease_expiry = max(self.lease_expiry,
+                                    lease_start + self.config.election_timeout_min * LEASE_DRIFT_FACTOR)
+        self._check_pending_reads()
+
+    def _check_pending_reads(self):
+        if not self.pending_reads:
+            return
+        confirmed_round = self._quorum_value(self.read_round, self.ack_round)
+        waiting = []
+        for read_index, read_round, future in self.pending_reads:
+            if read_round <= confirmed_round and read_index <= self.last_applied:
+                future.set_result(read_index)
+            else:
+                waiting.append((read_index, read_round, future))
+        self.pending_reads = waiting
+
+    def _persist_hard_state(self):
+        self.storage.save_hard_state(self.current_term, self.voted_for)
+
+    def _sync_log(self):
+        """Requests an fsync of everything appended so far; returns its Future."""
+        index = self.log.last_index()
+        future = self.log.sync()
+        future.add_done_callback(functools.partial(self._on_durable, index, self.log_generation))
+        return future
+
+    def _on_durable(self, index, generation, future):
+        with self.lock:
+            # A truncation since the sync was issued may have replaced entries up to index.
+            if generation != self.log_generation or index <= self.durable_index:
+                return
+            self.durable_index = index
+            if self.role == LEADER:
+                self._advance_commit_index()
+
+    def _truncate_from(self, index):
+        self.log_generation += 1
+        self.durable_index = min(self.durable_index, index - 1)
+        for pending_index in [i for i in self.pending if i >= index]:
+            _, future = self.pending.pop(pending_index)
+            future.set_exception(NotLeaderError(self.leader_id))
+        self.log.truncate_from(index)
+        if self.membership_index >= index:
+            self._reload_membership()
+
+    # ---- applying ------------------------------------------------------------------------
+
+    def _run_applier(self):
+        while True:
+            with self.lock:
+                while self.running and self.last_applied >= self.commit_index:
+                    self.apply_cond.wait()
+                if not self.running:
+                    return
+                while self.last_applied < self.commit_index:
+                    index = self.last_applied + 1
+                    entry = self.log.entry_at(index)
+                    result = self.state_machine.apply(entry)
+                    self.last_applied = index
+                    self._resolve_pending(index, entry, result)
+                    if entry.type == pb.CONFIG and self.role == LEADER and self.id not in self.voters:
+                        # A leader removed from the cluster steps down once its removal commits.
+                        self._become_follower(self.current_term)
+                self._check_pending_reads()
+                snapshot = self._capture_snapshot()
+                self.apply_cond.notify_all()
+            if snapshot is not None:
+                self._save_snapshot(*snapshot)
+
+    def _capture_snapshot(self):
+        """(index, term, copy of the state machine) if the log is due for compaction, else None."""
+        if self.last_applied - self.log.snapshot_index < self.config.snapshot_threshold:
+            return None
+        return self.last_applied, self.log.term_at(self.last_applied), self.state_machine.copy()
+
+    def _save_snapshot(self, index, term, state):
+        # Serializing and writing a large state can outlast an election timeout, so the lock
+        # is only held to copy the state (above) and to swap the snapshot in.
+        prepared = self.storage.prepare_snapshot(index, term, state.snapshot())
+        with self.lock:
+            if self.log.snapshot_index >= index:
+                # A snapshot installed from the leader in the meantime already covers index.
+                self.storage.discard_snapshot(prepared)
+                return
+            self.log.compact_prepared(index, prepared)
+            referenced = {blob_id for blob_id, _ in self.state_machine.blobs.values()}
+        self.blobs.sweep(referenced)
+
+    def _resolve_pending(self, index, entry, result):
+        proposal = self.pending.pop(index, None)
+        if proposal is None:
+            return
+        term, future = proposal
+        if term == entry.term:
+            future.set_result(result)
+        else:
+            future.set_exception(NotLeaderError(self.leader_id))
+
+class Replicator:
+    """Pipelines AppendEntries to one follower for the duration of a single leader term.
+
+    Up to max_inflight_appends requests are outstanding at once; next_index is advanced
+    optimistically as each batch is sent and rewound when the follower rejects one. With
+    replication_stream they all travel over one ReplicationStream, else as separate RPCs.
+    """
+
+    def __init__(self, node, peer, term):
+        self.node = node
+        self.peer = peer
+        self.term = term
+        self.cond = threading.Condition(node.lock)
+        self.inflight = 0
+        self.last_send = 0.0
+        self.backoff_until = 0.0
+        self.sent_round = 0
+        self.stream = None
+
+    def start(self):
+        threading.Thread(target=self._run, daemon=True).start()
+
+    def _active(self):
+        node = self.node
+        return (node.running and node.role == LEADER and node.current_term == self.term
+                and node.replicators.get(self.peer) is self)
+
+    def _run(self):
+        node = self.node
+        config = node.config
+        while True:
+            with node.lock:
+                while True:
+                    if not self._active():
+                        if self.stream is not None:
+                            self.stream.close()
+                        return
+                    now = time.monotonic()
+                    if self.stream is not None and self.stream.stalled(now - config.rpc_timeout):
+                        # Fails every unanswered request, which rewinds next_index.
+                        self.stream.cancel()
+                    next_index = node.next_index[self.peer]
+                    has_entries = next_index <= node.log.last_index()
+                    heartbeat_due = (now - self.last_send >= config.heartbeat_interval
+                                     or self.sent_round < node.read_round)
+                    # Entries the follower needs were compacted away: ship the snapshot instead,
+                    # once the pipeline has drained.
+                    needs_snapshot = next_index <= node.log.snapshot_index
+                    if needs_snapshot:
+                        ready = self.inflight == 0
+                    else:
+                        ready = self.inflight < config.max_inflight_appends and (has_entries or heartbeat_due)
+                    if now >= self.backoff_until and ready:
+                        break
+                    wake_at = max(self.backoff_until, self.last_send + config.heartbeat_interval)
+                    self.cond.wait(max(wake_at - now, 0.001))
+
+                self.last_send = now
+                if needs_snapshot:
+                    snapshot = node.storage.open_snapshot()
+                    if snapshot is None:
+                        self.backoff_until = now + config.heartbeat_interval
+                else:
+                    request = pb.AppendEntriesArgs(
+                        term=self.term,
+                        leaderId=node.id,
+                        prevLogIndex=next_index - 1,
+                        prevLogTerm=node.log.term_at(next_index - 1),
+                        leaderCommit=node.commit_index,
+                        groupId=node.group_id,
+                    )
+                    end = next_index + config.max_entries_per_append
+                    if node.entry_codec is None:
+                        run = None
+                        sent = node.log.add_entries_to(request, next_index, end)
+                    else:
+                        run, sent = node.log.run_bytes(next_index, end)
+                    node.next_index[self.peer] = next_index + sent
+                    self.inflight += 1
+                    self.sent_round = node.read_round
+
+            if needs_snapshot:
+                if snapshot is not None:
+                    self._send_snapshot(*snapshot)
+                continue
+            if run:
+                compressed = node.entry_codec.compress(run)
+                if compressed is None:
+                    request.MergeFromString(run)
+                else:
+                    request.compressedEntries = compressed
+                    request.compressedCount = sent
+
+            if config.replication_stream:
+                if self.stream is None or self.stream.broken:
+                    self.stream = ReplicationStream(node.pool.server_stub(self.peer), self._on_reply)
+                self.stream.send(request, self.sent_round, now)
+            else:
+                call = node.pool.server_stub(self.peer).AppendEntries.future(request, timeout=config.rpc_timeout)
+                call.add_done_callback(functools.partial(self._on_call_done, request, self.sent_round, now))
+
+    def _send_snapshot(self, index, term, snapshot_file):
+        node = self.node
+        try:
+            reply = node.pool.server_stub(self.peer).InstallSnapshot(
+                self._snapshot_chunks(index, term, snapshot_file),
+                timeout=node.config.install_snapshot_timeout,
+            )
+        except grpc.RpcError:
+            with node.lock:
+                self.backoff_until = time.monotonic() + node.config.heartbeat_interval
+            return
+        with node.lock:
+            if not self._active():
+                return
+            if reply.term > node.current_term:
+                node._become_follower(reply.term)
+                return
+            node.match_index[self.peer] = max(node.match_index[self.peer], index)
+            node.next_index[self.peer] = max(node.next_index[self.peer], index + 1)
+            node._advance_commit_index()
+
+    def _snapshot_chunks(self, index, term, snapshot_file):
+        chunk_bytes = self.node.config.snapshot_chunk_bytes
+        with snapshot_file:
+            offset = 0
+            data = snapshot_file.read(chunk_bytes)
+            while True:
+                following = snapshot_file.read(chunk_bytes)
+                yield pb.InstallSnapshotChunk(
+                    term=self.term,
+                    leaderId=self.node.id,
+                    lastIncludedIndex=index,
+                    lastIncludedTerm=term,
+                    offset=offset,
+                    data=data,
+                    done=not following,
+                    groupId=self.node.group_id,
+                )
+                if not following:
+                    return
+                offset += len(data)
+                data = following
+
+    def _on_call_done(self, request, read_round, sent_at, call):
+        try:
+            reply = call.result()
+        except grpc.RpcError:
+            reply = None
+        self._on_reply(request, read_round, sent_at, reply)
+
+    def _on_reply(self, request, read_round, sent_at, reply):
+        """Handles the follower's reply to request; reply is None if it never arrived."""
+        node = self.node
+        with node.lock:
+            self.inflight -= 1
+            self.cond.notify()
+            if not self._active():
+                return
+            if reply is None:
+                node.next_index[self.peer] = node.match_index[self.peer] + 1
+                self.backoff_until = time.monotonic() + node.config.heartbeat_interval
+                return
+
+            if reply.term > node.current_term:
+                node._become_follower(reply.term)
+                return
+            node._record_ack(self.peer, read_round, sent_at)
+            if reply.success:
+                match = request.prevLogIndex + (request.compressedCount or len(request.entries))
+                if match > node.match_index[self.peer]:
+                    node.match_index[self.peer] = match
+                    node._advance_commit_index()
+                node.next_index[self.peer] = max(node.next_index[self.peer], match + 1)
+                if self.peer == node.transfer_target:
+                    node._maybe_send_timeout_now()
+            else:
+                # The follower lacks prevLogIndex or disagrees on its term: back up past it,
+                # skipping the rest of the conflicting term in one step when hinted.
+                retry_index = request.prevLogIndex
+                if reply.conflictIndex:
+                    retry_index = min(retry_index, reply.conflictIndex)
+                    if not reply.conflictTerm and reply.conflictIndex <= node.match_index[self.peer]:
+                        # The follower's log ends before entries it had acknowledged: it was
+                        # restarted without persistent state and must be sent them again.
+                        node.match_index[self.peer] = reply.conflictIndex - 1
+                    if reply.conflictTerm:
+                        last = node.log.last_index_of_term(reply.conflictTerm, request.prevLogIndex)
+                        if last is not None:
+                            retry_index = min(request.prevLogIndex, last + 1)
+                node.next_index[self.peer] = max(
+                    node.match_index[self.peer] + 1,
+                    min(node.next_index[self.peer], retry_index),
+                )
+
+class ReplicationStream:
+    """One ReplicateStream call to a follower, carrying AppendEntries and their replies.
+
+    The follower answers requests in order, so a reader thread pairs each reply with the
+    oldest unanswered request and passes both to on_reply. Once the stream breaks, every
+    unanswered request, and any sent afterwards, is passed on with reply None.
+    """
+
+    def __init__(self, stub, on_reply):
+        self.on_reply = on_reply
+        self.lock = threading.Lock()
+        self.unanswered = collections.deque()  # (request, read_round, sent_at)
+        self.broken = False
+        self.requests = queue.SimpleQueue()
+        self.call = stub.ReplicateStream(iter(self.requests.get, None))
+        threading.Thread(target=self._read_replies, daemon=True).start()
+
+    def send(self, request, read_round, sent_at):
+        with self.lock:
+            if not self.broken:
+                self.unanswered.append((request, read_round, sent_at))
+                self.requests.put(request)
+                return
+        self.on_reply(request, read_round, sent_at, None)
+
+    def stalled(self, deadline):
+        """True if a request sent before deadline is still unanswered."""
+        with self.lock:
+            return bool(self.unanswered) and self.unanswered[0][2] < deadline
+
+    def close(self):
+        """Ends the request side; the follower then finishes the call."""
+        self.requests.put(None)
+
+    def cancel(self):
+        self.call.cancel()
+        self.close()
+
+    def _read_replies(self):
+        try:
+            for reply in self.call:
+                with self.lock:
+                    request, read_round, sent_at = self.unanswered.popleft()
+                self.on_reply(request, read_round, sent_at, reply)
+        except grpc.RpcError:
+            pass
+        with self.lock:
+            self.broken = True
+            failed = list(self.unanswered)
+            self.unanswered.clear()
+        # Releases gRPC's thread consuming the requests, which would otherwise wait forever.
+        self.close()
+        for request, read_round, sent_at in failed:
+            self.on_reply(request, read_round, sent_at, None)
@@ -24,39 +24,93 @@ _sym_db = _symbol_database.Default()
 
 
 
-DESCRIPTOR = _descriptor_pool.Default().AddSerializedFile(b'\n\nraft.proto\x12\x04raft\"\x07\n\x05\x45mpty\"\x19\n\nIntegerArg\x12\x0b\n\x03\x61rg\x18\x01 \x01(\x05\"1\n\x0fGenericResponse\x12\x0f\n\x07success\x18\x01 \x01(\x08\x12\r\n\x05\x65rror\x18\x02 \x01(\t\"K\n\x08KeyValue\x12\x0b\n\x03key\x18\x01 \x01(\t\x12\r\n\x05value\x18\x02 \x01(\t\x12\x10\n\x08\x63lientId\x18\x03 \x01(\x05\x12\x11\n\trequestId\x18\x04 \x01(\x05\":\n\x06GetKey\x12\x0b\n\x03key\x18\x01 \x01(\t\x12\x10\n\x08\x63lientId\x18\x02 \x01(\x05\x12\x11\n\trequestId\x18\x03 \x01(\x05\":\n\x05Reply\x12\x13\n\x0bwrongLeader\x18\x01 \x01(\x08\x12\r\n\x05\x65rror\x18\x02 \x01(\t\x12\r\n\x05value\x18\x03 \x01(\t\"Q\n\x05State\x12\x0c\n\x04term\x18\x01 \x01(\x05\x12\x10\n\x08isLeader\x18\x02 \x01(\x08\x12\x13\n\x0b\x63ommitIndex\x18\x03 \x01(\x05\x12\x13\n\x0blastApplied\x18\x04 \x01(\x05\"\x95\x01\n\x11\x41ppendEntriesArgs\x12\x0c\n\x04term\x18\x01 \x01(\x05\x12\x10\n\x08leaderId\x18\x02 \x01(\x05\x12\x14\n\x0cprevLogIndex\x18\x03 \x01(\x05\x12\x13\n\x0bprevLogTerm\x18\x04 \x01(\x05\x12\x1f\n\x07\x65ntries\x18\x05 \x03(\x0b\x32\x0e.raft.LogEntry\x12\x14\n\x0cleaderCommit\x18\x06 \x01(\x05\"3\n\x12\x41ppendEntriesReply\x12\x0c\n\x04term\x18\x01 \x01(\x05\x12\x0f\n\x07success\x18\x02 \x01(\x08\"_\n\x0fRequestVoteArgs\x12\x0c\n\x04term\x18\x01 \x01(\x05\x12\x13\n\x0b\x63\x61ndidateId\x18\x02 \x01(\x05\x12\x14\n\x0clastLogIndex\x18\x03 \x01(\x05\x12\x13\n\x0blastLogTerm\x18\x04 \x01(\x05\"5\n\x10RequestVoteReply\x12\x0c\n\x04term\x18\x01 \x01(\x05\x12\x13\n\x0bvoteGranted\x18\x02 \x01(\x08\"Y\n\x08LogEntry\x12\x0c\n\x04term\x18\x01 \x01(\x05\x12\x0b\n\x03key\x18\x02 \x01(\t\x12\r\n\x05value\x18\x03 \x01(\t\x12\x10\n\x08\x63lientId\x18\x04 \x01(\x05\x12\x11\n\trequestId\x18\x05 \x01(\x05\x32\xaa\x01\n\x08\x46rontEnd\x12*\n\tStartRaft\x12\x10.raft.IntegerArg\x1a\x0b.raft.Reply\x12,\n\x0bStartServer\x12\x10.raft.IntegerArg\x1a\x0b.raft.Reply\x12 \n\x03Get\x12\x0c.raft.GetKey\x1a\x0b.raft.Reply\x12\"\n\x03Put\x12\x0e.raft.KeyValue\x1a\x0b.raft.Reply2\xa9\x02\n\rKeyValueStore\x12*\n\x04ping\x12\x0b.raft.Empty\x1a\x15.raft.GenericResponse\x12$\n\x08GetState\x12\x0b.raft.Empty\x1a\x0b.raft.State\x12 \n\x03Get\x12\x0c.raft.GetKey\x1a\x0b.raft.Reply\x12\"\n\x03Put\x12\x0e.raft.KeyValue\x1a\x0b.raft.Reply\x12\x42\n\rAppendEntries\x12\x17.raft.AppendEntriesArgs\x1a\x18.raft.AppendEntriesReply\x12<\n\x0bRequestVote\x12\x15.raft.RequestVoteArgs\x1a\x16.raft.RequestVoteReplyb\x06proto3')
+DESCRIPTOR = _descriptor_pool.Default().AddSerializedFile(b'\n\nraft.proto\x12\x04raft\"\x07\n\x05\x45mpty\"*\n\nIntegerArg\x12\x0b\n\x03\x61rg\x18\x01 \x01(\x05\x12\x0f\n\x07groupId\x18\x02 \x01(\x05\"1\n\x0fGenericResponse\x12\x0f\n\x07success\x18\x01 \x01(\x08\x12\r\n\x05\x65rror\x18\x02 \x01(\t\"\\\n\x08KeyValue\x12\x0b\n\x03key\x18\x01 \x01(\t\x12\r\n\x05value\x18\x02 \x01(\t\x12\x10\n\x08\x63lientId\x18\x03 \x01(\x05\x12\x11\n\trequestId\x18\x04 \x01(\x05\x12\x0f\n\x07groupId\x18\x05 \x01(\x05\"K\n\x06GetKey\x12\x0b\n\x03key\x18\x01 \x01(\t\x12\x10\n\x08\x63lientId\x18\x02 \x01(\x05\x12\x11\n\trequestId\x18\x03 \x01(\x05\x12\x0f\n\x07groupId\x18\x04 \x01(\x05\"b\n\x05Reply\x12\x13\n\x0bwrongLeader\x18\x01 \x01(\x08\x12\r\n\x05\x65rror\x18\x02 \x01(\t\x12\r\n\x05value\x18\x03 \x01(\t\x12\x17\n\nleaderHint\x18\x04 \x01(\x05H\x00\x88\x01\x01\x42\r\n\x0b_leaderHint\"?\n\rKeyValueBatch\x12\x1d\n\x05items\x18\x01 \x03(\x0b\x32\x0e.raft.KeyValue\x12\x0f\n\x07groupId\x18\x02 \x01(\x05\"b\n\x0e\x42inaryKeyValue\x12\x0b\n\x03key\x18\x01 \x01(\x0c\x12\r\n\x05value\x18\x02 \x01(\x0c\x12\x10\n\x08\x63lientId\x18\x03 \x01(\x05\x12\x11\n\trequestId\x18\x04 \x01(\x05\x12\x0f\n\x07groupId\x18\x05 \x01(\x05\"Q\n\x0c\x42inaryGetKey\x12\x0b\n\x03key\x18\x01 \x01(\x0c\x12\x10\n\x08\x63lientId\x18\x02 \x01(\x05\x12\x11\n\trequestId\x18\x03 \x01(\x05\x12\x0f\n\x07groupId\x18\x04 \x01(\x05\"h\n\x0b\x42inaryReply\x12\x13\n\x0bwrongLeader\x18\x01 \x01(\x08\x12\r\n\x05\x65rror\x18\x02 \x01(\t\x12\r\n\x05value\x18\x03 \x01(\x0c\x12\x17\n\nleaderHint\x18\x04 \x01(\x05H\x00\x88\x01\x01\x42\r\n\x0b_leaderHint\"K\n\x13\x42inaryKeyValueBatch\x12#\n\x05items\x18\x01 \x03(\x0b\x32\x14.raft.BinaryKeyValue\x12\x0f\n\x07groupId\x18\x02 \x01(\x05\"v\n\nBatchReply\x12\x13\n\x0bwrongLeader\x18\x01 \x01(\x08\x12\r\n\x05\x65rror\x18\x02 \x01(\t\x12\x1c\n\x07replies\x18\x03 \x03(\x0b\x32\x0b.raft.Reply\x12\x17\n\nleaderHint\x18\x04 \x01(\x05H\x00\x88\x01\x01\x42\r\n\x0b_leaderHint\"-\n\x0cMultiGetArgs\x12\x0c\n\x04keys\x18\x01 \x03(\t\x12\x0f\n\x07groupId\x18\x02 \x01(\x05\"\x85\x01\n\x0cMultiPutArgs\x12\x1d\n\x05items\x18\x01 \x03(\x0b\x32\x0e.raft.KeyValue\x12 \n\x08\x65xpected\x18\x02 \x03(\x0b\x32\x0e.raft.KeyValue\x12\x0f\n\x07groupId\x18\x03 \x01(\x05\x12\x10\n\x08\x63lientId\x18\x04 \x01(\x05\x12\x11\n\trequestId\x18\x05 \x01(\x05\"y\n\nMultiReply\x12\x13\n\x0bwrongLeader\x18\x01 \x01(\x08\x12\r\n\x05\x65rror\x18\x02 \x01(\t\x12\x0e\n\x06values\x18\x03 \x03(\t\x12\x17\n\nleaderHint\x18\x04 \x01(\x05H\x00\x88\x01\x01\x12\x0f\n\x07swapped\x18\x05 \x01(\x08\x42\r\n\x0b_leaderHint\"d\n\x05State\x12\x0c\n\x04term\x18\x01 \x01(\x05\x12\x10\n\x08isLeader\x18\x02 \x01(\x08\x12\x13\n\x0b\x63ommitIndex\x18\x03 \x01(\x05\x12\x13\n\x0blastApplied\x18\x04 \x01(\x05\x12\x11\n\tledGroups\x18\x05 \x03(\x05\"\xda\x01\n\x11\x41ppendEntriesArgs\x12\x0c\n\x04term\x18\x01 \x01(\x05\x12\x10\n\x08leaderId\x18\x02 \x01(\x05\x12\x14\n\x0cprevLogIndex\x18\x03 \x01(\x05\x12\x13\n\x0bprevLogTerm\x18\x04 \x01(\x05\x12\x1f\n\x07\x65ntries\x18\x05 \x03(\x0b\x32\x0e.raft.LogEntry\x12\x14\n\x0cleaderCommit\x18\x06 \x01(\x05\x12\x0f\n\x07groupId\x18\x07 \x01(\x05\x12\x19\n\x11\x63ompressedEntries\x18\x08 \x01(\x0c\x12\x17\n\x0f\x63ompressedCount\x18\t \x01(\x05\"`\n\x12\x41ppendEntriesReply\x12\x0c\n\x04term\x18\x01 \x01(\x05\x12\x0f\n\x07success\x18\x02 \x01(\x08\x12\x15\n\rconflictIndex\x18\x03 \x01(\x05\x12\x14\n\x0c\x63onflictTerm\x18\x04 \x01(\x05\"\x99\x01\n\x0fRequestVoteArgs\x12\x0c\n\x04term\x18\x01 \x01(\x05\x12\x13\n\x0b\x63\x61ndidateId\x18\x02 \x01(\x05\x12\x14\n\x0clastLogIndex\x18\x03 \x01(\x05\x12\x13\n\x0blastLogTerm\x18\x04 \x01(\x05\x12\x0f\n\x07preVote\x18\x05 \x01(\x08\x12\x16\n\x0eleaderTransfer\x18\x06 \x01(\x08\x12\x0f\n\x07groupId\x18\x07 \x01(\x05\"5\n\x10RequestVoteReply\x12\x0c\n\x04term\x18\x01 \x01(\x05\x12\x13\n\x0bvoteGranted\x18\x02 \x01(\x08\"A\n\x0eTimeoutNowArgs\x12\x0c\n\x04term\x18\x01 \x01(\x05\x12\x10\n\x08leaderId\x18\x02 \x01(\x05\x12\x0f\n\x07groupId\x18\x03 \x01(\x05\"\x1f\n\x0fTimeoutNowReply\x12\x0c\n\x04term\x18\x01 \x01(\x05\".\n\nMembership\x12\x0e\n\x06voters\x18\x01 \x03(\x05\x12\x10\n\x08learners\x18\x02 \x03(\x05\"\xa8\x01\n\x14InstallSnapshotChunk\x12\x0c\n\x04term\x18\x01 \x01(\x05\x12\x10\n\x08leaderId\x18\x02 \x01(\x05\x12\x19\n\x11lastIncludedIndex\x18\x03 \x01(\x05\x12\x18\n\x10lastIncludedTerm\x18\x04 \x01(\x05\x12\x0e\n\x06offset\x18\x05 \x01(\x03\x12\x0c\n\x04\x64\x61ta\x18\x06 \x01(\x0c\x12\x0c\n\x04\x64one\x18\x07 \x01(\x08\x12\x0f\n\x07groupId\x18\x08 \x01(\x05\"$\n\x14InstallSnapshotReply\x12\x0c\n\x04term\x18\x01 \x01(\x05\"\xae\x01\n\x0cSnapshotData\x12\"\n\x04\x64\x61ta\x18\x01 \x03(\x0b\x32\x14.raft.BinaryKeyValue\x12$\n\nmembership\x18\x02 \x01(\x0b\x32\x10.raft.Membership\x12%\n\x08sessions\x18\x03 \x03(\x0b\x32\x13.raft.ClientSession\x12\x0f\n\x07\x63lockMs\x18\x04 \x01(\x03\x12\x1c\n\x05\x62lobs\x18\x05 \x03(\x0b\x32\r.raft.BlobRef\"4\n\x07\x42lobRef\x12\x0b\n\x03key\x18\x01 \x01(\x0c\x12\x0e\n\x06\x62lobId\x18\x02 \x01(\t\x12\x0c\n\x04size\x18\x03 \x01(\x03\"\xb7\x01\n\nValueChunk\x12\x0b\n\x03key\x18\x01 \x01(\x0c\x12\x0c\n\x04\x64\x61ta\x18\x02 \x01(\x0c\x12\x10\n\x08\x63lientId\x18\x03 \x01(\x05\x12\x11\n\trequestId\x18\x04 \x01(\x05\x12\x0f\n\x07groupId\x18\x05 \x01(\x05\x12\x0c\n\x04size\x18\x06 \x01(\x03\x12\x13\n\x0bwrongLeader\x18\x07 \x01(\x08\x12\r\n\x05\x65rror\x18\x08 \x01(\t\x12\x17\n\nleaderHint\x18\t \x01(\x05H\x00\x88\x01\x01\x42\r\n\x0b_leaderHint\":\n\tBlobChunk\x12\x0e\n\x06\x62lobId\x18\x01 \x01(\t\x12\x0c\n\x04\x64\x61ta\x18\x02 \x01(\x0c\x12\x0f\n\x07groupId\x18\x03 \x01(\x05\")\n\x06\x42lobId\x12\x0e\n\x06\x62lobId\x18\x01 \x01(\t\x12\x0f\n\x07groupId\x18\x02 \x01(\x05\"{\n\rClientSession\x12\x10\n\x08\x63lientId\x18\x01 \x01(\x05\x12\x12\n\nlastSeenMs\x18\x02 \x01(\x03\x12\r\n\x05\x66loor\x18\x03 \x01(\x05\x12$\n\x07results\x18\x04 \x03(\x0b\x32\x13.raft.SessionResult\x12\x0f\n\x07\x65victed\x18\x05 \x03(\x05\"R\n\rSessionResult\x12\x11\n\trequestId\x18\x01 \x01(\x05\x12$\n\x05reply\x18\x02 \x01(\x0b\x32\x10.raft.MultiReplyH\x00\x88\x01\x01\x42\x08\n\x06_reply\"c\n\x07Metrics\x12)\n\x06values\x18\x01 \x03(\x0b\x32\x19.raft.Metrics.ValuesEntry\x1a-\n\x0bValuesEntry\x12\x0b\n\x03key\x18\x01 \x01(\t\x12\r\n\x05value\x18\x02 \x01(\x01:\x02\x38\x01\"w\n\x0cServerStatus\x12\x10\n\x08serverId\x18\x01 \x01(\x05\x12\x0b\n\x03pid\x18\x02 \x01(\x05\x12\r\n\x05state\x18\x03 \x01(\t\x12\x15\n\ruptimeSeconds\x18\x04 \x01(\x01\x12\x10\n\x08restarts\x18\x05 \x01(\x05\x12\x10\n\x08lastExit\x18\x06 \x01(\t\"7\n\x10ServerStatusList\x12#\n\x07servers\x18\x01 \x03(\x0b\x32\x12.raft.ServerStatus\"\x97\x02\n\x08LogEntry\x12\x0c\n\x04term\x18\x01 \x01(\x05\x12\x0b\n\x03key\x18\x02 \x01(\x0c\x12\r\n\x05value\x18\x03 \x01(\x0c\x12\x10\n\x08\x63lientId\x18\x04 \x01(\x05\x12\x11\n\trequestId\x18\x05 \x01(\x05\x12\x1d\n\x04type\x18\x06 \x01(\x0e\x32\x0f.raft.EntryType\x12$\n\nmembership\x18\x07 \x01(\x0b\x32\x10.raft.Membership\x12\x1e\n\x06writes\x18\x08 \x03(\x0b\x32\x0e.raft.KeyValue\x12 \n\x08\x65xpected\x18\t \x03(\x0b\x32\x0e.raft.KeyValue\x12\x13\n\x0btimestampMs\x18\n \x01(\x03\x12\x0e\n\x06\x62lobId\x18\x0b \x01(\t\x12\x10\n\x08\x62lobSize\x18\x0c \x01(\x03*G\n\tEntryType\x12\x07\n\x03PUT\x10\x00\x12\x08\n\x04NOOP\x10\x01\x12\n\n\x06\x43ONFIG\x10\x02\x12\r\n\tMULTI_PUT\x10\x03\x12\x0c\n\x08PUT_BLOB\x10\x04\x32\xdc\x05\n\x08\x46rontEnd\x12*\n\tStartRaft\x12\x10.raft.IntegerArg\x1a\x0b.raft.Reply\x12,\n\x0bStartServer\x12\x10.raft.IntegerArg\x1a\x0b.raft.Reply\x12 \n\x03Get\x12\x0c.raft.GetKey\x1a\x0b.raft.Reply\x12\"\n\x03Put\x12\x0e.raft.KeyValue\x1a\x0b.raft.Reply\x12\x31\n\x08GetBytes\x12\x12.raft.BinaryGetKey\x1a\x11.raft.BinaryReply\x12\x33\n\x08PutBytes\x12\x14.raft.BinaryKeyValue\x1a\x11.raft.BinaryReply\x12\x32\n\tPutStream\x12\x10.raft.ValueChunk\x1a\x11.raft.BinaryReply(\x01\x12\x33\n\tGetStream\x12\x12.raft.BinaryGetKey\x1a\x10.raft.ValueChunk0\x01\x12\x30\n\x08MultiGet\x12\x12.raft.MultiGetArgs\x1a\x10.raft.MultiReply\x12\x30\n\x08MultiPut\x12\x12.raft.MultiPutArgs\x1a\x10.raft.MultiReply\x12\x35\n\rCompareAndSet\x12\x12.raft.MultiPutArgs\x1a\x10.raft.MultiReply\x12(\n\nGetMetrics\x12\x0b.raft.Empty\x1a\r.raft.Metrics\x12-\n\x0cRemoveServer\x12\x10.raft.IntegerArg\x1a\x0b.raft.Reply\x12\x36\n\x0fGetServerStatus\x12\x0b.raft.Empty\x1a\x16.raft.ServerStatusList\x12\x33\n\x12TransferLeadership\x12\x10.raft.IntegerArg\x1a\x0b.raft.Reply2\xf7\t\n\rKeyValueStore\x12*\n\x04ping\x12\x0b.raft.Empty\x1a\x15.raft.GenericResponse\x12$\n\x08GetState\x12\x0b.raft.Empty\x1a\x0b.raft.State\x12(\n\nGetMetrics\x12\x0b.raft.Empty\x1a\r.raft.Metrics\x12 \n\x03Get\x12\x0c.raft.GetKey\x1a\x0b.raft.Reply\x12\"\n\x03Put\x12\x0e.raft.KeyValue\x1a\x0b.raft.Reply\x12\x31\n\x08PutBatch\x12\x13.raft.KeyValueBatch\x1a\x10.raft.BatchReply\x12\x31\n\x08GetBytes\x12\x12.raft.BinaryGetKey\x1a\x11.raft.BinaryReply\x12\x33\n\x08PutBytes\x12\x14.raft.BinaryKeyValue\x1a\x11.raft.BinaryReply\x12<\n\rPutBytesBatch\x12\x19.raft.BinaryKeyValueBatch\x1a\x10.raft.BatchReply\x12\x32\n\tPutStream\x12\x10.raft.ValueChunk\x1a\x11.raft.BinaryReply(\x01\x12\x33\n\tGetStream\x12\x12.raft.BinaryGetKey\x1a\x10.raft.ValueChunk0\x01\x12\x30\n\x08MultiGet\x12\x12.raft.MultiGetArgs\x1a\x10.raft.MultiReply\x12\x30\n\x08MultiPut\x12\x12.raft.MultiPutArgs\x1a\x10.raft.MultiReply\x12\x35\n\rCompareAndSet\x12\x12.raft.MultiPutArgs\x1a\x10.raft.MultiReply\x12*\n\tAddServer\x12\x10.raft.IntegerArg\x1a\x0b.raft.Reply\x12-\n\x0cRemoveServer\x12\x10.raft.IntegerArg\x1a\x0b.raft.Reply\x12\x33\n\x12TransferLeadership\x12\x10.raft.IntegerArg\x1a\x0b.raft.Reply\x12\x42\n\rAppendEntries\x12\x17.raft.AppendEntriesArgs\x1a\x18.raft.AppendEntriesReply\x12H\n\x0fReplicateStream\x12\x17.raft.AppendEntriesArgs\x1a\x18.raft.AppendEntriesReply(\x01\x30\x01\x12<\n\x0bRequestVote\x12\x15.raft.RequestVoteArgs\x1a\x16.raft.RequestVoteReply\x12K\n\x0fInstallSnapshot\x12\x1a.raft.InstallSnapshotChunk\x1a\x1a.raft.InstallSnapshotReply(\x01\x12\x39\n\nTimeoutNow\x12\x14.raft.TimeoutNowArgs\x1a\x15.raft.TimeoutNowReply\x12\x35\n\tStoreBlob\x12\x0f.raft.BlobChunk\x1a\x15.raft.GenericResponse(\x01\x12,\n\tFetchBlob\x12\x0c.raft.BlobId\x1a\x0f.raft.BlobChunk0\x01\x62\x06proto3')
 
 _globals = globals()
 _builder.BuildMessageAndEnumDescriptors(DESCRIPTOR, _globals)
 _builder.BuildTopDescriptorsAndMessages(DESCRIPTOR, 'raft_pb2', _globals)
 if not _descriptor._USE_C_DESCRIPTORS:
   DESCRIPTOR._loaded_options = None
+  _globals['_METRICS_VALUESENTRY']._loaded_options = None
+  _globals['_METRICS_VALUESENTRY']._serialized_options = b'8\001'
+  _globals['_ENTRYTYPE']._serialized_start=3531
+  _globals['_ENTRYTYPE']._serialized_end=3602
   _globals['_EMPTY']._serialized_start=20
   _globals['_EMPTY']._serialized_end=27
   _globals['_INTEGERARG']._serialized_start=29
-  _globals['_INTEGERARG']._serialized_end=54
-  _globals['_GENERICRESPONSE']._serialized_start=56
-  _globals['_GENERICRESPONSE']._serialized_end=105
-  _globals['_KEYVALUE']._serialized_start=107
-  _globals['_KEYVALUE']._serialized_end=182
-  _globals['_GETKEY']._serialized_start=184
-  _globals['_GETKEY']._serialized_end=242
-  _globals['_REPLY']._serialized_start=244
-  _globals['_REPLY']._serialized_end=302
-  _globals['_STATE']._serialized_start=304
-  _globals['_STATE']._serialized_end=385
-  _globals['_APPENDENTRIESARGS']._serialized_start=388
-  _globals['_APPENDENTRIESARGS']._serialized_end=537
-  _globals['_APPENDENTRIESREPLY']._serialized_start=539
-  _globals['_APPENDENTRIESREPLY']._serialized_end=590
-  _globals['_REQUESTVOTEARGS']._serialized_start=592
-  _globals['_REQUESTVOTEARGS']._serialized_end=687
-  _globals['_REQUESTVOTEREPLY']._serialized_start=689
-  _globals['_REQUESTVOTEREPLY']._serialized_end=742
-  _globals['_LOGENTRY']._serialized_start=744
-  _globals['_LOGENTRY']._serialized_end=833
-  _globals['_FRONTEND']._serialized_start=836
-  _globals['_FRONTEND']._serialized_end=1006
-  _globals['_KEYVALUESTORE']._serialized_start=1009
-  _globals['_KEYVALUESTORE']._serialized_end=1306
+  _globals['_INTEGERARG']._serialized_end=71
+  _globals['_GENERICRESPONSE']._serialized_start=73
+  _globals['_GENERICRESPONSE']._serialized_end=122
+  _globals['_KEYVALUE']._serialized_start=124
+  _globals['_KEYVALUE']._serialized_end=216
+  _globals['_GETKEY']._serialized_start=218
+  _globals['_GETKEY']._serialized_end=293
+  _globals['_REPLY']._serialized_start=295
+  _globals['_REPLY']._serialized_end=393
+  _globals['_KEYVALUEBATCH']._serialized_start=395
+  _globals['_KEYVALUEBATCH']._serialized_end=458
+  _globals['_BINARYKEYVALUE']._serialized_start=460
+  _globals['_BINARYKEYVALUE']._serialized_end=558
+  _globals['_BINARYGETKEY']._serialized_start=560
+  _globals['_BINARYGETKEY']._serialized_end=641
+  _globals['_BINARYREPLY']._serialized_start=643
+  _globals['_BINARYREPLY']._serialized_end=747
+  _globals['_BINARYKEYVALUEBATCH']._serialized_start=749
+  _globals['_BINARYKEYVALUEBATCH']._serialized_end=824
+  _globals['_BATCHREPLY']._serialized_start=826
+  _globals['_BATCHREPLY']._serialized_end=944
+  _globals['_MULTIGETARGS']._serialized_start=946
+  _globals['_MULTIGETARGS']._serialized_end=991
+  _globals['_MULTIPUTARGS']._serialized_start=994
+  _globals['_MULTIPUTARGS']._serialized_end=1127
+  _globals['_MULTIREPLY']._serialized_start=1129
+  _globals['_MULTIREPLY']._serialized_end=1250
+  _globals['_STATE']._serialized_start=1252
+  _globals['_STATE']._serialized_end=1352
+  _globals['_APPENDENTRIESARGS']._serialized_start=1355
+  _globals['_APPENDENTRIESARGS']._serialized_end=1573
+  _globals['_APPENDENTRIESREPLY']._serialized_start=1575
+  _globals['_APPENDENTRIESREPLY']._serialized_end=1671
+  _globals['_REQUESTVOTEARGS']._serialized_start=1674
+  _globals['_REQUESTVOTEARGS']._serialized_end=1827
+  _globals['_REQUESTVOTEREPLY']._serialized_start=1829
+  _globals['_REQUESTVOTEREPLY']._serialized_end=1882
+  _globals['_TIMEOUTNOWARGS']._serialized_start=1884
+  _globals['_TIMEOUTNOWARGS']._serialized_end=1949
+  _globals['_TIMEOUTNOWREPLY']._serialized_start=1951
+  _globals['_TIMEOUTNOWREPLY']._serialized_end=1982
+  _globals['_MEMBERSHIP']._serialized_start=1984
+  _globals['_MEMBERSHIP']._serialized_end=2030
+  _globals['_INSTALLSNAPSHOTCHUNK']._serialized_start=2033
+  _globals['_INSTALLSNAPSHOTCHUNK']._serialized_end=2201
+  _globals['_INSTALLSNAPSHOTREPLY']._serialized_start=2203
+  _globals['_INSTALLSNAPSHOTREPLY']._serialized_end=2239
+  _globals['_SNAPSHOTDATA']._serialized_start=2242
+  _globals['_SNAPSHOTDATA']._serialized_end=2416
+  _globals['_BLOBREF']._serialized_start=2418
+  _globals['_BLOBREF']._serialized_end=2470
+  _globals['_VALUECHUNK']._serialized_start=2473
+  _globals['_VALUECHUNK']._serialized_end=2656
+  _globals['_BLOBCHUNK']._serialized_start=2658
+  _globals['_BLOBCHUNK']._serialized_end=2716
+  _globals['_BLOBID']._serialized_start=2718
+  _globals['_BLOBID']._serialized_end=2759
+  _globals['_CLIENTSESSION']._serialized_start=2761
+  _globals['_CLIENTSESSION']._serialized_end=2884
+  _globals['_SESSIONRESULT']._serialized_start=2886
+  _globals['_SESSIONRESULT']._serialized_end=2968
+  _globals['_METRICS']._serialized_start=2970
+  _globals['_METRICS']._serialized_end=3069
+  _globals['_METRICS_VALUESENTRY']._serialized_start=3024
+  _globals['_METRICS_VALUESENTRY']._serialized_end=3069
+  _globals['_SERVERSTATUS']._serialized_start=3071
+  _globals['_SERVERSTATUS']._serialized_end=3190
+  _globals['_SERVERSTATUSLIST']._serialized_start=3192
+  _globals['_SERVERSTATUSLIST']._serialized_end=3247
+  _globals['_LOGENTRY']._serialized_start=3250
+  _globals['_LOGENTRY']._serialized_end=3529
+  _globals['_FRONTEND']._serialized_start=3605
+  _globals['_FRONTEND']._serialized_end=4337
+  _globals['_KEYVALUESTORE']._serialized_start=4340
+  _globals['_KEYVALUESTORE']._serialized_end=5611
 # @@protoc_insertion_point(module_scope)
@@ -55,6 +55,61 @@ class FrontEndStub(object):
                 request_serializer=raft__pb2.KeyValue.SerializeToString,
                 response_deserializer=raft__pb2.Reply.FromString,
                 _registered_method=True)
+        self.GetBytes = channel.unary_unary(
+                '/raft.FrontEnd/GetBytes',
+                request_serializer=raft__pb2.BinaryGetKey.SerializeToString,
+                response_deserializer=raft__pb2.BinaryReply.FromString,
+                _registered_method=True)
+        self.PutBytes = channel.unary_unary(
+                '/raft.FrontEnd/PutBytes',
+                request_serializer=raft__pb2.BinaryKeyValue.SerializeToString,
+                response_deserializer=raft__pb2.BinaryReply.FromString,
+                _registered_method=True)
+        self.PutStream = channel.stream_unary(
+                '/raft.FrontEnd/PutStream',
+                request_serializer=raft__pb2.ValueChunk.SerializeToString,
+                response_deserializer=raft__pb2.BinaryReply.FromString,
+                _registered_method=True)
+        self.GetStream = channel.unary_stream(
+                '/raft.FrontEnd/GetStream',
+                request_serializer=raft__pb2.BinaryGetKey.SerializeToString,
+                response_deserializer=raft__pb2.ValueChunk.FromString,
+                _registered_method=True)
+        self.MultiGet = channel.unary_unary(
+                '/raft.FrontEnd/MultiGet',
+                request_serializer=raft__pb2.MultiGetArgs.SerializeToString,
+                response_deserializer=raft__pb2.MultiReply.FromString,
+                _registered_method=True)
+        self.MultiPut = channel.unary_unary(
+                '/raft.FrontEnd/MultiPut',
+                request_serializer=raft__pb2.MultiPutArgs.SerializeToString,
+                response_deserializer=raft__pb2.MultiReply.FromString,
+                _registered_method=True)
+        self.CompareAndSet = channel.unary_unary(
+                '/raft.FrontEnd/CompareAndSet',
+                request_serializer=raft__pb2.MultiPutArgs.SerializeToString,
+                response_deserializer=raft__pb2.MultiReply.FromString,
+                _registered_method=True)
+        self.GetMetrics = channel.unary_unary(
+                '/raft.FrontEnd/GetMetrics',
+                request_serializer=raft__pb2.Empty.SerializeToString,
+                response_deserializer=raft__pb2.Metrics.FromString,
+                _registered_method=True)
+        self.RemoveServer = channel.unary_unary(
+                '/raft.FrontEnd/RemoveServer',
+                request_serializer=raft__pb2.IntegerArg.SerializeToString,
+                response_deserializer=raft__pb2.Reply.FromString,
+                _registered_method=True)
+        self.GetServerStatus = channel.unary_unary(
+                '/raft.FrontEnd/GetServerStatus',
+                request_serializer=raft__pb2.Empty.SerializeToString,
+                response_deserializer=raft__pb2.ServerStatusList.FromString,
+                _registered_method=True)
+        self.TransferLeadership = channel.unary_unary(
+                '/raft.FrontEnd/TransferLeadership',
+                request_serializer=raft__pb2.IntegerArg.SerializeToString,
+                response_deserializer=raft__pb2.Reply.FromString,
+                _registered_method=True)
 
 
 class FrontEndServicer(object):
@@ -85,6 +140,76 @@ class FrontEndServicer(object):
         context.set_details('Method not implemented!')
         raise NotImplementedError('Method not implemented!')
 
+    def GetBytes(self, request, context):
+        """Missing associated documentation comment in .proto file."""
+        context.set_code(grpc.StatusCode.UNIMPLEMENTED)
+        context.set_details('Method not implemented!')
+        raise NotImplementedError('Method not implemented!')
+
+    def PutBytes(self, request, context):
+        """Missing associated documentation comment in .proto file."""
+        context.set_code(grpc.StatusCode.UNIMPLEMENTED)
+        context.set_details('Method not implemented!')
+        raise NotImplementedError('Method not implemented!')
+
+    def PutStream(self, request_iterator, context):
+        """Values of any size, in chunks; large ones are kept out of the Raft log
+        """
+        context.set_code(grpc.StatusCode.UNIMPLEMENTED)
+        context.set_details('Method not implemented!')
+        raise NotImplementedError('Method not implemented!')
+
+    def GetStream(self, request, context):
+        """Missing associated documentation comment in .proto file."""
+        context.set_code(grpc.StatusCode.UNIMPLEMENTED)
+        context.set_details('Method not implemented!')
+        raise NotImplementedError('Method not implemented!')
+
+    def MultiGet(self, request, context):
+        """Missing associated documentation comment in .proto file."""
+        context.set_code(grpc.StatusCode.UNIMPLEMENTED)
+        context.set_details('Method not implemented!')
+        raise NotImplementedError('Method not implemented!')
+
+    def MultiPut(self, request, context):
+        """atomic within each Raft group
+        """
+        context.set_code(grpc.StatusCode.UNIMPLEMENTED)
+        context.set_details('Method not implemented!')
+        raise NotImplementedError('Method not implemented!')
+
+    def CompareAndSet(self, request, context):
+        """all keys must share a Raft group
+        """
+        context.set_code(grpc.StatusCode.UNIMPLEMENTED)
+        context.set_details('Method not implemented!')
+        raise NotImplementedError('Method not implemented!')
+
+    def GetMetrics(self, request, context):
+        """Missing associated documentation comment in .proto file."""
+        context.set_code(grpc.StatusCode.UNIMPLEMENTED)
+        context.set_details('Method not implemented!')
+        raise NotImplementedError('Method not implemented!')
+
+    def RemoveServer(self, request, context):
+        """Missing associated documentation comment in .proto file."""
+        context.set_code(grpc.StatusCode.UNIMPLEMENTED)
+        context.set_details('Method not implemented!')
+        raise NotImplementedError('Method not implemented!')
+
+    def GetServerStatus(self, request, context):
+        """Missing associated documentation comment in .proto file."""
+        context.set_code(grpc.StatusCode.UNIMPLEMENTED)
+        context.set_details('Method not implemented!')
+        raise NotImplementedError('Method not implemented!')
+
+    def TransferLeadership(self, request, context):
+        """-1: to the most up-to-date voter
+        """
+        context.set_code(grpc.StatusCode.UNIMPLEMENTED)
+        context.set_details('Method not implemented!')
+        raise NotImplementedError('Method not implemented!')
+
 
 def add_FrontEndServicer_to_server(servicer, server):
     rpc_method_handlers = {
@@ -108,6 +233,61 @@ def add_FrontEndServicer_to_server(servicer, server):
                     request_deserializer=raft__pb2.KeyValue.FromString,
                     response_serializer=raft__pb2.Reply.SerializeToString,
             ),
+            'GetBytes': grpc.unary_unary_rpc_method_handler(
+                    servicer.GetBytes,
+                    request_deserializer=raft__pb2.BinaryGetKey.FromString,
+                    response_serializer=raft__pb2.BinaryReply.SerializeToString,
+            ),
+            'PutBytes': grpc.unary_unary_rpc_method_handler(
+                    servicer.PutBytes,
+                    request_deserializer=raft__pb2.BinaryKeyValue.FromString,
+                    response_serializer=raft__pb2.BinaryReply.SerializeToString,
+            ),
+            'PutStream': grpc.stream_unary_rpc_method_handler(
+                    servicer.PutStream,
+                    request_deserializer=raft__pb2.ValueChunk.FromString,
+                    response_serializer=raft__pb2.BinaryReply.SerializeToString,
+            ),
+            'GetStream': grpc.unary_stream_rpc_method_handler(
+                    servicer.GetStream,
+                    request_deserializer=raft__pb2.BinaryGetKey.FromString,
+                    response_serializer=raft__pb2.ValueChunk.SerializeToString,
+            ),
+            'MultiGet': grpc.unary_unary_rpc_method_handler(
+                    servicer.MultiGet,
+                    request_deserializer=raft__pb2.MultiGetArgs.FromString,
+                    response_serializer=raft__pb2.MultiReply.SerializeToString,
+            ),
+            'MultiPut': grpc.unary_unary_rpc_method_handler(
+                    servicer.MultiPut,
+                    request_deserializer=raft__pb2.MultiPutArgs.FromString,
+                    response_serializer=raft__pb2.MultiReply.SerializeToString,
+            ),
+            'CompareAndSet': grpc.unary_unary_rpc_method_handler(
+                    servicer.CompareAndSet,
+                    request_deserializer=raft__pb2.MultiPutArgs.FromString,
+                    response_serializer=raft__pb2.MultiReply.SerializeToString,
+            ),
+            'GetMetrics': grpc.unary_unary_rpc_method_handler(
+                    servicer.GetMetrics,
+                    request_deserializer=raft__pb2.Empty.FromString,
+                    response_serializer=raft__pb2.Metrics.SerializeToString,
+            ),
+            'RemoveServer': grpc.unary_unary_rpc_method_handler(
+                    servicer.RemoveServer,
+                    request_deserializer=raft__pb2.IntegerArg.FromString,
+                    response_serializer=raft__pb2.Reply.SerializeToString,
+            ),
+            'GetServerStatus': grpc.unary_unary_rpc_method_handler(
+                    servicer.GetServerStatus,
+                    request_deserializer=raft__pb2.Empty.FromString,
+                    response_serializer=raft__pb2.ServerStatusList.SerializeToString,
+            ),
+            'TransferLeadership': grpc.unary_unary_rpc_method_handler(
+                    servicer.TransferLeadership,
+                    request_deserializer=raft__pb2.IntegerArg.FromString,
+                    response_serializer=raft__pb2.Reply.SerializeToString,
+            ),
     }
     generic_handler = grpc.method_handlers_generic_handler(
             'raft.FrontEnd', rpc_method_handlers)
@@ -228,139 +408,8 @@ class FrontEnd(object):
             metadata,
             _registered_method=True)
 
-
-class KeyValueStoreStub(object):
-    """Server service (Assignment 1 stubs, full implementation in later assignments)
-    """
-
-    def __init__(self, channel):
-        """Constructor.
-
-        Args:
-            channel: A grpc.Channel.
-        """
-        self.ping = channel.unary_unary(
-                '/raft.KeyValueStore/ping',
-                request_serializer=raft__pb2.Empty.SerializeToString,
-                response_deserializer=raft__pb2.GenericResponse.FromString,
-                _registered_method=True)
-        self.GetState = channel.unary_unary(
-                '/raft.KeyValueStore/GetState',
-                request_serializer=raft__pb2.Empty.SerializeToString,
-                response_deserializer=raft__pb2.State.FromString,
-                _registered_method=True)
-        self.Get = channel.unary_unary(
-                '/raft.KeyValueStore/Get',
-                request_serializer=raft__pb2.GetKey.SerializeToString,
-                response_deserializer=raft__pb2.Reply.FromString,
-                _registered_method=True)
-        self.Put = channel.unary_unary(
-                '/raft.KeyValueStore/Put',
-                request_serializer=raft__pb2.KeyValue.SerializeToString,
-                response_deserializer=raft__pb2.Reply.FromString,
-                _registered_method=True)
-        self.AppendEntries = channel.unary_unary(
-                '/raft.KeyValueStore/AppendEntries',
-                request_serializer=raft__pb2.AppendEntriesArgs.SerializeToString,
-                response_deserializer=raft__pb2.AppendEntriesReply.FromString,
-                _registered_method=True)
-        self.RequestVote = channel.unary_unary(
-                '/raft.KeyValueStore/RequestVote',
-                request_serializer=raft__pb2.RequestVoteArgs.SerializeToString,
-                response_deserializer=raft__pb2.RequestVoteReply.FromString,
-                _registered_method=True)
-
-
-class KeyValueStoreServicer(object):
-    """Server service (Assignment 1 stubs, full implementation in later assignments)
-    """
-
-    def ping(self, request, context):
-        """Basic operations
-        """
-        context.set_code(grpc.StatusCode.UNIMPLEMENTED)
-        context.set_details('Method not implemented!')
-        raise NotImplementedError('Method not implemented!')
-
-    def GetState(self, request, context):
-        """Missing associated documentation comment in .proto file."""
-        context.set_code(grpc.StatusCode.UNIMPLEMENTED)
-        context.set_details('Method not implemented!')
-        raise NotImplementedError('Method not implemented!')
-
-    def Get(self, request, context):
-        """Client operations (will be implemented in Assignment 2)
-        """
-        context.set_code(grpc.StatusCode.UNIMPLEMENTED)
-        context.set_details('Method not implemented!')
-        raise NotImplementedError('Method not implemented!')
-
-    def Put(self, request, context):
-        """Missing associated documentation comment in .proto file."""
-        context.set_code(grpc.StatusCode.UNIMPLEMENTED)
-        context.set_details('Method not implemented!')
-        raise NotImplementedError('Method not implemented!')
-
-    def AppendEntries(self, request, context):
-        """Raft RPCs (will be implemented in Assignment 3)
-        """
-        context.set_code(grpc.StatusCode.UNIMPLEMENTED)
-        context.set_details('Method not implemented!')
-        raise NotImplementedError('Method not implemented!')
-
-    def RequestVote(self, request, context):
-        """Missing associated documentation comment in .proto file."""
-        context.set_code(grpc.StatusCode.UNIMPLEMENTED)
-        context.set_details('Method not implemented!')
-        raise NotImplementedError('Method not implemented!')
-
-
-def add_KeyValueStoreServicer_to_server(servicer, server):
-    rpc_method_handlers = {
-            'ping': grpc.unary_unary_rpc_method_handler(
-                    servicer.ping,
-                    request_deserializer=raft__pb2.Empty.FromString,
-                    response_serializer=raft__pb2.GenericResponse.SerializeToString,
-            ),
-            'GetState': grpc.unary_unary_rpc_method_handler(
-                    servicer.GetState,
-                    request_deserializer=raft__pb2.Empty.FromString,
-                    response_serializer=raft__pb2.State.SerializeToString,
-            ),
-            'Get': grpc.unary_unary_rpc_method_handler(
-                    servicer.Get,
-                    request_deserializer=raft__pb2.GetKey.FromString,
-                    response_serializer=raft__pb2.Reply.SerializeToString,
-            ),
-            'Put': grpc.unary_unary_rpc_method_handler(
-                    servicer.Put,
-                    request_deserializer=raft__pb2.KeyValue.FromString,
-                    response_serializer=raft__pb2.Reply.SerializeToString,
-            ),
-            'AppendEntries': grpc.unary_unary_rpc_method_handler(
-                    servicer.AppendEntries,
-                    request_deserializer=raft__pb2.AppendEntriesArgs.FromString,
-                    response_serializer=raft__pb2.AppendEntriesReply.SerializeToString,
-            ),
-            'RequestVote': grpc.unary_unary_rpc_method_handler(
-                    servicer.RequestVote,
-                    request_deserializer=raft__pb2.RequestVoteArgs.FromString,
-                    response_serializer=raft__pb2.RequestVoteReply.SerializeToString,
-            ),
-    }
-    generic_handler = grpc.method_handlers_generic_handler(
-            'raft.KeyValueStore', rpc_method_handlers)
-    server.add_generic_rpc_handlers((generic_handler,))
-    server.add_registered_method_handlers('raft.KeyValueStore', rpc_method_handlers)
-
-
- # This class is part of an EXPERIMENTAL API.
-class KeyValueStore(object):
-    """Server service (Assignment 1 stubs, full implementation in later assignments)
-    """
-
     @staticmethod
-    def ping(request,
+    def GetBytes(request,
             target,
             options=(),
             channel_credentials=None,
@@ -373,9 +422,9 @@ class KeyValueStore(object):
         return grpc.experimental.unary_unary(
             request,
             target,
-            '/raft.KeyValueStore/ping',
-            raft__pb2.Empty.SerializeToString,
-            raft__pb2.GenericResponse.FromString,
+            '/raft.FrontEnd/GetBytes',
+            raft__pb2.BinaryGetKey.SerializeToString,
+            raft__pb2.BinaryReply.FromString,
             options,
             channel_credentials,
             insecure,
@@ -387,7 +436,7 @@ class KeyValueStore(object):
             _registered_method=True)
 
     @staticmethod
-    def GetState(request,
+    def PutBytes(request,
             target,
             options=(),
             channel_credentials=None,
@@ -400,9 +449,9 @@ class KeyValueStore(object):
         return grpc.experimental.unary_unary(
             request,
             target,
-            '/raft.KeyValueStore/GetState',
-            raft__pb2.Empty.SerializeToString,
-            raft__pb2.State.FromString,
+            '/raft.FrontEnd/PutBytes',
+            raft__pb2.BinaryKeyValue.SerializeToString,
+            raft__pb2.BinaryReply.FromString,
             options,
             channel_credentials,
             insecure,
@@ -414,7 +463,7 @@ class KeyValueStore(object):
             _registered_method=True)
 
     @staticmethod
-    def Get(request,
+    def PutStream(request_iterator,
             target,
             options=(),
             channel_credentials=None,
@@ -424,12 +473,12 @@ class KeyValueStore(object):
             wait_for_ready=None,
             timeout=None,
             metadata=None):
-        return grpc.experimental.unary_unary(
-            request,
+        return grpc.experimental.stream_unary(
+            request_iterator,
             target,
-            '/raft.KeyValueStore/Get',
-            raft__pb2.GetKey.SerializeToString,
-            raft__pb2.Reply.FromString,
+            '/raft.FrontEnd/PutStream',
+            raft__pb2.ValueChunk.SerializeToString,
+            raft__pb2.BinaryReply.FromString,
             options,
             channel_credentials,
             insecure,
@@ -441,7 +490,7 @@ class KeyValueStore(object):
             _registered_method=True)
 
     @staticmethod
-    def Put(request,
+    def GetStream(request,
             target,
             options=(),
             channel_credentials=None,
@@ -451,12 +500,12 @@ class KeyValueStore(object):
             wait_for_ready=None,
             timeout=None,
             metadata=None):
-        return grpc.experimental.unary_unary(
+        return grpc.experimental.unary_stream(
             request,
             target,
-            '/raft.KeyValueStore/Put',
-            raft__pb2.KeyValue.SerializeToString,
-            raft__pb2.Reply.FromString,
+            '/raft.FrontEnd/GetStream',
+            raft__pb2.BinaryGetKey.SerializeToString,
+            raft__pb2.ValueChunk.FromString,
             options,
             channel_credentials,
             insecure,
@@ -468,7 +517,7 @@ class KeyValueStore(object):
             _registered_method=True)
 
     @staticmethod
-    def AppendEntries(request,
+    def MultiGet(request,
             target,
             options=(),
             channel_credentials=None,
@@ -481,9 +530,9 @@ class KeyValueStore(object):
         return grpc.experimental.unary_unary(
             request,
             target,
-            '/raft.KeyValueStore/AppendEntries',
-            raft__pb2.AppendEntriesArgs.SerializeToString,
-            raft__pb2.AppendEntriesReply.FromString,
+            '/raft.FrontEnd/MultiGet',
+            raft__pb2.MultiGetArgs.SerializeToString,
+            raft__pb2.MultiReply.FromString,
             options,
             channel_credentials,
             insecure,
@@ -495,7 +544,7 @@ class KeyValueStore(object):
             _registered_method=True)
 
     @staticmethod
-    def RequestVote(request,
+    def MultiPut(request,
             target,
             options=(),
             channel_credentials=None,
@@ -508,9 +557,1217 @@ class KeyValueStore(object):
         return grpc.experimental.unary_unary(
             request,
             target,
-            '/raft.KeyValueStore/RequestVote',
-            raft__pb2.RequestVoteArgs.SerializeToString,
-            raft__pb2.RequestVoteReply.FromString,
+            '/raft.FrontEnd/MultiPut',
+            raft__pb2.MultiPutArgs.SerializeToString,
+            raft__pb2.MultiReply.FromString,
+            options,
+            channel_credentials,
+            insecure,
+            call_credentials,
+            compression,
+            wait_for_ready,
+            timeout,
+            metadata,
+            _registered_method=True)
+
+    @staticmethod
+    def CompareAndSet(request,
+            target,
+            options=(),
+            channel_credentials=None,
+            call_credentials=None,
+            insecure=False,
+            compression=None,
+            wait_for_ready=None,
+            timeout=None,
+            metadata=None):
+        return grpc.experimental.unary_unary(
+            request,
+            target,
+            '/raft.FrontEnd/CompareAndSet',
+            raft__pb2.MultiPutArgs.SerializeToString,
+            raft__pb2.MultiReply.FromString,
+            options,
+            channel_credentials,
+            insecure,
+            call_credentials,
+            compression,
+            wait_for_ready,
+            timeout,
+            metadata,
+            _registered_method=True)
+
+    @staticmethod
+    def GetMetrics(request,
+            target,
+            options=(),
+            channel_credentials=None,
+            call_credentials=None,
+            insecure=False,
+            compression=None,
+            wait_for_ready=None,
+            timeout=None,
+            metadata=None):
+        return grpc.experimental.unary_unary(
+            request,
+            target,
+            '/raft.FrontEnd/GetMetrics',
+            raft__pb2.Empty.SerializeToString,
+            raft__pb2.Metrics.FromString,
+            options,
+            channel_credentials,
+            insecure,
+            call_credentials,
+            compression,
+            wait_for_ready,
+            timeout,
+            metadata,
+            _registered_method=True)
+
+    @staticmethod
+    def RemoveServer(request,
+            target,
+            options=(),
+            channel_credentials=None,
+            call_credentials=None,
+            insecure=False,
+            compression=None,
+            wait_for_ready=None,
+            timeout=None,
+            metadata=None):
+        return grpc.experimental.unary_unary(
+            request,
+            target,
+            '/raft.FrontEnd/RemoveServer',
+            raft__pb2.IntegerArg.SerializeToString,
+            raft__pb2.Reply.FromString,
+            options,
+            channel_credentials,
+            insecure,
+            call_credentials,
+            compression,
+            wait_for_ready,
+            timeout,
+            metadata,
+            _registered_method=True)
+
+    @staticmethod
+    def GetServerStatus(request,
+            target,
+            options=(),
+            channel_credentials=None,
+            call_credentials=None,
+            insecure=False,
+            compression=None,
+            wait_for_ready=None,
+            timeout=None,
+            metadata=None):
+        return grpc.experimental.unary_unary(
+            request,
+            target,
+            '/raft.FrontEnd/GetServerStatus',
+            raft__pb2.Empty.SerializeToString,
+            raft__pb2.ServerStatusList.FromString,
+            options,
+            channel_credentials,
+            insecure,
+            call_credentials,
+            compression,
+            wait_for_ready,
+            timeout,
+            metadata,
+            _registered_method=True)
+
+    @staticmethod
+    def TransferLeadership(request,
+            target,
+            options=(),
+            channel_credentials=None,
+            call_credentials=None,
+            insecure=False,
+            compression=None,
+            wait_for_ready=None,
+            timeout=None,
+            metadata=None):
+        return grpc.experimental.unary_unary(
+            request,
+            target,
+            '/raft.FrontEnd/TransferLeadership',
+            raft__pb2.IntegerArg.SerializeToString,
+            raft__pb2.Reply.FromString,
+            options,
+            channel_credentials,
+            insecure,
+            call_credentials,
+            compression,
+            wait_for_ready,
+            timeout,
+            metadata,
+            _registered_method=True)
+
+
+class KeyValueStoreStub(object):
+    """Server service (Assignment 1 stubs, full implementation in later assignments)
+    """
+
+    def __init__(self, channel):
+        """Constructor.
+
+        Args:
+            channel: A grpc.Channel.
+        """
+        self.ping = channel.unary_unary(
+                '/raft.KeyValueStore/ping',
+                request_serializer=raft__pb2.Empty.SerializeToString,
+                response_deserializer=raft__pb2.GenericResponse.FromString,
+                _registered_method=True)
+        self.GetState = channel.unary_unary(
+                '/raft.KeyValueStore/GetState',
+                request_serializer=raft__pb2.Empty.SerializeToString,
+                response_deserializer=raft__pb2.State.FromString,
+                _registered_method=True)
+        self.GetMetrics = channel.unary_unary(
+                '/raft.KeyValueStore/GetMetrics',
+                request_serializer=raft__pb2.Empty.SerializeToString,
+                response_deserializer=raft__pb2.Metrics.FromString,
+                _registered_method=True)
+        self.Get = channel.unary_unary(
+                '/raft.KeyValueStore/Get',
+                request_serializer=raft__pb2.GetKey.SerializeToString,
+                response_deserializer=raft__pb2.Reply.FromString,
+                _registered_method=True)
+        self.Put = channel.unary_unary(
+                '/raft.KeyValueStore/Put',
+                request_serializer=raft__pb2.KeyValue.SerializeToString,
+                response_deserializer=raft__pb2.Reply.FromString,
+                _registered_method=True)
+        self.PutBatch = channel.unary_unary(
+                '/raft.KeyValueStore/PutBatch',
+                request_serializer=raft__pb2.KeyValueBatch.SerializeToString,
+                response_deserializer=raft__pb2.BatchReply.FromString,
+                _registered_method=True)
+        self.GetBytes = channel.unary_unary(
+                '/raft.KeyValueStore/GetBytes',
+                request_serializer=raft__pb2.BinaryGetKey.SerializeToString,
+                response_deserializer=raft__pb2.BinaryReply.FromString,
+                _registered_method=True)
+        self.PutBytes = channel.unary_unary(
+                '/raft.KeyValueStore/PutBytes',
+                request_serializer=raft__pb2.BinaryKeyValue.SerializeToString,
+                response_deserializer=raft__pb2.BinaryReply.FromString,
+                _registered_method=True)
+        self.PutBytesBatch = channel.unary_unary(
+                '/raft.KeyValueStore/PutBytesBatch',
+                request_serializer=raft__pb2.BinaryKeyValueBatch.SerializeToString,
+                response_deserializer=raft__pb2.BatchReply.FromString,
+                _registered_method=True)
+        self.PutStream = channel.stream_unary(
+                '/raft.KeyValueStore/PutStream',
+                request_serializer=raft__pb2.ValueChunk.SerializeToString,
+                response_deserializer=raft__pb2.BinaryReply.FromString,
+                _registered_method=True)
+        self.GetStream = channel.unary_stream(
+                '/raft.KeyValueStore/GetStream',
+                request_serializer=raft__pb2.BinaryGetKey.SerializeToString,
+                response_deserializer=raft__pb2.ValueChunk.FromString,
+                _registered_method=True)
+        self.MultiGet = channel.unary_unary(
+                '/raft.KeyValueStore/MultiGet',
+                request_serializer=raft__pb2.MultiGetArgs.SerializeToString,
+                response_deserializer=raft__pb2.MultiReply.FromString,
+                _registered_method=True)
+        self.MultiPut = channel.unary_unary(
+                '/raft.KeyValueStore/MultiPut',
+                request_serializer=raft__pb2.MultiPutArgs.SerializeToString,
+                response_deserializer=raft__pb2.MultiReply.FromString,
+                _registered_method=True)
+        self.CompareAndSet = channel.unary_unary(
+                '/raft.KeyValueStore/CompareAndSet',
+                request_serializer=raft__pb2.MultiPutArgs.SerializeToString,
+                response_deserializer=raft__pb2.MultiReply.FromString,
+                _registered_method=True)
+        self.AddServer = channel.unary_unary(
+                '/raft.KeyValueStore/AddServer',
+                request_serializer=raft__pb2.IntegerArg.SerializeToString,
+                response_deserializer=raft__pb2.Reply.FromString,
+                _registered_method=True)
+        self.RemoveServer = channel.unary_unary(
+                '/raft.KeyValueStore/RemoveServer',
+                request_serializer=raft__pb2.IntegerArg.SerializeToString,
+                response_deserializer=raft__pb2.Reply.FromString,
+                _registered_method=True)
+        self.TransferLeadership = channel.unary_unary(
+                '/raft.KeyValueStore/TransferLeadership',
+                request_serializer=raft__pb2.IntegerArg.SerializeToString,
+                response_deserializer=raft__pb2.Reply.FromString,
+                _registered_method=True)
+        self.AppendEntries = channel.unary_unary(
+                '/raft.KeyValueStore/AppendEntries',
+                request_serializer=raft__pb2.AppendEntriesArgs.SerializeToString,
+                response_deserializer=raft__pb2.AppendEntriesReply.FromString,
+                _registered_method=True)
+        self.ReplicateStream = channel.stream_stream(
+                '/raft.KeyValueStore/ReplicateStream',
+                request_serializer=raft__pb2.AppendEntriesArgs.SerializeToString,
+                response_deserializer=raft__pb2.AppendEntriesReply.FromString,
+                _registered_method=True)
+        self.RequestVote = channel.unary_unary(
+                '/raft.KeyValueStore/RequestVote',
+                request_serializer=raft__pb2.RequestVoteArgs.SerializeToString,
+                response_deserializer=raft__pb2.RequestVoteReply.FromString,
+                _registered_method=True)
+        self.InstallSnapshot = channel.stream_unary(
+                '/raft.KeyValueStore/InstallSnapshot',
+                request_serializer=raft__pb2.InstallSnapshotChunk.SerializeToString,
+                response_deserializer=raft__pb2.InstallSnapshotReply.FromString,
+                _registered_method=True)
+        self.TimeoutNow = channel.unary_unary(
+                '/raft.KeyValueStore/TimeoutNow',
+                request_serializer=raft__pb2.TimeoutNowArgs.SerializeToString,
+                response_deserializer=raft__pb2.TimeoutNowReply.FromString,
+                _registered_method=True)
+        self.StoreBlob = channel.stream_unary(
+                '/raft.KeyValueStore/StoreBlob',
+                request_serializer=raft__pb2.BlobChunk.SerializeToString,
+                response_deserializer=raft__pb2.GenericResponse.FromString,
+                _registered_method=True)
+        self.FetchBlob = channel.unary_stream(
+                '/raft.KeyValueStore/FetchBlob',
+                request_serializer=raft__pb2.BlobId.SerializeToString,
+                response_deserializer=raft__pb2.BlobChunk.FromString,
+                _registered_method=True)
+
+
+class KeyValueStoreServicer(object):
+    """Server service (Assignment 1 stubs, full implementation in later assignments)
+    """
+
+    def ping(self, request, context):
+        """Basic operations
+        """
+        context.set_code(grpc.StatusCode.UNIMPLEMENTED)
+        context.set_details('Method not implemented!')
+        raise NotImplementedError('Method not implemented!')
+
+    def GetState(self, request, context):
+        """Missing associated documentation comment in .proto file."""
+        context.set_code(grpc.StatusCode.UNIMPLEMENTED)
+        context.set_details('Method not implemented!')
+        raise NotImplementedError('Method not implemented!')
+
+    def GetMetrics(self, request, context):
+        """Missing associated documentation comment in .proto file."""
+        context.set_code(grpc.StatusCode.UNIMPLEMENTED)
+        context.set_details('Method not implemented!')
+        raise NotImplementedError('Method not implemented!')
+
+    def Get(self, request, context):
+        """Client operations (will be implemented in Assignment 2)
+        """
+        context.set_code(grpc.StatusCode.UNIMPLEMENTED)
+        context.set_details('Method not implemented!')
+        raise NotImplementedError('Method not implemented!')
+
+    def Put(self, request, context):
+        """Missing associated documentation comment in .proto file."""
+        context.set_code(grpc.StatusCode.UNIMPLEMENTED)
+        context.set_details('Method not implemented!')
+        raise NotImplementedError('Method not implemented!')
+
+    def PutBatch(self, request, context):
+        """Missing associated documentation comment in .proto file."""
+        context.set_code(grpc.StatusCode.UNIMPLEMENTED)
+        context.set_details('Method not implemented!')
+        raise NotImplementedError('Method not implemented!')
+
+    def GetBytes(self, request, context):
+        """Missing associated documentation comment in .proto file."""
+        context.set_code(grpc.StatusCode.UNIMPLEMENTED)
+        context.set_details('Method not implemented!')
+        raise NotImplementedError('Method not implemented!')
+
+    def PutBytes(self, request, context):
+        """Missing associated documentation comment in .proto file."""
+        context.set_code(grpc.StatusCode.UNIMPLEMENTED)
+        context.set_details('Method not implemented!')
+        raise NotImplementedError('Method not implemented!')
+
+    def PutBytesBatch(self, request, context):
+        """Missing associated documentation comment in .proto file."""
+        context.set_code(grpc.StatusCode.UNIMPLEMENTED)
+        context.set_details('Method not implemented!')
+        raise NotImplementedError('Method not implemented!')
+
+    def PutStream(self, request_iterator, context):
+        """Missing associated documentation comment in .proto file."""
+        context.set_code(grpc.StatusCode.UNIMPLEMENTED)
+        context.set_details('Method not implemented!')
+        raise NotImplementedError('Method not implemented!')
+
+    def GetStream(self, request, context):
+        """Missing associated documentation comment in .proto file."""
+        context.set_code(grpc.StatusCode.UNIMPLEMENTED)
+        context.set_details('Method not implemented!')
+        raise NotImplementedError('Method not implemented!')
+
+    def MultiGet(self, request, context):
+        """Missing associated documentation comment in .proto file."""
+        context.set_code(grpc.StatusCode.UNIMPLEMENTED)
+        context.set_details('Method not implemented!')
+        raise NotImplementedError('Method not implemented!')
+
+    def MultiPut(self, request, context):
+        """Missing associated documentation comment in .proto file."""
+        context.set_code(grpc.StatusCode.UNIMPLEMENTED)
+        context.set_details('Method not implemented!')
+        raise NotImplementedError('Method not implemented!')
+
+    def CompareAndSet(self, request, context):
+        """Missing associated documentation comment in .proto file."""
+        context.set_code(grpc.StatusCode.UNIMPLEMENTED)
+        context.set_details('Method not implemented!')
+        raise NotImplementedError('Method not implemented!')
+
+    def AddServer(self, request, context):
+        """Membership changes, served by the leader one server at a time
+        """
+        context.set_code(grpc.StatusCode.UNIMPLEMENTED)
+        context.set_details('Method not implemented!')
+        raise NotImplementedError('Method not implemented!')
+
+    def RemoveServer(self, request, context):
+        """Missing associated documentation comment in .proto file."""
+        context.set_code(grpc.StatusCode.UNIMPLEMENTED)
+        context.set_details('Method not implemented!')
+        raise NotImplementedError('Method not implemented!')
+
+    def TransferLeadership(self, request, context):
+        """Served by the leader: hands leadership to the given voter (-1: the most up-to-date)
+        """
+        context.set_code(grpc.StatusCode.UNIMPLEMENTED)
+        context.set_details('Method not implemented!')
+        raise NotImplementedError('Method not implemented!')
+
+    def AppendEntries(self, request, context):
+        """Raft RPCs (will be implemented in Assignment 3)
+        """
+        context.set_code(grpc.StatusCode.UNIMPLEMENTED)
+        context.set_details('Method not implemented!')
+        raise NotImplementedError('Method not implemented!')
+
+    def ReplicateStream(self, request_iterator, context):
+        """Long-lived replication stream from a leader to one follower: one reply per request,
+        in request order
+        """
+        context.set_code(grpc.StatusCode.UNIMPLEMENTED)
+        context.set_details('Method not implemented!')
+        raise NotImplementedError('Method not implemented!')
+
+    def RequestVote(self, request, context):
+        """Missing associated documentation comment in .proto file."""
+        context.set_code(grpc.StatusCode.UNIMPLEMENTED)
+        context.set_details('Method not implemented!')
+        raise NotImplementedError('Method not implemented!')
+
+    def InstallSnapshot(self, request_iterator, context):
+        """Missing associated documentation comment in .proto file."""
+        context.set_code(grpc.StatusCode.UNIMPLEMENTED)
+        context.set_details('Method not implemented!')
+        raise NotImplementedError('Method not implemented!')
+
+    def TimeoutNow(self, request, context):
+        """Missing associated documentation comment in .proto file."""
+        context.set_code(grpc.StatusCode.UNIMPLEMENTED)
+        context.set_details('Method not implemented!')
+        raise NotImplementedError('Method not implemented!')
+
+    def StoreBlob(self, request_iterator, context):
+        """Copies a blob to a follower ahead of the PUT_BLOB entry that refers to it
+        """
+        context.set_code(grpc.StatusCode.UNIMPLEMENTED)
+        context.set_details('Method not implemented!')
+        raise NotImplementedError('Method not implemented!')
+
+    def FetchBlob(self, request, context):
+        """Served by any server holding the blob, to one that lacks it
+        """
+        context.set_code(grpc.StatusCode.UNIMPLEMENTED)
+        context.set_details('Method not implemented!')
+        raise NotImplementedError('Method not implemented!')
+
+
+def add_KeyValueStoreServicer_to_server(servicer, server):
+    rpc_method_handlers = {
+            'ping': grpc.unary_unary_rpc_method_handler(
+                    servicer.ping,
+                    request_deserializer=raft__pb2.Empty.FromString,
+                    response_serializer=raft__pb2.GenericResponse.SerializeToString,
+            ),
+            'GetState': grpc.unary_unary_rpc_method_handler(
+                    servicer.GetState,
+                    request_deserializer=raft__pb2.Empty.FromString,
+                    response_serializer=raft__pb2.State.SerializeToString,
+            ),
+            'GetMetrics': grpc.unary_unary_rpc_method_handler(
+                    servicer.GetMetrics,
+                    request_deserializer=raft__pb2.Empty.FromString,
+                    response_serializer=raft__pb2.Metrics.SerializeToString,
+            ),
+            'Get': grpc.unary_unary_rpc_method_handler(
+                    servicer.Get,
+                    request_deserializer=raft__pb2.GetKey.FromString,
+                    response_serializer=raft__pb2.Reply.SerializeToString,
+            ),
+            'Put': grpc.unary_unary_rpc_method_handler(
+                    servicer.Put,
+                    request_deserializer=raft__pb2.KeyValue.FromString,
+                    response_serializer=raft__pb2.Reply.SerializeToString,
+            ),
+            'PutBatch': grpc.unary_unary_rpc_method_handler(
+                    servicer.PutBatch,
+                    request_deserializer=raft__pb2.KeyValueBatch.FromString,
+                    response_serializer=raft__pb2.BatchReply.SerializeToString,
+            ),
+            'GetBytes': grpc.unary_unary_rpc_method_handler(
+                    servicer.GetBytes,
+                    request_deserializer=raft__pb2.BinaryGetKey.FromString,
+                    response_serializer=raft__pb2.BinaryReply.SerializeToString,
+            ),
+            'PutBytes': grpc.unary_unary_rpc_method_handler(
+                    servicer.PutBytes,
+                    request_deserializer=raft__pb2.BinaryKeyValue.FromString,
+                    response_serializer=raft__pb2.BinaryReply.SerializeToString,
+            ),
+            'PutBytesBatch': grpc.unary_unary_rpc_method_handler(
+                    servicer.PutBytesBatch,
+                    request_deserializer=raft__pb2.BinaryKeyValueBatch.FromString,
+                    response_serializer=raft__pb2.BatchReply.SerializeToString,
+            ),
+            'PutStream': grpc.stream_unary_rpc_method_handler(
+                    servicer.PutStream,
+                    request_deserializer=raft__pb2.ValueChunk.FromString,
+                    response_serializer=raft__pb2.BinaryReply.SerializeToString,
+            ),
+            'GetStream': grpc.unary_stream_rpc_method_handler(
+                    servicer.GetStream,
+                    request_deserializer=raft__pb2.BinaryGetKey.FromString,
+                    response_serializer=raft__pb2.ValueChunk.SerializeToString,
+            ),
+            'MultiGet': grpc.unary_unary_rpc_method_handler(
+                    servicer.MultiGet,
+                    request_deserializer=raft__pb2.MultiGetArgs.FromString,
+                    response_serializer=raft__pb2.MultiReply.SerializeToString,
+            ),
+            'MultiPut': grpc.unary_unary_rpc_method_handler(
+                    servicer.MultiPut,
+                    request_deserializer=raft__pb2.MultiPutArgs.FromString,
+                    response_serializer=raft__pb2.MultiReply.SerializeToString,
+            ),
+            'CompareAndSet': grpc.unary_unary_rpc_method_handler(
+                    servicer.CompareAndSet,
+                    request_deserializer=raft__pb2.MultiPutArgs.FromString,
+                    response_serializer=raft__pb2.MultiReply.SerializeToString,
+            ),
+            'AddServer': grpc.unary_unary_rpc_method_handler(
+                    servicer.AddServer,
+                    request_deserializer=raft__pb2.IntegerArg.FromString,
+                    response_serializer=raft__pb2.Reply.SerializeToString,
+            ),
+            'RemoveServer': grpc.unary_unary_rpc_method_handler(
+                    servicer.RemoveServer,
+                    request_deserializer=raft__pb2.IntegerArg.FromString,
+                    response_serializer=raft__pb2.Reply.SerializeToString,
+            ),
+            'TransferLeadership': grpc.unary_unary_rpc_method_handler(
+                    servicer.TransferLeadership,
+                    request_deserializer=raft__pb2.IntegerArg.FromString,
+                    response_serializer=raft__pb2.Reply.SerializeToString,
+            ),
+            'AppendEntries': grpc.unary_unary_rpc_method_handler(
+                    servicer.AppendEntries,
+                    request_deserializer=raft__pb2.AppendEntriesArgs.FromString,
+                    response_serializer=raft__pb2.AppendEntriesReply.SerializeToString,
+            ),
+            'ReplicateStream': grpc.stream_stream_rpc_method_handler(
+                    servicer.ReplicateStream,
+                    request_deserializer=raft__pb2.AppendEntriesArgs.FromString,
+                    response_serializer=raft__pb2.AppendEntriesReply.SerializeToString,
+            ),
+            'RequestVote': grpc.unary_unary_rpc_method_handler(
+                    servicer.RequestVote,
+                    request_deserializer=raft__pb2.RequestVoteArgs.FromString,
+                    response_serializer=raft__pb2.RequestVoteReply.SerializeToString,
+            ),
+            'InstallSnapshot': grpc.stream_unary_rpc_method_handler(
+                    servicer.InstallSnapshot,
+                    request_deserializer=raft__pb2.InstallSnapshotChunk.FromString,
+                    response_serializer=raft__pb2.InstallSnapshotReply.SerializeToString,
+            ),
+            'TimeoutNow': grpc.unary_unary_rpc_method_handler(
+                    servicer.TimeoutNow,
+                    request_deserializer=raft__pb2.TimeoutNowArgs.FromString,
+                    response_serializer=raft__pb2.TimeoutNowReply.SerializeToString,
+            ),
+            'StoreBlob': grpc.stream_unary_rpc_method_handler(
+                    servicer.StoreBlob,
+                    request_deserializer=raft__pb2.BlobChunk.FromString,
+                    response_serializer=raft__pb2.GenericResponse.SerializeToString,
+            ),
+            'FetchBlob': grpc.unary_stream_rpc_method_handler(
+                    servicer.FetchBlob,
+                    request_deserializer=raft__pb2.BlobId.FromString,
+                    response_serializer=raft__pb2.BlobChunk.SerializeToString,
+            ),
+    }
+    generic_handler = grpc.method_handlers_generic_handler(
+            'raft.KeyValueStore', rpc_method_handlers)
+    server.add_generic_rpc_handlers((generic_handler,))
+    server.add_registered_method_handlers('raft.KeyValueStore', rpc_method_handlers)
+
+
+ # This class is part of an EXPERIMENTAL API.
+class KeyValueStore(object):
+    """Server service (Assignment 1 stubs, full implementation in later assignments)
+    """
+
+    @staticmethod
+    def ping(request,
+            target,
+            options=(),
+            channel_credentials=None,
+            call_credentials=None,
+            insecure=False,
+            compression=None,
+            wait_for_ready=None,
+            timeout=None,
+            metadata=None):
+        return grpc.experimental.unary_unary(
+            request,
+            target,
+            '/raft.KeyValueStore/ping',
+            raft__pb2.Empty.SerializeToString,
+            raft__pb2.GenericResponse.FromString,
+            options,
+            channel_credentials,
+            insecure,
+            call_credentials,
+            compression,
+            wait_for_ready,
+            timeout,
+            metadata,
+            _registered_method=True)
+
+    @staticmethod
+    def GetState(request,
+            target,
+            options=(),
+            channel_credentials=None,
+            call_credentials=None,
+            insecure=False,
+            compression=None,
+            wait_for_ready=None,
+            timeout=None,
+            metadata=None):
+        return grpc.experimental.unary_unary(
+            request,
+            target,
+            '/raft.KeyValueStore/GetState',
+            raft__pb2.Empty.SerializeToString,
+            raft__pb2.State.FromString,
+            options,
+            channel_credentials,
+            insecure,
+            call_credentials,
+            compression,
+            wait_for_ready,
+            timeout,
+            metadata,
+            _registered_method=True)
+
+    @staticmethod
+    def GetMetrics(request,
+            target,
+            options=(),
+            channel_credentials=None,
+            call_credentials=None,
+            insecure=False,
+            compression=None,
+            wait_for_ready=None,
+            timeout=None,
+            metadata=None):
+        return grpc.experimental.unary_unary(
+            request,
+            target,
+            '/raft.KeyValueStore/GetMetrics',
+            raft__pb2.Empty.SerializeToString,
+            raft__pb2.Metrics.FromString,
+            options,
+            channel_credentials,
+            insecure,
+            call_credentials,
+            compression,
+            wait_for_ready,
+            timeout,
+            metadata,
+            _registered_method=True)
+
+    @staticmethod
+    def Get(request,
+            target,
+            options=(),
+            channel_credentials=None,
+            call_credentials=None,
+            insecure=False,
+            compression=None,
+            wait_for_ready=None,
+            timeout=None,
+            metadata=None):
+        return grpc.experimental.unary_unary(
+            request,
+            target,
+            '/raft.KeyValueStore/Get',
+            raft__pb2.GetKey.SerializeToString,
+            raft__pb2.Reply.FromString,
+            options,
+            channel_credentials,
+            insecure,
+            call_credentials,
+            compression,
+            wait_for_ready,
+            timeout,
+            metadata,
+            _registered_method=True)
+
+    @staticmethod
+    def Put(request,
+            target,
+            options=(),
+            channel_credentials=None,
+            call_credentials=None,
+            insecure=False,
+            compression=None,
+            wait_for_ready=None,
+            timeout=None,
+            metadata=None):
+        return grpc.experimental.unary_unary(
+            request,
+            target,
+            '/raft.KeyValueStore/Put',
+            raft__pb2.KeyValue.SerializeToString,
+            raft__pb2.Reply.FromString,
+            options,
+            channel_credentials,
+            insecure,
+            call_credentials,
+            compression,
+            wait_for_ready,
+            timeout,
+            metadata,
+            _registered_method=True)
+
+    @staticmethod
+    def PutBatch(request,
+            target,
+            options=(),
+            channel_credentials=None,
+            call_credentials=None,
+            insecure=False,
+            compression=None,
+            wait_for_ready=None,
+            timeout=None,
+            metadata=None):
+        return grpc.experimental.unary_unary(
+            request,
+            target,
+            '/raft.KeyValueStore/PutBatch',
+            raft__pb2.KeyValueBatch.SerializeToString,
+            raft__pb2.BatchReply.FromString,
+            options,
+            channel_credentials,
+            insecure,
+            call_credentials,
+            compression,
+            wait_for_ready,
+            timeout,
+            metadata,
+            _registered_method=True)
+
+    @staticmethod
+    def GetBytes(request,
+            target,
+            options=(),
+            channel_credentials=None,
+            call_credentials=None,
+            insecure=False,
+            compression=None,
+            wait_for_ready=None,
+            timeout=None,
+            metadata=None):
+        return grpc.experimental.unary_unary(
+            request,
+            target,
+            '/raft.KeyValueStore/GetBytes',
+            raft__pb2.BinaryGetKey.SerializeToString,
+            raft__pb2.BinaryReply.FromString,
+            options,
+            channel_credentials,
+            insecure,
+            call_credentials,
+            compression,
+            wait_for_ready,
+            timeout,
+            metadata,
+            _registered_method=True)
+
+    @staticmethod
+    def PutBytes(request,
+            target,
+            options=(),
+            channel_credentials=None,
+            call_credentials=None,
+            insecure=False,
+            compression=None,
+            wait_for_ready=None,
+            timeout=None,
+            metadata=None):
+        return grpc.experimental.unary_unary(
+            request,
+            target,
+            '/raft.KeyValueStore/PutBytes',
+            raft__pb2.BinaryKeyValue.SerializeToString,
+            raft__pb2.BinaryReply.FromString,
+            options,
+            channel_credentials,
+            insecure,
+            call_credentials,
+            compression,
+            wait_for_ready,
+            timeout,
+            metadata,
+            _registered_method=True)
+
+    @staticmethod
+    def PutBytesBatch(request,
+            target,
+            options=(),
+            channel_credentials=None,
+            call_credentials=None,
+            insecure=False,
+            compression=None,
+            wait_for_ready=None,
+            timeout=None,
+            metadata=None):
+        return grpc.experimental.unary_unary(
+            request,
+            target,
+            '/raft.KeyValueStore/PutBytesBatch',
+            raft__pb2.BinaryKeyValueBatch.SerializeToString,
+            raft__pb2.BatchReply.FromString,
+            options,
+            channel_credentials,
+            insecure,
+            call_credentials,
+            compression,
+            wait_for_ready,
+            timeout,
+            metadata,
+            _registered_method=True)
+
+    @staticmethod
+    def PutStream(request_iterator,
+            target,
+            options=(),
+            channel_credentials=None,
+            call_credentials=None,
+            insecure=False,
+            compression=None,
+            wait_for_ready=None,
+            timeout=None,
+            metadata=None):
+        return grpc.experimental.stream_unary(
+            request_iterator,
+            target,
+            '/raft.KeyValueStore/PutStream',
+            raft__pb2.ValueChunk.SerializeToString,
+            raft__pb2.BinaryReply.FromString,
+            options,
+            channel_credentials,
+            insecure,
+            call_credentials,
+            compression,
+            wait_for_ready,
+            timeout,
+            metadata,
+            _registered_method=True)
+
+    @staticmethod
+    def GetStream(request,
+            target,
+            options=(),
+            channel_credentials=None,
+            call_credentials=None,
+            insecure=False,
+            compression=None,
+            wait_for_ready=None,
+            timeout=None,
+            metadata=None):
+        return grpc.experimental.unary_stream(
+            request,
+            target,
+            '/raft.KeyValueStore/GetStream',
+            raft__pb2.BinaryGetKey.SerializeToString,
+            raft__pb2.ValueChunk.FromString,
+            options,
+            channel_credentials,
+            insecure,
+            call_credentials,
+            compression,
+            wait_for_ready,
+            timeout,
+            metadata,
+            _registered_method=True)
+
+    @staticmethod
+    def MultiGet(request,
+            target,
+            options=(),
+            channel_credentials=None,
+            call_credentials=None,
+            insecure=False,
+            compression=None,
+            wait_for_ready=None,
+            timeout=None,
+            metadata=None):
+        return grpc.experimental.unary_unary(
+            request,
+            target,
+            '/raft.KeyValueStore/MultiGet',
+            raft__pb2.MultiGetArgs.SerializeToString,
+            raft__pb2.MultiReply.FromString,
+            options,
+            channel_credentials,
+            insecure,
+            call_credentials,
+            compression,
+            wait_for_ready,
+            timeout,
+            metadata,
+            _registered_method=True)
+
+    @staticmethod
+    def MultiPut(request,
+            target,
+            options=(),
+            channel_credentials=None,
+            call_credentials=None,
+            insecure=False,
+            compression=None,
+            wait_for_ready=None,
+            timeout=None,
+            metadata=None):
+        return grpc.experimental.unary_unary(
+            request,
+            target,
+            '/raft.KeyValueStore/MultiPut',
+            raft__pb2.MultiPutArgs.SerializeToString,
+            raft__pb2.MultiReply.FromString,
+            options,
+            channel_credentials,
+            insecure,
+            call_credentials,
+            compression,
+            wait_for_ready,
+            timeout,
+            metadata,
+            _registered_method=True)
+
+    @staticmethod
+    def CompareAndSet(request,
+            target,
+            options=(),
+            channel_credentials=None,
+            call_credentials=None,
+            insecure=False,
+            compression=None,
+            wait_for_ready=None,
+            timeout=None,
+            metadata=None):
+        return grpc.experimental.unary_unary(
+            request,
+            target,
+            '/raft.KeyValueStore/CompareAndSet',
+            raft__pb2.MultiPutArgs.SerializeToString,
+            raft__pb2.MultiReply.FromString,
+            options,
+            channel_credentials,
+            insecure,
+            call_credentials,
+            compression,
+            wait_for_ready,
+            timeout,
+            metadata,
+            _registered_method=True)
+
+    @staticmethod
+    def AddServer(request,
+            target,
+            options=(),
+            channel_credentials=None,
+            call_credentials=None,
+            insecure=False,
+            compression=None,
+            wait_for_ready=None,
+            timeout=None,
+            metadata=None):
+        return grpc.experimental.unary_unary(
+            request,
+            target,
+            '/raft.KeyValueStore/AddServer',
+            raft__pb2.IntegerArg.SerializeToString,
+            raft__pb2.Reply.FromString,
+            options,
+            channel_credentials,
+            insecure,
+            call_credentials,
+            compression,
+            wait_for_ready,
+            timeout,
+            metadata,
+            _registered_method=True)
+
+    @staticmethod
+    def RemoveServer(request,
+            target,
+            options=(),
+            channel_credentials=None,
+            call_credentials=None,
+            insecure=False,
+            compression=None,
+            wait_for_ready=None,
+            timeout=None,
+            metadata=None):
+        return grpc.experimental.unary_unary(
+            request,
+            target,
+            '/raft.KeyValueStore/RemoveServer',
+            raft__pb2.IntegerArg.SerializeToString,
+            raft__pb2.Reply.FromString,
+            options,
+            channel_credentials,
+            insecure,
+            call_credentials,
+            compression,
+            wait_for_ready,
+            timeout,
+            metadata,
+            _registered_method=True)
+
+    @staticmethod
+    def TransferLeadership(request,
+            target,
+            options=(),
+            channel_credentials=None,
+            call_credentials=None,
+            insecure=False,
+            compression=None,
+            wait_for_ready=None,
+            timeout=None,
+            metadata=None):
+        return grpc.experimental.unary_unary(
+            request,
+            target,
+            '/raft.KeyValueStore/TransferLeadership',
+            raft__pb2.IntegerArg.SerializeToString,
+            raft__pb2.Reply.FromString,
+            options,
+            channel_credentials,
+            insecure,
+            call_credentials,
+            compression,
+            wait_for_ready,
+            timeout,
+            metadata,
+            _registered_method=True)
+
+    @staticmethod
+    def AppendEntries(request,
+            target,
+            options=(),
+            channel_credentials=None,
+            call_credentials=None,
+            insecure=False,
+            compression=None,
+            wait_for_ready=None,
+            timeout=None,
+            metadata=None):
+        return grpc.experimental.unary_unary(
+            request,
+            target,
+            '/raft.KeyValueStore/AppendEntries',
+            raft__pb2.AppendEntriesArgs.SerializeToString,
+            raft__pb2.AppendEntriesReply.FromString,
+            options,
+            channel_credentials,
+            insecure,
+            call_credentials,
+            compression,
+            wait_for_ready,
+            timeout,
+            metadata,
+            _registered_method=True)
+
+    @staticmethod
+    def ReplicateStream(request_iterator,
+            target,
+            options=(),
+            channel_credentials=None,
+            call_credentials=None,
+            insecure=False,
+            compression=None,
+            wait_for_ready=None,
+            timeout=None,
+            metadata=None):
+        return grpc.experimental.stream_stream(
+            request_iterator,
+            target,
+            '/raft.KeyValueStore/ReplicateStream',
+            raft__pb2.AppendEntriesArgs.SerializeToString,
+            raft__pb2.AppendEntriesReply.FromString,
+            options,
+            channel_credentials,
+            insecure,
+            call_credentials,
+            compression,
+            wait_for_ready,
+            timeout,
+            metadata,
+            _registered_method=True)
+
+    @staticmethod
+    def RequestVote(request,
+            target,
+            options=(),
+            channel_credentials=None,
+            call_credentials=None,
+            insecure=False,
+            compression=None,
+            wait_for_ready=None,
+            timeout=None,
+            metadata=None):
+        return grpc.experimental.unary_unary(
+            request,
+            target,
+            '/raft.KeyValueStore/RequestVote',
+            raft__pb2.RequestVoteArgs.SerializeToString,
+            raft__pb2.RequestVoteReply.FromString,
+            options,
+            channel_credentials,
+            insecure,
+            call_credentials,
+            compression,
+            wait_for_ready,
+            timeout,
+            metadata,
+            _registered_method=True)
+
+    @staticmethod
+    def InstallSnapshot(request_iterator,
+            target,
+            options=(),
+            channel_credentials=None,
+            call_credentials=None,
+            insecure=False,
+            compression=None,
+            wait_for_ready=None,
+            timeout=None,
+            metadata=None):
+        return grpc.experimental.stream_unary(
+            request_iterator,
+            target,
+            '/raft.KeyValueStore/InstallSnapshot',
+            raft__pb2.InstallSnapshotChunk.SerializeToString,
+            raft__pb2.InstallSnapshotReply.FromString,
+            options,
+            channel_credentials,
+            insecure,
+            call_credentials,
+            compression,
+            wait_for_ready,
+            timeout,
+            metadata,
+            _registered_method=True)
+
+    @staticmethod
+    def TimeoutNow(request,
+            target,
+            options=(),
+            channel_credentials=None,
+            call_credentials=None,
+            insecure=False,
+            compression=None,
+            wait_for_ready=None,
+            timeout=None,
+            metadata=None):
+        return grpc.experimental.unary_unary(
+            request,
+            target,
+            '/raft.KeyValueStore/TimeoutNow',
+            raft__pb2.TimeoutNowArgs.SerializeToString,
+            raft__pb2.TimeoutNowReply.FromString,
+            options,
+            channel_credentials,
+            insecure,
+            call_credentials,
+            compression,
+            wait_for_ready,
+            timeout,
+            metadata,
+            _registered_method=True)
+
+    @staticmethod
+    def StoreBlob(request_iterator,
+            target,
+            options=(),
+            channel_credentials=None,
+            call_credentials=None,
+            insecure=False,
+            compression=None,
+            wait_for_ready=None,
+            timeout=None,
+            metadata=None):
+        return grpc.experimental.stream_unary(
+            request_iterator,
+            target,
+            '/raft.KeyValueStore/StoreBlob',
+            raft__pb2.BlobChunk.SerializeToString,
+            raft__pb2.GenericResponse.FromString,
+            options,
+            channel_credentials,
+            insecure,
+            call_credentials,
+            compression,
+            wait_for_ready,
+            timeout,
+            metadata,
+            _registered_method=True)
+
+    @staticmethod
+    def FetchBlob(request,
+            target,
+            options=(),
+            channel_credentials=None,
+            call_credentials=None,
+            insecure=False,
+            compression=None,
+            wait_for_ready=None,
+            timeout=None,
+            metadata=None):
+        return grpc.experimental.unary_stream(
+            request,
+            target,
+            '/raft.KeyValueStore/FetchBlob',
+            raft__pb2.BlobId.SerializeToString,
+            raft__pb2.BlobChunk.FromString,
             options,
             channel_credentials,
             insecure,
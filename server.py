@@ -1,44 +1,635 @@
 from concurrent import futures
+import asyncio
+import contextlib
 import grpc
 import argparse
+import itertools
+import os
+import queue
+import threading
+import time
 
 import raft_pb2 as pb
 import raft_pb2_grpc as pb_grpc
+from aio_futures import shielded
+from adaptive_executor import thread_pool_server
+from channel_pool import ChannelPool, GRPC_COMPRESSION, SERVER_OPTIONS
+from config import Config, SERVING_MODES, parse_id_list
+from blobs import ValueSpool, blob_chunks, read_chunks
+from raft_node import (RaftNode, NotLeaderError, MembershipChangeError, LeadershipTransferError,
+                       BlobTransferError, LEADER)
+from state_machine import RESULT_DISCARDED
+from wire import NOT_UTF8, as_binary, text_reply
 
 class KeyValueStoreService(pb_grpc.KeyValueStoreServicer):
+    def __init__(self, nodes, executor=None):
+        self.nodes = nodes  # one RaftNode per Raft group, indexed by group id
+        self.executor = executor
+
+    def node(self, request):
+        """The node of the Raft group request is addressed to."""
+        return self.nodes[request.groupId]
+
     def ping(self, request, context):
         return pb.GenericResponse(success=True)
-    
+
+    def GetMetrics(self, request, context):
+        values = node_metrics(self.nodes)
+        # Whole-process CPU, which is where the cost of gRPC compression shows up.
+        values["process.cpu_ms"] = time.process_time() * 1000
+        if self.executor is not None:
+            values.update(self.executor.stats())
+        return pb.Metrics(values=values)
+
     def GetState(self, request, context):
-        return pb.State(term=0, isLeader=False)
+        node = self.nodes[0]
+        led_groups = [n.group_id for n in self.nodes if n.is_leader()]
+        with node.lock:
+            return pb.State(
+                term=node.current_term,
+                isLeader=node.role == LEADER,
+                commitIndex=node.commit_index,
+                lastApplied=node.last_applied,
+                ledGroups=led_groups,
+            )
+
+    def Get(self, request, context):
+        return text_reply(self.GetBytes(as_binary(request), context))
+
+    def GetBytes(self, request, context):
+        node = self.node(request)
+        error = self.await_read(node, pb.BinaryReply)
+        if error is not None:
+            return error
+        return get_bytes_reply(node, request.key)
+
+    def await_read(self, node, reply_type):
+        """Waits until node may serve a linearizable read; returns an error reply_type if it may not."""
+        try:
+            node.read_barrier().result(timeout=node.config.rpc_timeout * 5)
+        except NotLeaderError as e:
+            return wrong_leader(reply_type, e)
+        except futures.TimeoutError:
+            return reply_type(error="Timed out confirming leadership")
+        return None
+
+    def GetStream(self, request, context):
+        node = self.node(request)
+        error = self.await_read(node, pb.ValueChunk)
+        if error is not None:
+            yield error
+            return
+        value, blob_file, size = open_value(node, request.key)
+        if blob_file is None:
+            yield value
+            return
+        yield from value_chunks(blob_file, size, node.config.blob_chunk_bytes)
+
+    def PutStream(self, request_iterator, context):
+        first = next(request_iterator, None)
+        if first is None:
+            return pb.BinaryReply(error="Empty value stream")
+        node = self.node(first)
+        if not node.is_leader():
+            return wrong_leader(pb.BinaryReply, NotLeaderError(node.leader_id))
+        spool = ValueSpool(node.blobs, node.config.blob_inline_bytes)
+        try:
+            for chunk in itertools.chain([first], request_iterator):
+                spool.add(chunk.data)
+            entry = spool.entry(first)
+        except BaseException:
+            spool.abort()
+            raise
+        try:
+            if entry.type == pb.PUT_BLOB:
+                node.replicate_blob(entry.blobId)
+            result = node.propose([entry])[0].result(timeout=node.config.rpc_timeout * 5)
+        except NotLeaderError as e:
+            return wrong_leader(pb.BinaryReply, e)
+        except BlobTransferError as e:
+            return pb.BinaryReply(error=str(e))
+        except futures.TimeoutError:
+            return pb.BinaryReply(error="Timed out waiting for commit")
+        return as_binary(put_reply(result))
+
+    def StoreBlob(self, request_iterator, context):
+        first = next(request_iterator, None)
+        if first is None:
+            return pb.GenericResponse(error="Empty blob stream")
+        writer = self.node(first).blobs.writer(first.blobId)
+        try:
+            for chunk in itertools.chain([first], request_iterator):
+                writer.write(chunk.data)
+        except BaseException:
+            writer.abort()
+            raise
+        writer.commit()
+        return pb.GenericResponse(success=True)
+
+    def FetchBlob(self, request, context):
+        node = self.node(request)
+        blob_file = node.blobs.open(request.blobId)
+        if blob_file is None:
+            context.abort(grpc.StatusCode.NOT_FOUND, f"No blob {request.blobId}")
+        yield from blob_chunks(blob_file, request.blobId, request.groupId, node.config.blob_chunk_bytes)
+
+    def Put(self, request, context):
+        return text_reply(self.PutBytes(as_binary(request), context))
+
+    def PutBytes(self, request, context):
+        reply = self.PutBytesBatch(pb.BinaryKeyValueBatch(items=[request], groupId=request.groupId), context)
+        return single_reply(reply)
+
+    def PutBatch(self, request, context):
+        return self.PutBytesBatch(as_binary(request), context)
+
+    def PutBytesBatch(self, request, context):
+        entries = put_entries(request)
+        try:
+            node = self.node(request)
+            proposals = node.propose(entries)
+            deadline = time.monotonic() + node.config.rpc_timeout * 5
+            results = [proposal.result(timeout=max(deadline - time.monotonic(), 0)) for proposal in proposals]
+        except NotLeaderError as e:
+            return wrong_leader(pb.BatchReply, e)
+        except futures.TimeoutError:
+            return pb.BatchReply(error="Timed out waiting for commit")
+        return pb.BatchReply(replies=[put_reply(result) for result in results])
+
+    def MultiGet(self, request, context):
+        node = self.node(request)
+        error = self.await_read(node, pb.MultiReply)
+        if error is not None:
+            return error
+        return multi_get_reply(node, request.keys)
+
+    def MultiPut(self, request, context):
+        return self.propose_multi_put(request, conditional=False)
+
+    def CompareAndSet(self, request, context):
+        return self.propose_multi_put(request, conditional=True)
+
+    def propose_multi_put(self, request, conditional):
+        node = self.node(request)
+        try:
+            proposal = node.propose([multi_put_entry(request, conditional)])[0]
+            result = proposal.result(timeout=node.config.rpc_timeout * 5)
+        except NotLeaderError as e:
+            return wrong_leader(pb.MultiReply, e)
+        except futures.TimeoutError:
+            return pb.MultiReply(error="Timed out waiting for commit")
+        return multi_put_reply(result)
+
+    def AddServer(self, request, context):
+        try:
+            self.node(request).add_server(request.arg).result()
+        except NotLeaderError as e:
+            return wrong_leader(pb.Reply, e)
+        except MembershipChangeError as e:
+            return pb.Reply(error=str(e))
+        return pb.Reply(value=f"Server {request.arg} is a voter")
+
+    def RemoveServer(self, request, context):
+        try:
+            node = self.node(request)
+            node.remove_server(request.arg).result(timeout=node.config.rpc_timeout * 5)
+        except NotLeaderError as e:
+            return wrong_leader(pb.Reply, e)
+        except MembershipChangeError as e:
+            return pb.Reply(error=str(e))
+        except futures.TimeoutError:
+            return pb.Reply(error="Timed out waiting for commit")
+        return pb.Reply(value=f"Server {request.arg} removed")
+
+    def TransferLeadership(self, request, context):
+        try:
+            target = self.node(request).transfer_leadership(request.arg).result()
+        except NotLeaderError as e:
+            return wrong_leader(pb.Reply, e)
+        except LeadershipTransferError as e:
+            return pb.Reply(error=str(e))
+        return pb.Reply(value=f"Leadership handed to server {target}")
+
+    def AppendEntries(self, request, context):
+        return self.node(request).handle_append_entries(request)
+
+    def ReplicateStream(self, request_iterator, context):
+        # Requests are appended as they arrive, on a thread of their own, while replies
+        # wait in order for their entries to become durable. The stream lasts as long as
+        # the leader's connection, so its worker stops counting towards max_workers.
+        appended = queue.SimpleQueue()
+
+        def append_all():
+            try:
+                for request in request_iterator:
+                    appended.put(self.node(request).begin_append_entries(request))
+            except grpc.RpcError:
+                pass  # the leader went away
+            finally:
+                appended.put(None)
+        detached = self.executor.detached() if self.executor is not None else contextlib.nullcontext()
+        with detached:
+            threading.Thread(target=append_all, daemon=True).start()
+            for reply, durable in iter(appended.get, None):
+                if durable is not None:
+                    durable.result()
+                yield reply
+
+    def RequestVote(self, request, context):
+        return self.node(request).handle_request_vote(request)
+
+    def InstallSnapshot(self, request_iterator, context):
+        # The first chunk says which group the snapshot is for.
+        first = next(request_iterator, None)
+        if first is None:
+            return pb.InstallSnapshotReply()
+        return self.node(first).handle_install_snapshot(itertools.chain([first], request_iterator))
+
+    def TimeoutNow(self, request, context):
+        return self.node(request).handle_timeout_now(request)
+
+class AsyncKeyValueStoreService(pb_grpc.KeyValueStoreServicer):
+    """KeyValueStoreService for grpc.aio: waits on the node's Futures without holding a thread."""
+
+    def __init__(self, nodes):
+        self.sync_service = KeyValueStoreService(nodes)
+        self.node = self.sync_service.node
+
+    async def ping(self, request, context):
+        return pb.GenericResponse(success=True)
+
+    async def GetState(self, request, context):
+        return self.sync_service.GetState(request, context)
+
+    async def GetMetrics(self, request, context):
+        return self.sync_service.GetMetrics(request, context)
+
+    async def Get(self, request, context):
+        return text_reply(await self.GetBytes(as_binary(request), context))
+
+    async def GetBytes(self, request, context):
+        node = self.node(request)
+        error = await self.await_read(node, pb.BinaryReply)
+        if error is not None:
+            return error
+        return get_bytes_reply(node, request.key)
+
+    async def await_read(self, node, reply_type):
+        try:
+            await asyncio.wait_for(shielded(node.read_barrier()), node.config.rpc_timeout * 5)
+        except NotLeaderError as e:
+            return wrong_leader(reply_type, e)
+        except asyncio.TimeoutError:
+            return reply_type(error="Timed out confirming leadership")
+        return None
+
+    async def GetStream(self, request, context):
+        node = self.node(request)
+        error = await self.await_read(node, pb.ValueChunk)
+        if error is not None:
+            yield error
+            return
+        # Fetching a blob from a peer blocks, so the lookup runs off the event loop.
+        value, blob_file, size = await asyncio.to_thread(open_value, node, request.key)
+        if blob_file is None:
+            yield value
+            return
+        for chunk in value_chunks(blob_file, size, node.config.blob_chunk_bytes):
+            yield chunk
+
+    async def PutStream(self, request_iterator, context):
+        chunks = aiter(request_iterator)
+        first = await anext(chunks, None)
+        if first is None:
+            return pb.BinaryReply(error="Empty value stream")
+        node = self.node(first)
+        if not node.is_leader():
+            return wrong_leader(pb.BinaryReply, NotLeaderError(node.leader_id))
+        spool = ValueSpool(node.blobs, node.config.blob_inline_bytes)
+        try:
+            spool.add(first.data)
+            async for chunk in chunks:
+                spool.add(chunk.data)
+            entry = await asyncio.to_thread(spool.entry, first)
+        except BaseException:
+            spool.abort()
+            raise
+        try:
+            if entry.type == pb.PUT_BLOB:
+                await asyncio.to_thread(node.replicate_blob, entry.blobId)
+            proposal = shielded(node.propose([entry])[0])
+            result = await asyncio.wait_for(proposal, node.config.rpc_timeout * 5)
+        except NotLeaderError as e:
+            return wrong_leader(pb.BinaryReply, e)
+        except BlobTransferError as e:
+            return pb.BinaryReply(error=str(e))
+        except asyncio.TimeoutError:
+            return pb.BinaryReply(error="Timed out waiting for commit")
+        return as_binary(put_reply(result))
+
+    async def StoreBlob(self, request_iterator, context):
+        writer = None
+        try:
+            async for chunk in request_iterator:
+                writer = writer or self.node(chunk).blobs.writer(chunk.blobId)
+                writer.write(chunk.data)
+            if writer is None:
+                return pb.GenericResponse(error="Empty blob stream")
+            await asyncio.to_thread(writer.commit)
+        except BaseException:
+            if writer is not None:
+                writer.abort()
+            raise
+        return pb.GenericResponse(success=True)
+
+    async def FetchBlob(self, request, context):
+        node = self.node(request)
+        blob_file = node.blobs.open(request.blobId)
+        if blob_file is None:
+            await context.abort(grpc.StatusCode.NOT_FOUND, f"No blob {request.blobId}")
+        for chunk in blob_chunks(blob_file, request.blobId, request.groupId, node.config.blob_chunk_bytes):
+            yield chunk
+
+    async def Put(self, request, context):
+        return text_reply(await self.PutBytes(as_binary(request), context))
+
+    async def PutBytes(self, request, context):
+        reply = await self.PutBytesBatch(pb.BinaryKeyValueBatch(items=[request], groupId=request.groupId), context)
+        return single_reply(reply)
+
+    async def PutBatch(self, request, context):
+        return await self.PutBytesBatch(as_binary(request), context)
+
+    async def PutBytesBatch(self, request, context):
+        entries = put_entries(request)
+        try:
+            node = self.node(request)
+            proposals = [shielded(p) for p in node.propose(entries)]
+            results = await asyncio.wait_for(asyncio.gather(*proposals), node.config.rpc_timeout * 5)
+        except NotLeaderError as e:
+            return wrong_leader(pb.BatchReply, e)
+        except asyncio.TimeoutError:
+            return pb.BatchReply(error="Timed out waiting for commit")
+        return pb.BatchReply(replies=[put_reply(result) for result in results])
+
+    async def MultiGet(self, request, context):
+        node = self.node(request)
+        error = await self.await_read(node, pb.MultiReply)
+        if error is not None:
+            return error
+        return multi_get_reply(node, request.keys)
+
+    async def MultiPut(self, request, context):
+        return await self.propose_multi_put(request, conditional=False)
+
+    async def CompareAndSet(self, request, context):
+        return await self.propose_multi_put(request, conditional=True)
+
+    async def propose_multi_put(self, request, conditional):
+        node = self.node(request)
+        try:
+            proposal = shielded(node.propose([multi_put_entry(request, conditional)])[0])
+            result = await asyncio.wait_for(proposal, node.config.rpc_timeout * 5)
+        except NotLeaderError as e:
+            return wrong_leader(pb.MultiReply, e)
+        except asyncio.TimeoutError:
+            return pb.MultiReply(error="Timed out waiting for commit")
+        return multi_put_reply(result)
+
+    async def AddServer(self, request, context):
+        try:
+            await shielded(self.node(request).add_server(request.arg))
+        except NotLeaderError as e:
+            return wrong_leader(pb.Reply, e)
+        except MembershipChangeError as e:
+            return pb.Reply(error=str(e))
+        return pb.Reply(value=f"Server {request.arg} is a voter")
+
+    async def RemoveServer(self, request, context):
+        try:
+            node = self.node(request)
+            removal = shielded(node.remove_server(request.arg))
+            await asyncio.wait_for(removal, node.config.rpc_timeout * 5)
+        except NotLeaderError as e:
+            return wrong_leader(pb.Reply, e)
+        except MembershipChangeError as e:
+            return pb.Reply(error=str(e))
+        except asyncio.TimeoutError:
+            return pb.Reply(error="Timed out waiting for commit")
+        return pb.Reply(value=f"Server {request.arg} removed")
+
+    async def TransferLeadership(self, request, context):
+        try:
+            target = await shielded(self.node(request).transfer_leadership(request.arg))
+        except NotLeaderError as e:
+            return wrong_leader(pb.Reply, e)
+        except LeadershipTransferError as e:
+            return pb.Reply(error=str(e))
+        return pb.Reply(value=f"Leadership handed to server {target}")
+
+    async def AppendEntries(self, request, context):
+        reply, durable = self.node(request).begin_append_entries(request)
+        if durable is not None:
+            await shielded(durable)
+        return reply
+
+    async def ReplicateStream(self, request_iterator, context):
+        appended = asyncio.Queue()
+
+        async def append_all():
+            try:
+                async for request in request_iterator:
+                    appended.put_nowait(self.node(request).begin_append_entries(request))
+            finally:
+                appended.put_nowait(None)
+        task = asyncio.create_task(append_all())
+        try:
+            while (item := await appended.get()) is not None:
+                reply, durable = item
+                if durable is not None:
+                    await shielded(durable)
+                yield reply
+        finally:
+            task.cancel()
+
+    async def RequestVote(self, request, context):
+        return self.node(request).handle_request_vote(request)
+
+    async def TimeoutNow(self, request, context):
+        return self.node(request).handle_timeout_now(request)
+
+    async def InstallSnapshot(self, request_iterator, context):
+        node = None
+        data = bytearray()
+        async for chunk in request_iterator:
+            node = node or self.node(chunk)
+            if not node.receive_snapshot_chunk(chunk, data):
+                break
+        if node is None:
+            return pb.InstallSnapshotReply()
+        return node.install_snapshot_reply()
+
+def node_metrics(nodes):
+    """Metrics of every node; with several Raft groups each key is prefixed by its group."""
+    if len(nodes) == 1:
+        return nodes[0].metrics()
+    values = {}
+    for node in nodes:
+        values.update({f"group{node.group_id}.{key}": value for key, value in node.metrics().items()})
+    return values
+
+def put_entries(batch):
+    return [pb.LogEntry(key=item.key, value=item.value, clientId=item.clientId, requestId=item.requestId)
+            for item in batch.items]
+
+def single_reply(batch_reply):
+    """The BinaryReply for a one-item BatchReply."""
+    if batch_reply.wrongLeader or batch_reply.error:
+        reply = pb.BinaryReply(wrongLeader=batch_reply.wrongLeader, error=batch_reply.error)
+        if batch_reply.HasField("leaderHint"):
+            reply.leaderHint = batch_reply.leaderHint
+        return reply
+    return as_binary(batch_reply.replies[0])
+
+def get_bytes_reply(node, key):
+    with node.lock:
+        value = node.state_machine.get(key)
+        blob = node.state_machine.blob_ref(key)
+    if blob is not None:
+        return pb.BinaryReply(error=blob_error(blob))
+    return pb.BinaryReply(value=value or b"")
+
+def blob_error(blob):
+    return f"Value is a blob of {blob[1]} bytes; read it with GetStream"
+
+def open_value(node, key):
+    """Looks key up for GetStream: (ValueChunk, None, 0) for a value held inline or an error,
+    else (None, the blob's open file, its size), fetching the blob from a peer if need be."""
+    with node.lock:
+        value = node.state_machine.get(key) or b""
+        blob = node.state_machine.blob_ref(key)
+    if blob is None:
+        return pb.ValueChunk(data=value, size=len(value)), None, 0
+    blob_id, size = blob
+    blob_file = node.blobs.open(blob_id)
+    if blob_file is None:
+        try:
+            node.fetch_blob(blob_id)
+        except BlobTransferError as e:
+            return pb.ValueChunk(error=str(e)), None, 0
+        blob_file = node.blobs.open(blob_id)
+        if blob_file is None:
+            return pb.ValueChunk(error="Value changed while being read"), None, 0
+    return None, blob_file, size
+
+def value_chunks(blob_file, size, chunk_bytes):
+    first = True
+    for data in read_chunks(blob_file, chunk_bytes):
+        yield pb.ValueChunk(data=data, size=size) if first else pb.ValueChunk(data=data)
+        first = False
+
+def multi_get_reply(node, keys):
+    with node.lock:
+        values = [node.state_machine.get(key.encode()) or b"" for key in keys]
+        blobs = [blob for blob in map(node.state_machine.blob_ref, (key.encode() for key in keys)) if blob]
+    if blobs:
+        return pb.MultiReply(error=blob_error(blobs[0]))
+    try:
+        return pb.MultiReply(values=[value.decode() for value in values])
+    except UnicodeDecodeError:
+        return pb.MultiReply(error=NOT_UTF8)
+
+def multi_put_entry(request, conditional):
+    """One log entry writing every item of request; only CompareAndSet keeps its conditions."""
+    return pb.LogEntry(type=pb.MULTI_PUT, writes=request.items,
+                       expected=request.expected if conditional else [],
+                       clientId=request.clientId, requestId=request.requestId)
+
+def put_reply(result):
+    if result is RESULT_DISCARDED:
+        return pb.Reply(error=DISCARDED_ERROR)
+    return pb.Reply()
+
+def multi_put_reply(result):
+    if result is RESULT_DISCARDED:
+        return pb.MultiReply(error=DISCARDED_ERROR)
+    if isinstance(result, str):
+        return pb.MultiReply(error=result)
+    swapped, current = result
+    return pb.MultiReply(swapped=swapped, values=current)
+
+DISCARDED_ERROR = "Duplicate request whose result is no longer remembered"
+
+def wrong_leader(reply_type, error):
+    reply = reply_type(wrongLeader=True, error="Not leader")
+    if error.leader_id >= 0:
+        reply.leaderHint = error.leader_id
+    return reply
 
 def serve():
-    server_id, port = parse_args()
+    config = Config()
+    args = parse_args(config)
 
-    server = grpc.server(futures.ThreadPoolExecutor(max_workers=10))
-    pb_grpc.add_KeyValueStoreServicer_to_server(KeyValueStoreService(), server)
-    server.add_insecure_port(f"127.0.0.1:{port}")
+    voters = args.peers if args.peers is not None else config.active
+    learners = args.learners if args.learners is not None else config.learners
+    # Every Raft group has the same members; the groups share one channel per peer.
+    pool = ChannelPool.from_config(config, config.peer_compression)
+    nodes = [RaftNode(args.server_id, voters, config, learners, group_id, pool)
+             for group_id in range(config.groups)]
+    address = config.server_address(args.server_id)
+    if (args.serving_mode or config.serving_mode) == "aio":
+        asyncio.run(serve_aio(nodes, address, args.ready_fd))
+        return
+
+    server, executor = thread_pool_server(config, SERVER_OPTIONS, GRPC_COMPRESSION[config.client_compression])
+    pb_grpc.add_KeyValueStoreServicer_to_server(KeyValueStoreService(nodes, executor), server)
+    server.add_insecure_port(address)
     server.start()
-    print(f"[server {server_id}] listening on 127.0.0.1:{port}", flush=True)
+    for node in nodes:
+        node.start()
+    print(f"[server {args.server_id}] listening on {address}", flush=True)
+    signal_ready(args.ready_fd)
     server.wait_for_termination()
 
-def parse_args():
+async def serve_aio(nodes, address, ready_fd=None):
+    config = nodes[0].config
+    server = grpc.aio.server(options=SERVER_OPTIONS, compression=GRPC_COMPRESSION[config.client_compression],
+                             maximum_concurrent_rpcs=config.max_workers + config.max_queued_rpcs)
+    pb_grpc.add_KeyValueStoreServicer_to_server(AsyncKeyValueStoreService(nodes), server)
+    server.add_insecure_port(address)
+    await server.start()
+    for node in nodes:
+        node.start()
+    print(f"[server {nodes[0].id}] listening on {address} (aio)", flush=True)
+    signal_ready(ready_fd)
+    await server.wait_for_termination()
+
+def signal_ready(ready_fd):
+    """Tells the process that launched this server that its port is bound and serving."""
+    if ready_fd is None:
+        return
+    os.write(ready_fd, b"1")
+    os.close(ready_fd)
+
+def parse_args(config):
     parser = argparse.ArgumentParser()
-    parser.add_argument('server_id', type=int, default=None, help='Port to listen on')
+    parser.add_argument('server_id', type=int, default=None, help='Server id; listens on base_port + id')
+    parser.add_argument('--peers', type=parse_id_list, default=None,
+                        help='Comma-separated ids of the voting members (defaults to config.ini active)')
+    parser.add_argument('--learners', type=parse_id_list, default=None,
+                        help='Comma-separated ids of the non-voting members (defaults to config.ini learners)')
+    parser.add_argument('--serving-mode', choices=SERVING_MODES, default=None,
+                        help='Serve RPCs from a thread pool or a grpc.aio event loop (defaults to config.ini)')
+    parser.add_argument('--ready-fd', type=int, default=None,
+                        help='Inherited pipe to write one byte to once the server is serving')
     args = parser.parse_args()
 
-    server_id = args.server_id
-    if server_id < 0 or server_id > 4:
-        raise ValueError("server_id must be between 0 and 4")
-    
-    port = 9001 + args.server_id
-
-    if port < 1 or port > 65535:
-        raise ValueError(f"Port out of range: {port}")
     if args.server_id < 0:
         raise ValueError("server_id must be >= 0")
-
-    return server_id, port
+    port = config.base_port + args.server_id
+    if port > 65535:
+        raise ValueError(f"Port out of range: {port}")
+    return args
 
 if __name__ == "__main__":
-    serve()
\ No newline at end of file
+    serve()
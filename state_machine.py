@@ -0,0 +1,195 @@
+import collections
+
+import raft_pb2 as pb
+
+# Requests per client whose results are remembered; older ones are only known to be done.
+# Past twice this many done ids above a gap, the gap's requests are taken as abandoned.
+SESSION_WINDOW = 1024
+# Result of a duplicate request older than its client's window, whose result is gone.
+RESULT_DISCARDED = object()
+
+class ClientSession:
+    def __init__(self, last_seen):
+        self.last_seen = last_seen
+        self.floor = 0  # every request id up to here is done
+        self.results = collections.OrderedDict()  # request id -> result, oldest first
+        self.evicted = set()  # done ids above floor whose results left the window
+
+    def copy(self):
+        session = ClientSession(self.last_seen)
+        session.floor = self.floor
+        session.results = self.results.copy()
+        session.evicted = set(self.evicted)
+        return session
+
+    def is_done(self, request_id):
+        return request_id <= self.floor or request_id in self.evicted
+
+    def record(self, request_id, result):
+        self.results[request_id] = result
+        if len(self.results) > SESSION_WINDOW:
+            evicted, _ = self.results.popitem(last=False)
+            self.evicted.add(evicted)
+        if len(self.evicted) > SESSION_WINDOW:
+            # Requests still missing below this many done ones will not be retried.
+            self.floor = min(self.evicted)
+            self.evicted.discard(self.floor)
+        while self.floor + 1 in self.evicted:
+            self.floor += 1
+            self.evicted.discard(self.floor)
+
+class KVStateMachine:
+    """The replicated key-value map that committed log entries are applied to.
+
+    Entries with a nonzero clientId and a positive requestId are deduplicated by a per-client
+    session: a retried request is applied once and its duplicates answered with the first
+    result. Request ids may arrive in any order; the results of the latest SESSION_WINDOW are
+    kept, and older ones are only remembered as done.
+    Sessions idle for session_ttl, or beyond the max_sessions most recently used, are dropped;
+    idleness is measured with the leader timestamps in the log, so every replica drops the
+    same ones.
+    """
+
+    def __init__(self, max_sessions=10000, session_ttl=3600, blob_store=None):
+        self.data = {}  # bytes -> bytes
+        # Keys whose value lives in blob_store: key -> (blob id, size). A blob is deleted
+        # from the store once its key is overwritten.
+        self.blobs = {}
+        self.blob_store = blob_store
+        # Last applied CONFIG entry's Membership, kept so snapshots carry the membership.
+        self.membership = None
+        self.max_sessions = max_sessions
+        self.session_ttl_ms = int(session_ttl * 1000)
+        self.sessions = collections.OrderedDict()  # client id -> ClientSession, LRU first
+        self.clock = 0  # newest entry timestamp applied, in ms
+        self.duplicates = 0
+
+    def apply(self, entry):
+        self.clock = max(self.clock, entry.timestampMs)
+        if not entry.clientId or entry.requestId <= 0:
+            return self._apply(entry)
+        session = self._touch_session(entry.clientId)
+        if entry.requestId in session.results:
+            self.duplicates += 1
+            return session.results[entry.requestId]
+        if session.is_done(entry.requestId):
+            self.duplicates += 1
+            return RESULT_DISCARDED
+        result = self._apply(entry)
+        session.record(entry.requestId, result)
+        return result
+
+    def _apply(self, entry):
+        if entry.type == pb.PUT:
+            self._drop_blob(entry.key)
+            self.data[entry.key] = entry.value
+        elif entry.type == pb.PUT_BLOB:
+            self._drop_blob(entry.key)
+            self.data.pop(entry.key, None)
+            self.blobs[entry.key] = (entry.blobId, entry.blobSize)
+        elif entry.type == pb.CONFIG:
+            self.membership = entry.membership
+        elif entry.type == pb.MULTI_PUT:
+            return self.apply_multi_put(entry)
+        return None
+
+    def _touch_session(self, client_id):
+        session = self.sessions.pop(client_id, None) or ClientSession(self.clock)
+        session.last_seen = self.clock
+        self.sessions[client_id] = session
+        while len(self.sessions) > self.max_sessions:
+            self.sessions.popitem(last=False)
+        # last_seen never decreases along the LRU order, so idle sessions are at the front.
+        while next(iter(self.sessions.values())).last_seen < self.clock - self.session_ttl_ms:
+            self.sessions.popitem(last=False)
+        return session
+
+    def apply_multi_put(self, entry):
+        """Writes entry.writes if every expected key holds its value; returns (swapped, current values).
+
+        MULTI_PUT entries carry string keys and values, stored as their UTF-8 encoding. A blob
+        cannot be compared: if an expected key holds one, nothing is written and the result
+        is an error message instead.
+        """
+        blob_keys = [condition.key for condition in entry.expected if condition.key.encode() in self.blobs]
+        if blob_keys:
+            return f"Key {blob_keys[0]} holds a blob, which CompareAndSet cannot compare"
+        current = [self.data.get(condition.key.encode(), b"") for condition in entry.expected]
+        if any(value != condition.value.encode() for value, condition in zip(current, entry.expected)):
+            return False, [value.decode(errors="replace") for value in current]
+        for item in entry.writes:
+            key = item.key.encode()
+            self._drop_blob(key)
+            self.data[key] = item.value.encode()
+        return True, [value.decode(errors="replace") for value in current]
+
+    def _drop_blob(self, key):
+        blob = self.blobs.pop(key, None)
+        if blob is not None and self.blob_store is not None:
+            self.blob_store.delete(blob[0])
+
+    def get(self, key):
+        return self.data.get(key)
+
+    def blob_ref(self, key):
+        """(blob id, size) if key's value is a blob, else None."""
+        return self.blobs.get(key)
+
+    def copy(self):
+        """A copy of the replicated state, for snapshot() to serialize while this one moves on."""
+        other = KVStateMachine(self.max_sessions, self.session_ttl_ms / 1000)
+        other.data = dict(self.data)
+        other.blobs = dict(self.blobs)
+        other.membership = self.membership
+        other.clock = self.clock
+        other.sessions = collections.OrderedDict(
+            (client_id, session.copy()) for client_id, session in self.sessions.items())
+        return other
+
+    def adopt(self, other):
+        """Takes over the replicated state of other, typically just restore()d from a snapshot."""
+        self.data = other.data
+        self.blobs = other.blobs
+        self.membership = other.membership
+        self.clock = other.clock
+        self.sessions = other.sessions
+
+    def snapshot(self):
+        sessions = [pb.ClientSession(clientId=client_id, lastSeenMs=session.last_seen, floor=session.floor,
+                                     results=[session_result(request_id, result)
+                                              for request_id, result in session.results.items()],
+                                     evicted=sorted(session.evicted))
+                    for client_id, session in self.sessions.items()]
+        data = [pb.BinaryKeyValue(key=key, value=value) for key, value in self.data.items()]
+        blobs = [pb.BlobRef(key=key, blobId=blob_id, size=size) for key, (blob_id, size) in self.blobs.items()]
+        return pb.SnapshotData(data=data, membership=self.membership, sessions=sessions,
+                               clockMs=self.clock, blobs=blobs).SerializeToString()
+
+    def restore(self, snapshot):
+        snapshot = pb.SnapshotData.FromString(snapshot)
+        self.data = {item.key: item.value for item in snapshot.data}
+        # Blobs only the replaced state referred to are left to BlobStore.sweep().
+        self.blobs = {ref.key: (ref.blobId, ref.size) for ref in snapshot.blobs}
+        self.membership = snapshot.membership if snapshot.HasField("membership") else None
+        self.clock = snapshot.clockMs
+        self.sessions = collections.OrderedDict()
+        for saved in snapshot.sessions:
+            session = ClientSession(saved.lastSeenMs)
+            session.floor = max(saved.floor, 0)  # older snapshots started sessions at -1
+            session.evicted = set(saved.evicted)
+            for saved_result in saved.results:
+                result = None
+                if saved_result.reply.error:
+                    result = saved_result.reply.error
+                elif saved_result.HasField("reply"):
+                    result = (saved_result.reply.swapped, list(saved_result.reply.values))
+                session.results[saved_result.requestId] = result
+            self.sessions[saved.clientId] = session
+
+def session_result(request_id, result):
+    if result is None:
+        return pb.SessionResult(requestId=request_id)
+    if isinstance(result, str):
+        return pb.SessionResult(requestId=request_id, reply=pb.MultiReply(error=result))
+    swapped, values = result
+    return pb.SessionResult(requestId=request_id, reply=pb.MultiReply(swapped=swapped, values=values))
@@ -0,0 +1,332 @@
+from concurrent import futures
+import io
+import os
+import shutil
+import struct
+import tempfile
+import threading
+import zlib
+
+import raft_pb2 as pb
+
+# Each WAL record is a header (body length, crc32 of body) followed by a body of
+# (record type, log index, payload).
+RECORD_HEADER = struct.Struct("<II")
+RECORD_BODY = struct.Struct("<BQ")
+RECORD_ENTRY = 1     # payload is a serialized LogEntry stored at index
+RECORD_TRUNCATE = 2  # drop every entry at or after index
+
+SEGMENT_SUFFIX = ".wal"
+HARD_STATE = struct.Struct("<qq")
+SNAPSHOT_HEADER = struct.Struct("<qqI")  # last included index, its term, crc32 of data
+
+class CorruptLogError(Exception):
+    pass
+
+def open_storage(config, server_id, group_id=0):
+    if config.persistent_state_path == "memory":
+        return MemoryStorage()
+    directory = state_dir(config, server_id)
+    if group_id:
+        # Group 0 keeps the server directory itself, so a single-group layout is unchanged.
+        directory = os.path.join(directory, f"group{group_id}")
+    return FileStorage(directory, config.wal_segment_bytes)
+
+def state_dir(config, server_id):
+    return os.path.join(config.persistent_state_path, f"server{server_id}")
+
+def wipe_state(config, server_id):
+    if config.persistent_state_path != "memory":
+        shutil.rmtree(state_dir(config, server_id), ignore_errors=True)
+
+def completed_future(result=None):
+    future = futures.Future()
+    future.set_result(result)
+    return future
+
+class MemoryStorage:
+    """Keeps only the latest snapshot: every write is immediately 'durable'. Used for benchmarking."""
+
+    def __init__(self):
+        self.snapshot = None
+
+    def load(self):
+        return 0, -1, None, []
+
+    def save_hard_state(self, term, voted_for):
+        pass
+
+    def save_snapshot(self, index, term, data, remaining_entries):
+        self.snapshot = (index, term, data)
+
+    def prepare_snapshot(self, index, term, data):
+        return index, term, data
+
+    def commit_snapshot(self, prepared, remaining_entries):
+        self.snapshot = prepared
+
+    def discard_snapshot(self, prepared):
+        pass
+
+    def open_snapshot(self):
+        if self.snapshot is None:
+            return None
+        index, term, data = self.snapshot
+        return index, term, io.BytesIO(data)
+
+    def append(self, first_index, entries):
+        pass
+
+    def truncate_from(self, index):
+        pass
+
+    def sync(self):
+        return completed_future()
+
+    def close(self):
+        pass
+
+class FileStorage:
+    """Segmented append-only WAL of LogEntry records plus a small hard-state file.
+
+    Appends only write to the OS; a background syncer thread fsyncs whatever has
+    accumulated and resolves every sync() Future issued up to that point, so many
+    appends share one fsync (group commit).
+    """
+
+    def __init__(self, directory, segment_bytes):
+        self.directory = directory
+        self.segment_bytes = segment_bytes
+        os.makedirs(directory, exist_ok=True)
+
+        self.lock = threading.Lock()
+        self.sync_cond = threading.Condition(self.lock)
+        self.segment = None
+        self.written_seq = 0
+        self.synced_seq = 0
+        self.waiters = []  # (seq, Future)
+        self.closed = False
+
+    # ---- recovery ------------------------------------------------------------------------
+
+    def load(self):
+        """Replays the hard state, snapshot and every segment.
+
+        Returns (term, voted_for, snapshot, entries) where snapshot is (index, term, data)
+        or None and entries start right after the snapshot.
+        """
+        term, voted_for = 0, -1
+        path = os.path.join(self.directory, "hardstate")
+        if os.path.exists(path):
+            with open(path, "rb") as f:
+                term, voted_for = HARD_STATE.unpack(f.read(HARD_STATE.size))
+
+        for name in os.listdir(self.directory):
+            if name.startswith("snapshot.") and name.endswith(".tmp"):
+                os.remove(os.path.join(self.directory, name))  # never committed
+        snapshot = self._load_snapshot()
+        base = snapshot[0] if snapshot is not None else 0
+        entries = []  # entries[i] holds log index base + 1 + i
+        segments = self._segment_paths()
+        for position, segment_path in enumerate(segments):
+            is_last = position == len(segments) - 1
+            self._replay_segment(segment_path, base, entries, is_last)
+
+        self._open_segment(segments)
+        threading.Thread(target=self._run_syncer, daemon=True).start()
+        return term, voted_for, snapshot, entries
+
+    def _snapshot_path(self):
+        return os.path.join(self.directory, "snapshot")
+
+    def _load_snapshot(self):
+        try:
+            with open(self._snapshot_path(), "rb") as f:
+                index, term, checksum = SNAPSHOT_HEADER.unpack(f.read(SNAPSHOT_HEADER.size))
+                data = f.read()
+        except FileNotFoundError:
+            return None
+        if zlib.crc32(data) != checksum:
+            raise CorruptLogError(f"Snapshot checksum mismatch in {self._snapshot_path()}")
+        return index, term, data
+
+    def open_snapshot(self):
+        """Returns (index, term, file positioned at the data) for the latest snapshot, or None."""
+        try:
+            f = open(self._snapshot_path(), "rb")
+        except FileNotFoundError:
+            return None
+        index, term, _ = SNAPSHOT_HEADER.unpack(f.read(SNAPSHOT_HEADER.size))
+        return index, term, f
+
+    def _segment_paths(self):
+        names = sorted(n for n in os.listdir(self.directory) if n.endswith(SEGMENT_SUFFIX))
+        return [os.path.join(self.directory, n) for n in names]
+
+    def _replay_segment(self, path, base, entries, is_last):
+        with open(path, "rb") as f:
+            data = f.read()
+        view = memoryview(data)
+        offset = 0
+        while offset < len(data):
+            valid = offset + RECORD_HEADER.size <= len(data)
+            if valid:
+                length, checksum = RECORD_HEADER.unpack_from(view, offset)
+                end = offset + RECORD_HEADER.size + length
+                body = view[offset + RECORD_HEADER.size:end]
+                valid = end <= len(data) and length >= RECORD_BODY.size and zlib.crc32(body) == checksum
+            if not valid:
+                # A torn write at the tail of the newest segment is expected after a crash
+                # and is simply cut off; anywhere else it means the log is damaged.
+                if not is_last:
+                    raise CorruptLogError(f"Corrupt WAL record in {path} at offset {offset}")
+                with open(path, "r+b") as f:
+                    f.truncate(offset)
+                return
+
+            record_type, index = RECORD_BODY.unpack_from(body)
+            offset = end
+            if index <= base:
+                continue  # already covered by the snapshot
+            position = index - base - 1
+            del entries[position:]
+            if record_type == RECORD_ENTRY:
+                if position != len(entries):
+                    raise CorruptLogError(f"WAL gap in {path}: index {index} after {base + len(entries)}")
+                entries.append(pb.LogEntry.FromString(body[RECORD_BODY.size:]))
+
+    # ---- writes --------------------------------------------------------------------------
+
+    def save_hard_state(self, term, voted_for):
+        path = os.path.join(self.directory, "hardstate")
+        tmp_path = path + ".tmp"
+        with open(tmp_path, "wb") as f:
+            f.write(HARD_STATE.pack(term, voted_for))
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, path)
+
+    def save_snapshot(self, index, term, data, remaining_entries):
+        """Atomically replace the snapshot, then rewrite the WAL to hold only later entries."""
+        self.commit_snapshot(self.prepare_snapshot(index, term, data), remaining_entries)
+
+    def prepare_snapshot(self, index, term, data):
+        """Writes a snapshot to a file of its own, leaving the current one in place.
+
+        This is the slow part of taking a snapshot and needs no lock; commit_snapshot()
+        or discard_snapshot() then takes the returned handle.
+        """
+        fd, path = tempfile.mkstemp(prefix="snapshot.", suffix=".tmp", dir=self.directory)
+        with os.fdopen(fd, "wb") as f:
+            f.write(SNAPSHOT_HEADER.pack(index, term, zlib.crc32(data)))
+            f.write(data)
+            f.flush()
+            os.fsync(f.fileno())
+        return index, path
+
+    def discard_snapshot(self, prepared):
+        os.remove(prepared[1])
+
+    def commit_snapshot(self, prepared, remaining_entries):
+        """Atomically replace the snapshot with a prepared one, then rewrite the WAL to hold
+        only remaining_entries, the entries following it."""
+        index, path = prepared
+        os.replace(path, self._snapshot_path())
+
+        records = [encode_record(RECORD_TRUNCATE, index + 1, b"")]
+        for offset, entry in enumerate(remaining_entries):
+            records.append(encode_record(RECORD_ENTRY, index + 1 + offset, entry.SerializeToString()))
+        with self.lock:
+            old_segments = self._segment_paths()
+            self._roll_segment()
+            self.segment.write(b"".join(records))
+            self.segment.flush()
+            os.fsync(self.segment.fileno())
+            # Everything written before the rewrite is now either in the snapshot or in the
+            # new segment, so all outstanding sync() calls are satisfied.
+            self.synced_seq = self.written_seq
+            done = [future for _, future in self.waiters]
+            self.waiters = []
+        for old_path in old_segments:
+            os.remove(old_path)
+        for future in done:
+            future.set_result(None)
+
+    def append(self, first_index, entries):
+        records = []
+        for offset, entry in enumerate(entries):
+            records.append(encode_record(RECORD_ENTRY, first_index + offset, entry.SerializeToString()))
+        self._write(b"".join(records))
+
+    def truncate_from(self, index):
+        self._write(encode_record(RECORD_TRUNCATE, index, b""))
+
+    def _write(self, data):
+        with self.lock:
+            if self.segment.tell() >= self.segment_bytes:
+                self._roll_segment()
+            self.segment.write(data)
+            self.written_seq += 1
+
+    def _open_segment(self, segments):
+        # Keep appending to the newest segment until it is full.
+        self.segment_number = 0
+        if segments:
+            self.segment_number = int(os.path.basename(segments[-1])[:-len(SEGMENT_SUFFIX)])
+        self.segment = open(self._segment_path(self.segment_number), "ab", buffering=1 << 20)
+
+    def _segment_path(self, number):
+        # Segments are numbered rather than named by first index: a truncation can rewrite
+        # indices below those of an earlier segment, and replay must follow write order.
+        return os.path.join(self.directory, f"{number:010d}{SEGMENT_SUFFIX}")
+
+    def _roll_segment(self):
+        self.segment.flush()
+        os.fsync(self.segment.fileno())
+        self.segment.close()
+        self.segment_number += 1
+        self.segment = open(self._segment_path(self.segment_number), "ab", buffering=1 << 20)
+
+    def sync(self):
+        """Returns a Future resolved once every write issued so far is on disk."""
+        with self.lock:
+            if self.synced_seq >= self.written_seq:
+                return completed_future()
+            future = futures.Future()
+            self.waiters.append((self.written_seq, future))
+            self.sync_cond.notify()
+            return future
+
+    def _run_syncer(self):
+        while True:
+            with self.lock:
+                while not self.closed and not self.waiters:
+                    self.sync_cond.wait()
+                if self.closed:
+                    return
+                target = self.written_seq
+                self.segment.flush()
+                # fsync a duplicate descriptor so a concurrent segment roll can close the file.
+                fd = os.dup(self.segment.fileno())
+            try:
+                os.fsync(fd)
+            finally:
+                os.close(fd)
+            with self.lock:
+                self.synced_seq = max(self.synced_seq, target)
+                done = [f for seq, f in self.waiters if seq <= target]
+                self.waiters = [(seq, f) for seq, f in self.waiters if seq > target]
+            for future in done:
+                future.set_result(None)
+
+    def close(self):
+        with self.lock:
+            self.closed = True
+            self.sync_cond.notify()
+            self.segment.flush()
+            os.fsync(self.segment.fileno())
+            self.segment.close()
+
+def encode_record(record_type, index, payload):
+    body = RECORD_BODY.pack(record_type, index) + payload
+    return RECORD_HEADER.pack(len(body), zlib.crc32(body)) + body
@@ -0,0 +1,217 @@
+import os
+import select
+import signal
+import subprocess
+import threading
+import time
+
+import raft_pb2 as pb
+from zygote import Zygote
+
+# Exits that mean the server was stopped on purpose; any other exit is a crash.
+STOP_SIGNALS = (signal.SIGTERM, signal.SIGINT, signal.SIGHUP)
+STOP_TIMEOUT = 5.0  # seconds a server gets to exit after SIGTERM before it is killed
+
+class ExecLauncher:
+    """Starts each server as a fresh interpreter, named raftserver{id+1} by bash's exec -a."""
+
+    def spawn(self, args, ready_fd, on_exit):
+        """Runs `server.py *args --ready-fd ready_fd`; on_exit(returncode) is called once it exits."""
+        process = subprocess.Popen(
+            ["bash", "-c", f"exec -a raftserver{int(args[0]) + 1} python server.py {' '.join(args)} "
+                           f"--ready-fd {ready_fd}"],
+            pass_fds=(ready_fd,),
+        )
+        # Waiting also reaps the child, so exited servers do not linger as zombies.
+        threading.Thread(target=lambda: on_exit(process.wait()), daemon=True).start()
+        return process.pid
+
+class ServerProcess:
+    def __init__(self, server_id):
+        self.server_id = server_id
+        self.pid = 0
+        self.state = "stopped"
+        self.started_at = None
+        self.restarts = 0
+        self.failures = 0  # consecutive crashes, reset once the server stays up long enough
+        self.last_exit = ""
+        # Bumped by every launch and stop, so exits of replaced processes and restart
+        # timers scheduled before a stop are ignored.
+        self.generation = 0
+
+class Supervisor:
+    """Launches the raft servers, reaps them, and restarts any that crash.
+
+    A crashed server is relaunched with its persisted state after a backoff that doubles
+    with each consecutive crash, between restart_backoff_min and restart_backoff_max.
+    Servers that were stopped on purpose, or are no longer cluster members, stay down.
+    """
+
+    def __init__(self, config, cluster):
+        self.config = config
+        self.cluster = cluster
+        self.launcher = Zygote() if config.server_launcher == "zygote" else ExecLauncher()
+        self.cond = threading.Condition()
+        self.servers = {}  # server id -> ServerProcess
+
+    def start(self, server_id, members, learners):
+        """Launches server_id, first stopping any copy still running; returns its ready pipe."""
+        self.stop(server_id)
+        with self.cond:
+            process = self.servers.setdefault(server_id, ServerProcess(server_id))
+        return self._launch(process, members, learners)
+
+    def _launch(self, process, members, learners):
+        with self.cond:
+            process.generation += 1
+            generation = process.generation
+            process.state = "starting"
+        ready_read, ready_write = os.pipe()
+        # Never called with self.cond held: the zygote delivers exits on the thread that
+        # also answers spawn requests.
+        pid = self.launcher.spawn(server_args(process.server_id, members, learners), ready_write,
+                                  lambda returncode: self._exited(process, generation, returncode))
+        os.close(ready_write)
+        with self.cond:
+            if process.generation == generation and process.state == "starting":
+                process.pid = pid
+                process.state = "running"
+                process.started_at = time.monotonic()
+        return ready_read
+
+    def is_running(self, server_id):
+        with self.cond:
+            process = self.servers.get(server_id)
+            return process is not None and process.state == "running"
+
+    def stop(self, server_id):
+        """Stops server_id with SIGTERM (SIGKILL if it lingers) and waits for it to exit."""
+        with self.cond:
+            process = self.servers.get(server_id)
+            if process is None:
+                return
+            process.generation += 1  # cancels a pending restart
+            generation = process.generation
+            pid = process.pid
+            if not pid:
+                process.state = "stopped"
+                return
+            process.state = "stopping"
+        for sig in (signal.SIGTERM, signal.SIGKILL):
+            try:
+                os.kill(pid, sig)
+            except ProcessLookupError:
+                pass
+            deadline = time.monotonic() + STOP_TIMEOUT
+            with self.cond:
+                while process.pid == pid and time.monotonic() < deadline:
+                    self.cond.wait(deadline - time.monotonic())
+                if process.pid != pid:
+                    return
+        with self.cond:
+            if process.generation == generation:
+                process.pid = 0
+                process.state = "stopped"
+
+    def stop_all(self):
+        threads = [threading.Thread(target=self.stop, args=(i,)) for i in list(self.servers)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+    def _exited(self, process, generation, returncode):
+        with self.cond:
+            # A process being stopped has had its generation bumped, but its exit still counts.
+            if process.generation != generation and process.state != "stopping":
+                return
+            uptime = time.monotonic() - process.started_at if process.started_at else 0
+            process.pid = 0
+            process.started_at = None
+            process.last_exit = describe_exit(returncode)
+            self.cond.notify_all()
+            if process.state == "stopping" or returncode == 0 or -returncode in STOP_SIGNALS:
+                process.state = "stopped"
+                return
+            members = self.cluster.servers() + self.cluster.non_voters()
+            if not self.config.restart_crashed or process.server_id not in members:
+                process.state = "crashed"
+                return
+            if uptime >= self.config.restart_backoff_max:
+                process.failures = 0
+            delay = min(self.config.restart_backoff_min * 2 ** process.failures,
+                        self.config.restart_backoff_max)
+            process.failures += 1
+            process.state = "restarting"
+            print(f"[supervisor] server {process.server_id} {process.last_exit}; "
+                  f"restarting in {delay:g}s", flush=True)
+            timer = threading.Timer(delay, self._restart, (process, generation))
+            timer.daemon = True
+            timer.start()
+
+    def _restart(self, process, generation):
+        with self.cond:
+            if process.generation != generation or process.state != "restarting":
+                return
+            process.restarts += 1
+        started_at = time.monotonic()
+        ready = self._launch(process, self.cluster.servers(), self.cluster.non_voters())
+        latencies = wait_until_ready({process.server_id: ready}, started_at,
+                                     started_at + self.config.startup_timeout)
+        if latencies:
+            self.cluster.server_restarted(process.server_id)
+
+    def status(self):
+        now = time.monotonic()
+        with self.cond:
+            return [pb.ServerStatus(serverId=p.server_id, pid=p.pid, state=p.state,
+                                    uptimeSeconds=now - p.started_at if p.started_at else 0,
+                                    restarts=p.restarts, lastExit=p.last_exit)
+                    for _, p in sorted(self.servers.items())]
+
+    def stats(self):
+        with self.cond:
+            processes = list(self.servers.values())
+            return {
+                "supervisor.running": sum(p.state == "running" for p in processes),
+                "supervisor.restarting": sum(p.state == "restarting" for p in processes),
+                "supervisor.restarts": sum(p.restarts for p in processes),
+            }
+
+def describe_exit(returncode):
+    if returncode < 0:
+        try:
+            return f"killed by {signal.Signals(-returncode).name}"
+        except ValueError:
+            return f"killed by signal {-returncode}"
+    return f"exited with code {returncode}"
+
+def server_args(server_id, members=None, learners=None):
+    args = [str(server_id)]
+    if members is not None:
+        args += ["--peers", ",".join(str(m) for m in members)]
+    if learners:
+        args += ["--learners", ",".join(str(m) for m in learners)]
+    return args
+
+def wait_until_ready(ready, started_at, deadline):
+    """Waits on each server's ready pipe (server id -> fd) and closes them all.
+
+    Returns {server id: seconds from started_at until it was serving}, leaving out servers
+    that exited (the pipe closes without a byte) or were not ready by the deadline.
+    """
+    latencies = {}
+    waiting = {fd: server_id for server_id, fd in ready.items()}
+    while waiting:
+        remaining = deadline - time.monotonic()
+        if remaining <= 0:
+            break
+        readable, _, _ = select.select(list(waiting), [], [], remaining)
+        for fd in readable:
+            server_id = waiting.pop(fd)
+            if os.read(fd, 1):
+                latencies[server_id] = time.monotonic() - started_at
+            os.close(fd)
+    for fd in waiting:
+        os.close(fd)
+    return latencies
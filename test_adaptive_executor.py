@@ -0,0 +1,22 @@
+import threading
+
+from adaptive_executor import AdaptiveExecutor
+
+def test_detached_items_do_not_hold_a_worker():
+    executor = AdaptiveExecutor(1, 1, 0.001)
+    release = threading.Event()
+
+    def stream():
+        with executor.detached():
+            release.wait(10)
+        return "stream done"
+    streams = [executor.submit(stream) for _ in range(3)]
+    # With the only worker taken by a stream, this would wait for the streams to end.
+    assert executor.submit(lambda: "call done").result(timeout=5) == "call done"
+    stats = executor.stats()
+    assert stats["executor.detached_workers"] == 3 and stats["executor.workers"] == 1
+
+    release.set()
+    assert [s.result(timeout=5) for s in streams] == ["stream done"] * 3
+    assert executor.stats()["executor.detached_workers"] == 0
+    executor.shutdown()
@@ -0,0 +1,76 @@
+import raft_pb2 as pb
+from raft_log import RaftLog
+
+def entry(index, term=1):
+    return pb.LogEntry(term=term, key=f"k{index}".encode(), value=b"v" * index)
+
+def keys(entries):
+    return [(e.key.decode(), e.term) for e in entries]
+
+def filled_log(count, term=1):
+    log = RaftLog()
+    log.append([entry(i, term) for i in range(1, count + 1)])
+    return log
+
+def test_entries_read_back_from_the_arena():
+    log = filled_log(5)
+    assert log.last_index() == 5
+    assert keys(log.slice(2, 4)) == [("k2", 1), ("k3", 1)]
+    assert log.entry_at(5) == entry(5)
+    assert log.entry_at(0) == pb.LogEntry(term=0, type=pb.NOOP)
+    # Ranges are clamped to the end of the log.
+    assert keys(log.slice(4, 100)) == [("k4", 1), ("k5", 1)]
+    assert len(log.slice(6, 10)) == 0
+
+def test_add_entries_to_appends_to_a_request():
+    log = filled_log(5)
+    request = pb.AppendEntriesArgs(term=3, prevLogIndex=1)
+    assert log.add_entries_to(request, 2, 4) == 2
+    assert request.term == 3 and keys(request.entries) == [("k2", 1), ("k3", 1)]
+    assert log.add_entries_to(request, 6, 9) == 0
+
+def test_run_bytes_parse_as_append_entries():
+    log = filled_log(5)
+    run, count = log.run_bytes(3, 10)
+    assert count == 3
+    assert keys(pb.AppendEntriesArgs.FromString(run).entries) == [("k3", 1), ("k4", 1), ("k5", 1)]
+    assert log.run_bytes(6, 10) == (b"", 0)
+
+def test_truncate_then_append():
+    log = filled_log(5)
+    log.truncate_from(3)
+    assert log.last_index() == 2
+    log.append([entry(3, term=2), entry(4, term=2)])
+    assert keys(log.slice(1, 5)) == [("k1", 1), ("k2", 1), ("k3", 2), ("k4", 2)]
+    assert log.term_at(4) == 2 and log.term_at(5) == -1
+
+def test_compact_keeps_the_suffix():
+    log = filled_log(5)
+    log.truncate_from(4)
+    log.append([entry(4, term=2), entry(5, term=2)])
+    log.compact(3, b"state")
+    assert log.snapshot_index == 3 and log.snapshot_term() == 1
+    assert log.term_at(2) == -1 and log.term_at(3) == 1
+    assert keys(log.slice(4, 6)) == [("k4", 2), ("k5", 2)]
+    run, count = log.run_bytes(4, 6)
+    assert count == 2 and keys(pb.AppendEntriesArgs.FromString(run).entries) == [("k4", 2), ("k5", 2)]
+    # The arena holds only the entries after the snapshot.
+    assert log.size_bytes() == len(run)
+    log.append([entry(6, term=2)])
+    assert keys(log.slice(4, 7)) == [("k4", 2), ("k5", 2), ("k6", 2)]
+
+def test_install_snapshot():
+    log = filled_log(5)
+    log.install_snapshot(3, 1, log.storage.prepare_snapshot(3, 1, b"state"))  # matches: the suffix stays
+    assert log.snapshot_index == 3 and keys(log.slice(4, 6)) == [("k4", 1), ("k5", 1)]
+    log.install_snapshot(8, 4, log.storage.prepare_snapshot(8, 4, b"state"))  # does not: replaced
+    assert log.snapshot_index == 8 and log.last_index() == 8 and log.last_term() == 4
+    assert log.size_bytes() == 0
+
+def test_term_lookups():
+    log = RaftLog()
+    log.append([entry(1, 1), entry(2, 1), entry(3, 2), entry(4, 2), entry(5, 4)])
+    assert log.first_index_of_term(2, 4) == 3
+    assert log.last_index_of_term(2, 5) == 4
+    assert log.last_index_of_term(3, 5) is None
+    assert log.last_index_of_term(1, 100) == 2
@@ -0,0 +1,122 @@
+import raft_pb2 as pb
+from state_machine import KVStateMachine, RESULT_DISCARDED, SESSION_WINDOW
+
+def put(key, value, client_id=1, request_id=0, timestamp=0):
+    return pb.LogEntry(key=key.encode(), value=value.encode(), clientId=client_id,
+                       requestId=request_id, timestampMs=timestamp)
+
+def cas(key, expected, value, client_id=1, request_id=0):
+    return pb.LogEntry(type=pb.MULTI_PUT, writes=[pb.KeyValue(key=key, value=value)],
+                       expected=[pb.KeyValue(key=key, value=expected)],
+                       clientId=client_id, requestId=request_id)
+
+def test_retry_is_applied_once_with_the_first_result():
+    sm = KVStateMachine()
+    assert sm.apply(cas("k", "", "a", request_id=1)) == (True, [""])
+    assert sm.apply(put("k", "b", request_id=2)) is None
+    assert sm.apply(cas("k", "", "a", request_id=1)) == (True, [""])
+    assert sm.get(b"k") == b"b" and sm.duplicates == 1
+
+def test_zero_ids_are_not_deduplicated():
+    sm = KVStateMachine()
+    sm.apply(put("k", "a", client_id=0, request_id=1))
+    sm.apply(put("k", "b", client_id=0, request_id=1))
+    sm.apply(put("k", "c", request_id=0))
+    sm.apply(put("k", "d", request_id=0))
+    assert sm.get(b"k") == b"d" and sm.duplicates == 0 and not sm.sessions
+
+def test_results_beyond_the_window_are_only_known_done():
+    sm = KVStateMachine()
+    for request_id in range(1, SESSION_WINDOW + 11):
+        sm.apply(put(f"k{request_id}", "v", request_id=request_id))
+    assert sm.apply(put("k1", "again", request_id=1)) is RESULT_DISCARDED
+    assert sm.get(b"k1") == b"v"
+    assert sm.sessions[1].floor == 10 and not sm.sessions[1].evicted
+
+def test_a_gap_survives_the_window_moving_past_it():
+    # Request 5 was lost while more than a window of later requests went through.
+    sm = KVStateMachine()
+    ids = [i for i in range(1, SESSION_WINDOW + 82) if i != 5]
+    for request_id in ids:
+        sm.apply(put(f"k{request_id}", "v", request_id=request_id))
+    assert sm.sessions[1].floor == 4
+    assert sm.apply(put("k5", "v", request_id=5)) is None
+    assert sm.get(b"k5") == b"v"
+    assert sm.apply(put("k5", "again", request_id=5)) is None  # its result is in the window
+    assert sm.get(b"k5") == b"v"
+
+def test_an_abandoned_gap_is_eventually_closed():
+    sm = KVStateMachine()
+    for request_id in range(2, 2 * SESSION_WINDOW + 3):
+        sm.apply(put("k", str(request_id), request_id=request_id))
+    session = sm.sessions[1]
+    assert session.floor > 1 and len(session.evicted) <= SESSION_WINDOW
+    assert sm.apply(put("k", "late", request_id=1)) is RESULT_DISCARDED
+
+def test_out_of_order_ids_within_the_window():
+    sm = KVStateMachine()
+    for request_id in (3, 1, 2):
+        sm.apply(put("k", str(request_id), request_id=request_id))
+    assert sm.get(b"k") == b"2"
+    for request_id in (1, 2, 3):
+        sm.apply(put("k", "again", request_id=request_id))
+    assert sm.get(b"k") == b"2" and sm.duplicates == 3
+
+def test_least_recently_used_sessions_are_dropped():
+    sm = KVStateMachine(max_sessions=2)
+    sm.apply(put("k", "a", client_id=1, request_id=1))
+    sm.apply(put("k", "b", client_id=2, request_id=1))
+    sm.apply(put("k", "c", client_id=1, request_id=2))  # client 1 is now the most recent
+    sm.apply(put("k", "d", client_id=3, request_id=1))
+    assert list(sm.sessions) == [1, 3]
+
+def test_idle_sessions_expire_by_log_time():
+    sm = KVStateMachine(session_ttl=10)
+    sm.apply(put("k", "a", client_id=1, request_id=1, timestamp=1000))
+    sm.apply(put("k", "b", client_id=2, request_id=1, timestamp=5000))
+    sm.apply(put("k", "c", client_id=2, request_id=2, timestamp=12000))
+    assert list(sm.sessions) == [2]
+    # Client 1's session is gone, so its old request is applied again.
+    sm.apply(put("k", "a", client_id=1, request_id=1, timestamp=12000))
+    assert sm.get(b"k") == b"a"
+
+def test_snapshot_round_trip_keeps_sessions():
+    sm = KVStateMachine()
+    ids = [i for i in range(1, SESSION_WINDOW + 20) if i != 3]
+    for request_id in ids:
+        sm.apply(put(f"k{request_id}", "v", request_id=request_id, timestamp=request_id))
+    sm.apply(cas("c", "", "x", client_id=2, request_id=7))
+
+    restored = KVStateMachine()
+    restored.restore(sm.snapshot())
+    assert restored.data == sm.data and restored.clock == sm.clock
+    assert list(restored.sessions) == list(sm.sessions)
+    for client_id, session in sm.sessions.items():
+        copy = restored.sessions[client_id]
+        assert (copy.floor, copy.evicted, copy.last_seen) == (session.floor, session.evicted, session.last_seen)
+        assert copy.results == session.results
+    assert restored.apply(cas("c", "", "x", client_id=2, request_id=7)) == (True, [""])
+    assert restored.apply(put("k1", "again", request_id=1)) is RESULT_DISCARDED
+    assert restored.apply(put("k3", "v", request_id=3)) is None
+
+def test_copy_is_unaffected_by_later_writes():
+    sm = KVStateMachine()
+    sm.apply(put("k", "a", request_id=1))
+    copy = sm.copy()
+    sm.apply(put("k", "b", request_id=2))
+    sm.apply(put("k2", "c", client_id=2, request_id=1))
+    restored = KVStateMachine()
+    restored.restore(copy.snapshot())
+    assert restored.data == {b"k": b"a"} and list(restored.sessions) == [1]
+    assert list(restored.sessions[1].results) == [1]
+
+def test_compare_and_set_refuses_to_compare_a_blob():
+    sm = KVStateMachine()
+    sm.apply(pb.LogEntry(type=pb.PUT_BLOB, key=b"big", blobId="0" * 32, blobSize=1 << 20))
+    result = sm.apply(cas("big", "", "small", request_id=1))
+    assert isinstance(result, str) and "blob" in result
+    assert sm.blob_ref(b"big") == ("0" * 32, 1 << 20) and sm.get(b"big") is None
+    # The error is remembered for retries, across a snapshot too.
+    restored = KVStateMachine()
+    restored.restore(sm.snapshot())
+    assert restored.apply(cas("big", "", "small", request_id=1)) == result
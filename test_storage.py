@@ -0,0 +1,115 @@
+import os
+import shutil
+
+import pytest
+
+import raft_pb2 as pb
+from storage import FileStorage, CorruptLogError, RECORD_HEADER
+
+def entry(index, term=1):
+    return pb.LogEntry(term=term, key=f"k{index}".encode(), value=f"v{index}-{term}".encode())
+
+def keys(entries):
+    return [(e.key.decode(), e.term) for e in entries]
+
+def open_loaded(directory, segment_bytes=1 << 20):
+    storage = FileStorage(str(directory), segment_bytes)
+    return storage, storage.load()
+
+def write_log(directory, entries, segment_bytes=1 << 20):
+    storage, _ = open_loaded(directory, segment_bytes)
+    for index, e in enumerate(entries, start=1):
+        storage.append(index, [e])
+    storage.close()
+
+def segments(directory):
+    return sorted(os.path.join(directory, n) for n in os.listdir(directory) if n.endswith(".wal"))
+
+def test_replays_entries_truncations_and_hard_state(tmp_path):
+    storage, loaded = open_loaded(tmp_path)
+    assert loaded == (0, -1, None, [])
+    storage.save_hard_state(3, 2)
+    storage.append(1, [entry(1), entry(2), entry(3), entry(4)])
+    storage.truncate_from(3)
+    storage.append(3, [entry(3, term=2)])
+    storage.close()
+
+    _, (term, voted_for, snapshot, entries) = open_loaded(tmp_path)
+    assert (term, voted_for, snapshot) == (3, 2, None)
+    assert keys(entries) == [("k1", 1), ("k2", 1), ("k3", 2)]
+
+def test_torn_tail_is_cut_off(tmp_path):
+    write_log(tmp_path, [entry(1), entry(2), entry(3)])
+    path = segments(tmp_path)[-1]
+    size = os.path.getsize(path)
+    with open(path, "r+b") as f:
+        f.truncate(size - 3)  # the last record loses its final bytes
+
+    storage, (_, _, _, entries) = open_loaded(tmp_path)
+    assert keys(entries) == [("k1", 1), ("k2", 1)]
+    # The torn record is gone from disk, so later appends follow the intact ones.
+    storage.append(3, [entry(3, term=2)])
+    storage.close()
+    _, (_, _, _, entries) = open_loaded(tmp_path)
+    assert keys(entries) == [("k1", 1), ("k2", 1), ("k3", 2)]
+
+def test_corruption_before_the_tail_is_an_error(tmp_path):
+    # A tiny segment size puts every record in a segment of its own.
+    write_log(tmp_path, [entry(1), entry(2), entry(3)], segment_bytes=1)
+    assert len(segments(tmp_path)) == 3
+    first = segments(tmp_path)[0]
+    with open(first, "r+b") as f:
+        f.seek(RECORD_HEADER.size + 2)
+        byte = f.read(1)
+        f.seek(-1, os.SEEK_CUR)
+        f.write(bytes([byte[0] ^ 0xff]))
+
+    with pytest.raises(CorruptLogError):
+        FileStorage(str(tmp_path), 1).load()
+
+def test_snapshot_replaces_covered_entries(tmp_path):
+    write_log(tmp_path, [entry(i) for i in range(1, 6)])
+    storage, (_, _, _, entries) = open_loaded(tmp_path)
+    storage.save_snapshot(3, 1, b"state", entries[3:])
+    storage.close()
+
+    _, (_, _, snapshot, entries) = open_loaded(tmp_path)
+    assert snapshot == (3, 1, b"state")
+    assert keys(entries) == [("k4", 1), ("k5", 1)]
+
+@pytest.mark.parametrize("new_segment_written", [False, True])
+def test_crash_while_rewriting_the_log_after_a_snapshot(tmp_path, new_segment_written):
+    # save_snapshot replaces the snapshot, writes a new segment and only then deletes the
+    # old ones; a crash in between leaves both the old segments and the new snapshot.
+    log_dir = tmp_path / "log"
+    write_log(log_dir, [entry(i) for i in range(1, 6)])
+    old = tmp_path / "old"
+    shutil.copytree(log_dir, old)
+
+    storage, (_, _, _, entries) = open_loaded(log_dir)
+    storage.save_snapshot(3, 1, b"state", entries[3:])
+    storage.close()
+    if not new_segment_written:
+        for path in segments(log_dir):
+            os.remove(path)
+    for path in segments(old):
+        shutil.copy(path, log_dir)
+
+    _, (_, _, snapshot, entries) = open_loaded(log_dir)
+    assert snapshot == (3, 1, b"state")
+    assert keys(entries) == [("k4", 1), ("k5", 1)]
+
+def test_prepared_snapshot_only_counts_once_committed(tmp_path):
+    write_log(tmp_path, [entry(i) for i in range(1, 6)])
+    storage, (_, _, _, entries) = open_loaded(tmp_path)
+    storage.discard_snapshot(storage.prepare_snapshot(2, 1, b"discarded"))
+    storage.prepare_snapshot(3, 1, b"crashed before commit")
+    storage.close()
+
+    storage, (_, _, snapshot, entries) = open_loaded(tmp_path)
+    assert snapshot is None and len(entries) == 5
+    assert [n for n in os.listdir(tmp_path) if n.startswith("snapshot")] == []
+    storage.commit_snapshot(storage.prepare_snapshot(3, 1, b"state"), entries[3:])
+    storage.close()
+    _, (_, _, snapshot, entries) = open_loaded(tmp_path)
+    assert snapshot == (3, 1, b"state") and keys(entries) == [("k4", 1), ("k5", 1)]
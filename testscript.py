@@ -4,9 +4,9 @@ Assignment 1 Test Script: Infrastructure and Frontend Service
 Tests basic gRPC infrastructure, process management, and configuration.
 """
 
+import re
 import subprocess
 import time
-import grpc
 import sys
 import os
 from datetime import datetime
@@ -16,6 +16,7 @@ import configparser
 try:
     import raft_pb2
     import raft_pb2_grpc
+    from channel_pool import ChannelPool
 except ImportError:
     print("ERROR: Could not import raft_pb2 or raft_pb2_grpc")
     print("Please generate them from raft.proto first:")
@@ -68,19 +69,21 @@ BASE_PORT = 9001
 NUM_SERVERS = 5
 RPC_TIMEOUT = 5
 
+# Channels are reused across calls instead of paying a new connection per RPC
+POOL = ChannelPool(base_address="localhost", base_port=BASE_PORT)
+
 def cleanup_processes():
     """Kill any existing raft server processes"""
     print("Cleaning up existing processes...")
     
-    # Method 1: Kill by process name
-    for i in range(1, 6):  # raftserver1 through raftserver5
-        try:
-            result = subprocess.run(["pkill", "-f", f"raftserver{i}"], 
-                                  stdout=subprocess.PIPE, stderr=subprocess.PIPE, timeout=3)
-            if result.returncode == 0:
-                print(f"  Killed raftserver{i}")
-        except:
-            pass
+    # Method 1: Kill by process name (any cluster size)
+    try:
+        result = subprocess.run(["pkill", "-f", "^raftserver[0-9]+"],
+                              stdout=subprocess.PIPE, stderr=subprocess.PIPE, timeout=3)
+        if result.returncode == 0:
+            print("  Killed raftserver processes")
+    except:
+        pass
     
     # Method 2: Kill server.py processes
     try:
@@ -126,16 +129,14 @@ def cleanup_processes():
 def check_frontend_running():
     """Check if frontend service is running on port 8001"""
     try:
-        channel = grpc.insecure_channel(FRONTEND_ADDR)
-        stub = raft_pb2_grpc.FrontEndStub(channel)
+        stub = POOL.frontend_stub(FRONTEND_ADDR)
         
         # Try a simple call to verify it's responding
         request = raft_pb2.GetKey(key="test", clientId=1, requestId=1)
         response = stub.Get(request, timeout=3)
-        channel.close()
         
-        # Should get "Not implemented" error, which means it's working
-        return response.wrongLeader and "Not implemented" in response.error
+        # Any reply means it's working; without a cluster it reports wrongLeader
+        return response is not None
     except Exception as e:
         print(f"Frontend check failed: {e}")
         return False
@@ -143,12 +144,10 @@ def check_frontend_running():
 def call_start_raft(n):
     """Call StartRaft RPC with n servers"""
     try:
-        channel = grpc.insecure_channel(FRONTEND_ADDR)
-        stub = raft_pb2_grpc.FrontEndStub(channel)
+        stub = POOL.frontend_stub(FRONTEND_ADDR)
         
         request = raft_pb2.IntegerArg(arg=n)
         response = stub.StartRaft(request, timeout=15)  # Increased timeout
-        channel.close()
         
         if response.error:
             return False, response.error
@@ -159,12 +158,10 @@ def call_start_raft(n):
 def call_start_server(server_id):
     """Call StartServer RPC for specific server"""
     try:
-        channel = grpc.insecure_channel(FRONTEND_ADDR)
-        stub = raft_pb2_grpc.FrontEndStub(channel)
+        stub = POOL.frontend_stub(FRONTEND_ADDR)
         
         request = raft_pb2.IntegerArg(arg=server_id)
         response = stub.StartServer(request, timeout=10)  # Increased timeout
-        channel.close()
         
         if response.error:
             return False, response.error
@@ -175,13 +172,11 @@ def call_start_server(server_id):
 def ping_server(server_id):
     """Ping a specific server"""
     try:
-        addr = f"localhost:{BASE_PORT + server_id}"
-        channel = grpc.insecure_channel(addr)
-        stub = raft_pb2_grpc.KeyValueStoreStub(channel)
+        stub = POOL.server_stub(server_id)
         
         request = raft_pb2.Empty()
-        response = stub.ping(request, timeout=3)
-        channel.close()
+        # Wait out any reconnect backoff left over from an earlier, now restarted server
+        response = stub.ping(request, timeout=3, wait_for_ready=True)
         
         return response.success
     except:
@@ -190,13 +185,10 @@ def ping_server(server_id):
 def get_server_state(server_id):
     """Get state from a specific server"""
     try:
-        addr = f"localhost:{BASE_PORT + server_id}"
-        channel = grpc.insecure_channel(addr)
-        stub = raft_pb2_grpc.KeyValueStoreStub(channel)
+        stub = POOL.server_stub(server_id)
         
         request = raft_pb2.Empty()
-        response = stub.GetState(request, timeout=3)
-        channel.close()
+        response = stub.GetState(request, timeout=3, wait_for_ready=True)
         
         return True, response.term, response.isLeader
     except Exception as e:
@@ -219,9 +211,8 @@ def check_process_names():
                 print(f"  {line}")
                 
                 # Check for raftserver names
-                for i in range(1, 6):
-                    if f"raftserver{i}" in line:
-                        found_servers.append(i)
+                for match in re.finditer(r"raftserver(\d+)", line):
+                    found_servers.append(int(match.group(1)))
         
         # Also try alternative method - check for python server.py processes
         alt_servers = []
@@ -244,12 +235,10 @@ def check_process_names():
                             print(f"  PID {pid}: {cmdline}")
                             
                             # Extract server ID from command line
-                            if "server.py" in cmdline:
-                                parts = cmdline.split()
-                                if len(parts) >= 3 and parts[-1].isdigit():
-                                    server_id = int(parts[-1])
-                                    if 0 <= server_id <= 4:
-                                        alt_servers.append(server_id + 1)  # Convert to raftserver number
+                            match = re.search(r"server\.py (\d+)", cmdline)
+                            if match:
+                                server_id = int(match.group(1))
+                                alt_servers.append(server_id + 1)  # Convert to raftserver number
                     except:
                         pass
         except:
@@ -290,9 +279,8 @@ def test_start_raft_basic():
         return TestResult("StartRaft Basic", 0, 3.0, 
                          f"StartRaft RPC failed: {error}")
     
-    print("StartRaft succeeded, waiting for servers...")
-    # Wait for servers to start
-    time.sleep(5)  # Increased wait time
+    # StartRaft only returns once every server is serving and a leader is elected
+    print("StartRaft succeeded")
     
     # Check if servers are responding (most important test)
     responding_servers = []
@@ -346,20 +334,23 @@ def test_server_connectivity():
         return TestResult("Server Connectivity", 1.0, 2.5,
                          f"Ping failed, only {len(ping_results)}/3 servers responding")
     
-    # Test GetState functionality
+    # Test GetState functionality: servers run elections, so expect at most one leader
     state_results = []
+    leaders = []
     print("Testing server GetState...")
     for i in range(3):
         success, term, is_leader = get_server_state(i)
-        if success and term == 0 and not is_leader:
+        if success:
             state_results.append(i)
+            if is_leader:
+                leaders.append(i)
             print(f"  Server {i}: GetState OK (term={term}, leader={is_leader})")
         else:
-            print(f"  Server {i}: GetState FAILED or wrong values (success={success}, term={term}, leader={is_leader})")
+            print(f"  Server {i}: GetState FAILED (success={success}, term={term}, leader={is_leader})")
     
-    if len(state_results) != 3:
+    if len(state_results) != 3 or len(leaders) > 1:
         return TestResult("Server Connectivity", 1.5, 2.5,
-                         f"GetState failed or wrong values, {len(state_results)}/3 correct")
+                         f"GetState failed or wrong values, {len(state_results)}/3 correct, leaders={leaders}")
     
     return TestResult("Server Connectivity", 2.5, 2.5,
                      "All servers responding to ping and GetState correctly")
@@ -376,8 +367,6 @@ def test_start_raft_different_sizes():
         return TestResult("StartRaft Sizes", 0, 2.0,
                          f"StartRaft(5) failed: {error}")
     
-    time.sleep(5)
-    
     # Check if servers are responding
     responding_servers = []
     for i in range(5):
@@ -423,7 +412,6 @@ def test_start_server_individual():
         success, error = call_start_raft(3)
         if not success:
             return TestResult("Start Server", 0, 2.0, f"Could not start fresh cluster: {error}")
-        time.sleep(5)
     
     # Find and kill server 2 specifically
     print("Finding and killing server 2...")
@@ -488,8 +476,6 @@ def test_start_server_individual():
         return TestResult("Start Server", 1.0, 2.0,
                          f"StartServer(2) failed: {error}")
     
-    time.sleep(3)
-    
     # Verify it's back up
     if not ping_server(2):
         return TestResult("Start Server", 1.5, 2.0,
@@ -499,40 +485,38 @@ def test_start_server_individual():
     return TestResult("Start Server", 2.0, 2.0,
                      "Individual server restart successful")
 
-def test_unimplemented_operations():
-    """Test 6: Get/Put Return Not Implemented"""
-    print("\n=== Test: Unimplemented Operations ===")
+def test_client_operations():
+    """Test 6: Put Commits and Get Reads It Back"""
+    print("\n=== Test: Client Operations ===")
     
     try:
-        channel = grpc.insecure_channel(FRONTEND_ADDR)
-        stub = raft_pb2_grpc.FrontEndStub(channel)
+        stub = POOL.frontend_stub(FRONTEND_ADDR)
         
-        # Test Get operation
-        get_request = raft_pb2.GetKey(key="test", clientId=1, requestId=1)
-        get_response = stub.Get(get_request, timeout=3)
-        
-        # Test Put operation  
+        # Test Put operation
         put_request = raft_pb2.KeyValue(key="test", value="val", clientId=1, requestId=2)
-        put_response = stub.Put(put_request, timeout=3)
+        put_response = stub.Put(put_request, timeout=10)
+        
+        # Test Get operation
+        get_request = raft_pb2.GetKey(key="test", clientId=1, requestId=3)
+        get_response = stub.Get(get_request, timeout=10)
         
-        channel.close()
         
-        # Both should return wrongLeader=True with "Not implemented" error
-        get_ok = get_response.wrongLeader and "Not implemented" in get_response.error
-        put_ok = put_response.wrongLeader and "Not implemented" in put_response.error
+        # Both are served by the cluster leader through the frontend
+        put_ok = not put_response.wrongLeader and not put_response.error
+        get_ok = not get_response.wrongLeader and get_response.value == "val"
         
         if get_ok and put_ok:
-            return TestResult("Unimplemented Ops", 2.5, 2.5,
-                             "Get/Put correctly return 'Not implemented'")
+            return TestResult("Client Ops", 2.5, 2.5,
+                             "Put committed and Get returned the stored value")
         elif get_ok or put_ok:
-            return TestResult("Unimplemented Ops", 1.5, 2.5,
-                             "Only one of Get/Put returns correct error")
+            return TestResult("Client Ops", 1.5, 2.5,
+                             "Only one of Get/Put behaves as expected")
         else:
-            return TestResult("Unimplemented Ops", 0, 2.5,
-                             "Get/Put don't return expected 'Not implemented' errors")
+            return TestResult("Client Ops", 0, 2.5,
+                             f"Get/Put failed (put error={put_response.error!r}, get error={get_response.error!r})")
             
     except Exception as e:
-        return TestResult("Unimplemented Ops", 0, 2.5,
+        return TestResult("Client Ops", 0, 2.5,
                          f"RPC failed: {e}")
 
 def test_config_file():
@@ -596,7 +580,7 @@ def main():
     suite.add(test_server_connectivity())
     suite.add(test_start_raft_different_sizes())
     suite.add(test_start_server_individual())
-    suite.add(test_unimplemented_operations())
+    suite.add(test_client_operations())
     
     # Cleanup
     cleanup_processes()
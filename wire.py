@@ -0,0 +1,35 @@
+from google.protobuf.message import DecodeError
+
+import raft_pb2 as pb
+
+# Each client message and its Binary counterpart differ only in declaring key and value as
+# string or bytes, which proto3 encodes identically. A message therefore converts by
+# reparsing its serialized form, in C, without transcoding field by field; only the
+# bytes -> string direction validates UTF-8.
+BINARY_TYPES = {
+    pb.KeyValue: pb.BinaryKeyValue,
+    pb.GetKey: pb.BinaryGetKey,
+    pb.Reply: pb.BinaryReply,
+    pb.KeyValueBatch: pb.BinaryKeyValueBatch,
+}
+TEXT_TYPES = {binary_type: text_type for text_type, binary_type in BINARY_TYPES.items()}
+
+NOT_UTF8 = "Value is not valid UTF-8; read it with GetBytes"
+
+def as_binary(message):
+    """The Binary variant of message; Binary messages are returned unchanged."""
+    binary_type = BINARY_TYPES.get(type(message))
+    if binary_type is None:
+        return message
+    return binary_type.FromString(message.SerializeToString())
+
+def as_text(message):
+    """The string variant of a Binary message; raises DecodeError if it is not UTF-8."""
+    return TEXT_TYPES[type(message)].FromString(message.SerializeToString())
+
+def text_reply(reply):
+    """Reply for a BinaryReply, or an error Reply if its value is not UTF-8."""
+    try:
+        return as_text(reply)
+    except DecodeError:
+        return pb.Reply(error=NOT_UTF8)
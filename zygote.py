@@ -0,0 +1,153 @@
+import json
+import os
+import queue
+import random
+import signal
+import socket
+import subprocess
+import sys
+import threading
+import traceback
+
+import grpc  # noqa: F401  pre-imported for the children
+import server
+
+# Blank argument that reserves room in the zygote's argv area, which forked children
+# overwrite with their own process title.
+TITLE_RESERVE = " " * 256
+
+class Zygote:
+    """Frontend-side handle on the zygote, a template process raft servers are forked from.
+
+    The zygote imports grpc and the server modules once, creates no threads or gRPC
+    objects, and waits for spawn requests on a UNIX socket. Each request carries a server's
+    arguments plus its ready pipe; the forked child renames itself raftserver{id+1} and
+    runs server.serve() without paying interpreter start-up or import time. The zygote
+    reaps its children and reports their exit codes back over the same socket.
+    """
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.sock = None
+        self.pending_on_exit = None  # callback of the spawn request awaiting its reply
+        self._start_process()
+
+    def _start_process(self):
+        parent_sock, child_sock = socket.socketpair(socket.AF_UNIX, socket.SOCK_SEQPACKET)
+        subprocess.Popen(
+            ["bash", "-c", f"exec -a raftzygote python zygote.py {child_sock.fileno()} '{TITLE_RESERVE}'"],
+            pass_fds=(child_sock.fileno(),),
+        )
+        child_sock.close()
+        self.sock = parent_sock
+        self.replies = queue.Queue()
+        threading.Thread(target=self._read_messages, args=(parent_sock, self.replies), daemon=True).start()
+
+    def spawn(self, args, ready_fd, on_exit):
+        """Forks a server running `server.py *args`; ready_fd is passed on as its --ready-fd.
+
+        Returns the child's pid; on_exit(returncode) is called once it exits. A zygote that
+        has died is replaced once before giving up.
+        """
+        with self.lock:
+            try:
+                return self._request(args, ready_fd, on_exit)
+            except OSError:
+                self.sock.close()
+                self._start_process()
+                return self._request(args, ready_fd, on_exit)
+
+    def _request(self, args, ready_fd, on_exit):
+        self.pending_on_exit = on_exit
+        socket.send_fds(self.sock, [json.dumps(args).encode()], [ready_fd])
+        pid = self.replies.get()
+        if pid is None:
+            raise ConnectionError("zygote exited")
+        return pid
+
+    def _read_messages(self, sock, replies):
+        on_exit = {}  # pid -> callback
+        while True:
+            try:
+                data = sock.recv(256)
+            except OSError:
+                data = b""
+            if not data:
+                # Children of a dead zygote are orphaned; their exits can no longer be reported.
+                replies.put(None)
+                return
+            message = json.loads(data)
+            if "pid" in message:
+                on_exit[message["pid"]] = self.pending_on_exit
+                replies.put(message["pid"])
+            elif message["exited"] in on_exit:
+                on_exit.pop(message["exited"])(message["returncode"])
+
+def set_process_title(title):
+    """Rewrites this process's command line as shown by ps and matched by pgrep/pkill -f.
+
+    The new title must fit in the original argv area; it is truncated otherwise.
+    """
+    fields = open("/proc/self/stat").read().rsplit(")", 1)[1].split()
+    arg_start, arg_end = int(fields[45]), int(fields[46])
+    data = title.encode()[:arg_end - arg_start - 1]
+    with open("/proc/self/mem", "r+b", buffering=0) as mem:
+        mem.seek(arg_start)
+        mem.write(data.ljust(arg_end - arg_start, b"\0"))
+    with open("/proc/self/comm", "w") as comm:
+        comm.write(title.split(" ", 1)[0][:15])
+
+def run_zygote(sock):
+    def reap(signum, frame):
+        while True:
+            try:
+                pid, status = os.waitpid(-1, os.WNOHANG)
+            except ChildProcessError:
+                return
+            if pid == 0:
+                return
+            message = {"exited": pid, "returncode": os.waitstatus_to_exitcode(status)}
+            try:
+                sock.send(json.dumps(message).encode())
+            except OSError:
+                pass
+
+    signal.signal(signal.SIGCHLD, reap)
+    while True:
+        try:
+            message, fds, _, _ = socket.recv_fds(sock, 65536, 1)
+        except OSError:
+            return
+        if not message:
+            return  # the frontend went away
+        args = json.loads(message)
+        ready_fd = fds[0]
+        # SIGCHLD stays blocked until the pid is sent, so a child's exit is never reported
+        # before its spawn reply.
+        signal.pthread_sigmask(signal.SIG_BLOCK, [signal.SIGCHLD])
+        pid = os.fork()
+        if pid == 0:
+            sock.close()
+            signal.signal(signal.SIGCHLD, signal.SIG_DFL)
+            signal.pthread_sigmask(signal.SIG_UNBLOCK, [signal.SIGCHLD])
+            run_server(args, ready_fd)
+        os.close(ready_fd)
+        sock.send(json.dumps({"pid": pid}).encode())
+        signal.pthread_sigmask(signal.SIG_UNBLOCK, [signal.SIGCHLD])
+
+def run_server(args, ready_fd):
+    argv = ["server.py"] + [str(a) for a in args] + ["--ready-fd", str(ready_fd)]
+    set_process_title(f"raftserver{int(args[0]) + 1} " + " ".join(argv))
+    # Forked children would otherwise share the zygote's random state, and with it their
+    # election timeouts.
+    random.seed()
+    sys.argv = argv
+    try:
+        server.serve()
+    except BaseException:
+        traceback.print_exc()
+        os._exit(1)
+    os._exit(0)
+
+if __name__ == "__main__":
+    run_zygote(socket.socket(fileno=int(sys.argv[1])))